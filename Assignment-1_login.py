@@ -1,53 +1,42 @@
-import time
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-
-
-def setup_driver():
-    """Initialize Chrome WebDriver"""
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service)
-    driver.maximize_window()
-    return driver
+from helpers.driver_pool import setup_driver, release_driver
+from helpers.standin import saucedemo_url
+from helpers.waits import wait_for, element_present, url_changes
 
 
 def login_with_id(driver):
-    driver.get("https://www.saucedemo.com/")
-    wait = WebDriverWait(driver, 10)
+    driver.get(saucedemo_url())
+    login_url = driver.current_url
 
-    wait.until(EC.presence_of_element_located((By.ID, "user-name"))).send_keys("standard_user")
+    wait_for(driver, element_present((By.ID, "user-name")), timeout=10).send_keys("standard_user")
     driver.find_element(By.ID, "password").send_keys("secret_sauce")
     driver.find_element(By.ID, "login-button").click()
 
-    time.sleep(2)
+    wait_for(driver, url_changes(login_url))
     print("Login with ID successful:", "inventory" in driver.current_url)
 
 
 def login_with_name(driver):
-    driver.get("https://www.saucedemo.com/")
-    wait = WebDriverWait(driver, 10)
+    driver.get(saucedemo_url())
+    login_url = driver.current_url
 
-    wait.until(EC.presence_of_element_located((By.NAME, "user-name"))).send_keys("standard_user")
+    wait_for(driver, element_present((By.NAME, "user-name")), timeout=10).send_keys("standard_user")
     driver.find_element(By.NAME, "password").send_keys("secret_sauce")
     driver.find_element(By.NAME, "login-button").click()
 
-    time.sleep(2)
+    wait_for(driver, url_changes(login_url))
     print("Login with NAME successful:", "inventory" in driver.current_url)
 
 
 def login_with_xpath(driver):
-    driver.get("https://www.saucedemo.com/")
-    wait = WebDriverWait(driver, 10)
+    driver.get(saucedemo_url())
+    login_url = driver.current_url
 
-    wait.until(EC.presence_of_element_located((By.XPATH, '//input[@data-test="username"]'))).send_keys("standard_user")
+    wait_for(driver, element_present((By.XPATH, '//input[@data-test="username"]')), timeout=10).send_keys("standard_user")
     driver.find_element(By.XPATH, '//input[@data-test="password"]').send_keys("secret_sauce")
     driver.find_element(By.XPATH, '//input[@data-test="login-button"]').click()
 
-    time.sleep(2)
+    wait_for(driver, url_changes(login_url))
     print("Login with XPATH successful:", "inventory" in driver.current_url)
 
 
@@ -60,4 +49,4 @@ if __name__ == "__main__":
         login_with_name(driver)
         login_with_xpath(driver)
     finally:
-        driver.quit()
+        release_driver(driver)
@@ -1,22 +1,18 @@
 import pytest
-from selenium import webdriver
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
+from helpers import standin
+from helpers.driver_pool import lease_driver
+from helpers.fixtures import lease_scope
 
 
-@pytest.fixture(scope="session")
+@pytest.fixture(scope=lease_scope("session"))
 def browser():
-    options = Options()
-    options.add_argument("--start-maximized")
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-    yield driver
-    driver.quit()
+    with lease_driver() as driver:
+        yield driver
 
 
 @pytest.fixture
 def base_url():
-    return "https://www.saucedemo.com/"
+    return standin.saucedemo_url()
 
 
 @pytest.fixture
@@ -24,6 +20,10 @@ def login_helper(browser, base_url):
     from helpers import AuthHelpers
     return AuthHelpers(browser, base_url)
 
+from urllib.parse import urljoin
+from helpers import checkpoints, fused, sessions
+from helpers.sharding import sauce_user
+from helpers.waits import wait_for, url_contains
 from pages.login_page import LoginPage
 from pages.inventory_page import InventoryPage
 from pages.cart_page import CartPage
@@ -35,11 +35,28 @@ class AuthHelpers:
         self.driver = driver
         self.base_url = base_url
 
-    def login(self, username="standard_user", password="secret_sauce"):
+    def login(self, username=None, password="secret_sauce"):
+        username = username or sauce_user()
         self.driver.get(self.base_url)
         login_page = LoginPage(self.driver)
         login_page.login(username, password)
 
+    def session_login(self, username=None, password="secret_sauce"):
+        """Log in by injecting the session captured from the first UI login for this user."""
+        username = username or sauce_user()
+
+        def ui_login():
+            self.login(username, password)
+            wait_for(self.driver, url_contains("inventory"))
+
+        return sessions.session_login(
+            self.driver,
+            (self.base_url, username),
+            urljoin(self.base_url, "inventory.html"),
+            ui_login,
+            lambda driver: InventoryPage(driver).is_open(),
+        )
+
     def logout(self):
         inv = InventoryPage(self.driver)
         inv.open_menu()
@@ -54,11 +71,34 @@ class AuthHelpers:
         inv.go_to_cart()
 
     def checkout(self, first="John", last="Doe", postal="12345"):
-        cart = CartPage(self.driver)
-        cart.click_checkout()
-        checkout = CheckoutPage(self.driver)
-        checkout.fill_info(first, last, postal)
-        checkout.continue_checkout()
+        # with --fused the click, the form fill and continue go out as two scripts
+        with fused.plan(self.driver) as driver:
+            cart = CartPage(driver)
+            cart.click_checkout()
+            self.submit_checkout_info(first, last, postal)
+
+    def submit_checkout_info(self, first="John", last="Doe", postal="12345"):
+        with fused.plan(self.driver) as driver:
+            checkout = CheckoutPage(driver)
+            checkout.fill_info(first, last, postal)
+            checkout.continue_checkout()
+
+    def checkpoint(self, name, build):
+        """Restore the named browser state, building it with ``build()`` the first time in this worker."""
+        return checkpoints.checkpoint(self.driver, (self.base_url, name), build)
+
+    def at_checkout_info(self, item_name, username=None):
+        """Logged in with ``item_name`` in the cart, on checkout step one."""
+        username = username or sauce_user()
+
+        def build():
+            self.session_login(username)
+            self.add_item_to_cart(item_name)
+            self.go_to_cart()
+            CartPage(self.driver).click_checkout()
+            wait_for(self.driver, url_contains("checkout-step-one"))
+
+        return self.checkpoint(f"{username}: cart with {item_name}, checkout step one", build)
 
 from selenium.webdriver.common.by import By
 
@@ -77,6 +117,7 @@ class LoginPage:
         self.driver.find_element(*self.LOGIN_BTN).click()
 
 from selenium.webdriver.common.by import By
+from helpers.dom_batch import collection_index
 
 
 class InventoryPage:
@@ -84,9 +125,18 @@ class InventoryPage:
     LOGOUT = (By.ID, "logout_sidebar_link")
     CART_ICON = (By.CLASS_NAME, "shopping_cart_link")
     ITEMS = (By.CLASS_NAME, "inventory_item")
+    ITEM_FIELDS = {
+        "name": (By.CLASS_NAME, "inventory_item_name"),
+        "price": (By.CLASS_NAME, "inventory_item_price"),
+        "button": (By.TAG_NAME, "button"),
+    }
 
     def __init__(self, driver):
         self.driver = driver
+        self.index = collection_index(driver, "inventory", self.ITEMS, self.ITEM_FIELDS, key="name", handles=["button"])
+
+    def is_open(self):
+        return "inventory" in self.driver.current_url and bool(self.driver.find_elements(*self.ITEMS))
 
     def open_menu(self):
         self.driver.find_element(*self.BURGER_MENU).click()
@@ -94,13 +144,12 @@ class InventoryPage:
     def logout(self):
         self.driver.find_element(*self.LOGOUT).click()
 
+    def items(self):
+        """Name, price and button handle of every item, read in one round trip."""
+        return self.index.items()
+
     def add_item_to_cart(self, item_name):
-        items = self.driver.find_elements(*self.ITEMS)
-        for item in items:
-            name = item.find_element(By.CLASS_NAME, "inventory_item_name").text
-            if name.strip() == item_name:
-                item.find_element(By.TAG_NAME, "button").click()
-                break
+        self.index.click(item_name, "button")
 
     def go_to_cart(self):
         self.driver.find_element(*self.CART_ICON).click()
@@ -118,6 +167,9 @@ class CartPage:
         self.driver.find_element(*self.CHECKOUT_BTN).click()
 
 from selenium.webdriver.common.by import By
+from helpers import visual
+from helpers.dom_batch import fill_form
+from helpers.waits import wait_for, url_contains
 
 
 class CheckoutPage:
@@ -131,46 +183,52 @@ class CheckoutPage:
     def __init__(self, driver):
         self.driver = driver
 
+    def fill_form(self, values, submit=None):
+        """Fill a ``{locator: value}`` mapping in a single round trip."""
+        fill_form(self.driver, values, submit)
+
     def fill_info(self, first, last, postal):
-        self.driver.find_element(*self.FIRST_NAME).send_keys(first)
-        self.driver.find_element(*self.LAST_NAME).send_keys(last)
-        self.driver.find_element(*self.POSTAL).send_keys(postal)
+        self.fill_form({self.FIRST_NAME: first, self.LAST_NAME: last, self.POSTAL: postal})
 
     def continue_checkout(self):
         self.driver.find_element(*self.CONTINUE).click()
 
     def finish(self):
         self.driver.find_element(*self.FINISH).click()
+        wait_for(self.driver, url_contains("checkout-complete"))
+        self.visual_checkpoint("checkout-complete")
+
+    def visual_checkpoint(self, name, element=None, ignore=()):
+        """Compare the page (or ``element``) with its baseline; a no-op without --visual."""
+        visual.checkpoint(self.driver, name, element, ignore)
 
     def cancel(self):
         self.driver.find_element(*self.CANCEL).click()
 
 import pytest
+from selenium.webdriver.common.by import By
+from helpers.assertions import assert_text_in, assert_page_contains
 from pages.checkout_page import CheckoutPage
 
 
 @pytest.mark.dependency()
 @pytest.mark.order(1)
 def test_order_confirmation(login_helper):
-    login_helper.login()
-    login_helper.add_item_to_cart("Sauce Labs Backpack")
-    login_helper.go_to_cart()
-    login_helper.checkout(first="Alice", last="Smith", postal="10001")
+    login_helper.at_checkout_info("Sauce Labs Backpack")
+    login_helper.submit_checkout_info(first="Alice", last="Smith", postal="10001")
 
     checkout = CheckoutPage(login_helper.driver)
     checkout.finish()
 
-    assert "THANK YOU" in login_helper.driver.page_source.upper()
+    assert_text_in(login_helper.driver, (By.CLASS_NAME, "complete-header"), "THANK YOU", ignore_case=True)
 
 
 @pytest.mark.dependency(depends=["test_order_confirmation"])
 @pytest.mark.order(2)
-@pytest.mark.flaky(reruns=2, reruns_delay=1)
+@pytest.mark.retry(max=2)
 def test_order_cancellation(login_helper):
-    login_helper.login()
-    login_helper.add_item_to_cart("Sauce Labs Bike Light")
-    login_helper.go_to_cart()
-    login_helper.checkout(first="Bob", last="Gray", postal="20002")
+    login_helper.at_checkout_info("Sauce Labs Bike Light")
+    login_helper.submit_checkout_info(first="Bob", last="Gray", postal="20002")
 
     checkout = CheckoutPage(login_helper.driver)
     checkout.cancel()
@@ -178,17 +236,13 @@ def test_order_cancellation(login_helper):
     assert "cart" in login_helper.driver.current_url
 
 
-@pytest.mark.parametrize("first,last,postal", [
-    ("John", "Doe", "11111"),
-    ("Jane", "Roe", "22222")
-])
+@pytest.mark.dataset("data/checkout.csv")
 @pytest.mark.order(3)
 @pytest.mark.skipif(False, reason="Skipping demo")
 @pytest.mark.xfail(reason="Known bug for postal validation")
-def test_checkout_details_verification(login_helper, first, last, postal):
-    login_helper.login()
-    login_helper.add_item_to_cart("Sauce Labs Bolt T-Shirt")
-    login_helper.go_to_cart()
-    login_helper.checkout(first, last, postal)
+def test_checkout_details_verification(login_helper, dataset_row):
+    first, last, postal = dataset_row["first"], dataset_row["last"], dataset_row["postal"]
+    login_helper.at_checkout_info("Sauce Labs Bolt T-Shirt")
+    login_helper.submit_checkout_info(first, last, postal)
 
-    assert first in login_helper.driver.page_source
+    assert_page_contains(login_helper.driver, first)
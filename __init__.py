@@ -1,21 +0,0 @@
-"""Top-level package of helpers."""
-
-__author__ = """David S."""
-__email__ = 'infosmith@prontonmail.com'
-__version__ = '0.2.0'
-
-
-def utils():
-    return None
-
-
-def utils():
-    return None
-
-
-def utils():
-    return None
-
-
-def utils():
-    return None
\ No newline at end of file
@@ -0,0 +1,20 @@
+# Listed so that every plugin is registered before another plugin imports it;
+# otherwise pytest warns that it cannot rewrite asserts in the imported one.
+pytest_plugins = [
+    "helpers.budget",
+    "helpers.profiles",
+    "helpers.instrumentation",
+    "helpers.driver_pool",
+    "helpers.standin",
+    "helpers.artifacts",
+    "helpers.datasets",
+    "helpers.fused",
+    "helpers.fixtures",
+    "helpers.monitor",
+    "helpers.network",
+    "helpers.reporting",
+    "helpers.retries",
+    "helpers.sharding",
+    "helpers.visual",
+    "helpers.waits",
+]
@@ -0,0 +1,31 @@
+"""Shared infrastructure for the SauceDemo and DemoQA suites.
+
+Importing the package is free: submodules (``helpers.waits``,
+``helpers.utils``, ...) load on first use, and so do the shortcuts below,
+e.g. ``from helpers import lease_driver``.
+"""
+import importlib
+
+__author__ = """David S."""
+__email__ = 'infosmith@prontonmail.com'
+__version__ = '0.2.0'
+
+_EXPORTS = {
+    "new_driver": "driver_pool",
+    "lease_driver": "driver_pool",
+    "setup_driver": "driver_pool",
+    "release_driver": "driver_pool",
+    "wait_for": "waits",
+    "fill_form": "dom_batch",
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(f"{__name__}.{_EXPORTS[name]}"), name)
+    try:
+        return importlib.import_module(f"{__name__}.{name}")
+    except ModuleNotFoundError as err:
+        if err.name != f"{__name__}.{name}":
+            raise
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
@@ -0,0 +1,174 @@
+"""Failure artifacts: screenshot, DOM snapshot and browser console log.
+
+capture(driver, name) only does the WebDriver round trips on the calling
+thread. Encoding and compression then run in a small background pool, and
+the test continues immediately. Screenshots are stored as WebP when Pillow is
+installed, otherwise as the PNG Chrome returned. DOM and console logs are
+zstd-compressed when zstandard is installed, otherwise gzip. File names are
+unique per test, attempt and worker, under ARTIFACT_DIR (default
+``artifacts``).
+
+As a pytest plugin it captures every failing test that has a driver fixture
+and links the files from the pytest-html report.
+"""
+import atexit
+import gzip
+import html
+import importlib.util
+import io
+import itertools
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from helpers.driver_pool import fixture_drivers
+
+
+ARTIFACT_DIR = Path(os.getenv("ARTIFACT_DIR", "artifacts"))
+WORKERS = int(os.getenv("ARTIFACT_WORKERS", "2"))
+
+_executor = None
+_pending = []
+_lock = threading.Lock()
+_counter = itertools.count()
+
+
+def submit(fn, *args):
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="artifacts")
+            atexit.register(flush)
+        future = _executor.submit(fn, *args)
+        _pending.append(future)
+    return future
+
+
+def flush():
+    """Block until every queued artifact is written."""
+    with _lock:
+        pending = list(_pending)
+        _pending.clear()
+    wait(pending)
+    for future in pending:
+        future.result()
+
+
+def slug(name):
+    return re.sub(r"[^\w.-]+", "_", name).strip("_")[:150]
+
+
+# Pillow and zstandard are only looked up here (the file names depend on
+# them) and imported by the writers, so collection never loads them.
+_available = {}
+
+
+def _installed(module):
+    if module not in _available:
+        _available[module] = importlib.util.find_spec(module) is not None
+    return _available[module]
+
+
+def _compressed_suffix():
+    return ".zst" if _installed("zstandard") else ".gz"
+
+
+def _compress(data):
+    if _installed("zstandard"):
+        import zstandard
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def _write_screenshot(path, png):
+    if _installed("PIL"):
+        from PIL import Image
+        Image.open(io.BytesIO(png)).save(path, "WEBP", quality=80, method=4)
+    else:
+        path.write_bytes(png)
+
+
+def _write_compressed(path, text):
+    path.write_bytes(_compress(text.encode("utf-8")))
+
+
+def unique_stem(name):
+    """File name stem for ``name`` that no other test, attempt or worker produces."""
+    return "-".join(filter(None, [
+        slug(name), os.getenv("PYTEST_XDIST_WORKER") or os.getenv("SHARD_INDEX"),
+        time.strftime("%H%M%S"), str(next(_counter)),
+    ]))
+
+
+def current_test():
+    """Node id of the running test (from PYTEST_CURRENT_TEST), or None outside pytest."""
+    current = os.getenv("PYTEST_CURRENT_TEST")
+    return current.rsplit(" (", 1)[0] if current else None
+
+
+def capture(driver, name):
+    """Grab screenshot, DOM and console log; return the paths they will be written to."""
+    stem = unique_stem(name)
+    ARTIFACT_DIR.mkdir(parents=True, exist_ok=True)
+    paths = {}
+    try:
+        png = driver.get_screenshot_as_png()
+    except WebDriverException:
+        png = None
+    if png:
+        paths["screenshot"] = ARTIFACT_DIR / (stem + (".webp" if _installed("PIL") else ".png"))
+        submit(_write_screenshot, paths["screenshot"], png)
+    try:
+        dom = driver.execute_script("return document.documentElement.outerHTML;")
+    except WebDriverException:
+        dom = None
+    if dom:
+        paths["dom"] = ARTIFACT_DIR / (stem + ".html" + _compressed_suffix())
+        submit(_write_compressed, paths["dom"], dom)
+    try:
+        console = driver.get_log("browser")
+    except (AttributeError, WebDriverException):
+        console = None
+    if console is not None:
+        paths["console"] = ARTIFACT_DIR / (stem + ".console.json" + _compressed_suffix())
+        submit(_write_compressed, paths["console"], json.dumps(console, indent=1))
+    return {kind: str(path) for kind, path in paths.items()}
+
+
+# ---- pytest plugin ----
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    if call.when == "teardown" or not report.failed:
+        return
+    paths = {}
+    for driver in fixture_drivers(item):
+        paths.update(capture(driver, f"{item.nodeid}-{call.when}"))
+    if not paths:
+        return
+    report.artifacts = paths
+    report.sections.append(("failure artifacts", "\n".join(f"{k}: {v}" for k, v in paths.items())))
+    try:
+        import pytest_html
+    except ImportError:
+        return
+    htmlpath = getattr(item.config.option, "htmlpath", None)
+    base = os.path.dirname(os.path.abspath(htmlpath)) if htmlpath else os.getcwd()
+    links = " ".join(
+        f'<a href="{html.escape(os.path.relpath(os.path.abspath(p), base))}">{kind}</a>'
+        for kind, p in paths.items()
+    )
+    report.extras = getattr(report, "extras", []) + [pytest_html.extras.html(f"<div>Artifacts: {links}</div>")]
+
+
+def pytest_sessionfinish(session):
+    flush()
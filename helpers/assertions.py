@@ -0,0 +1,69 @@
+"""DOM assertions evaluated in the browser.
+
+Instead of shipping ``driver.page_source`` back for a substring check, each
+helper runs its check in the page and returns only a boolean, plus a short
+snippet of what was actually there when it fails.
+"""
+from helpers.dom_batch import LOCATE_JS
+
+
+SNIPPET = 160
+
+CHECK_JS = LOCATE_JS + """
+var kind = arguments[0], by = arguments[1], value = arguments[2], expected = arguments[3], extra = arguments[4];
+var SNIPPET = %d;
+function around(haystack, needle) {
+    // Show the text around the longest prefix of the needle that does occur.
+    var n = needle.length;
+    while (n > 0 && haystack.indexOf(needle.slice(0, n)) < 0) n--;
+    var at = n ? haystack.indexOf(needle.slice(0, n)) : 0;
+    var start = Math.max(0, at - SNIPPET / 4);
+    return haystack.slice(start, start + SNIPPET);
+}
+if (kind === 'count') {
+    var count = locateAll(by, value).length;
+    return [count === expected, String(count)];
+}
+var el = by ? locate(by, value) : document.documentElement;
+if (!el) return [false, 'no element matches ' + by + '=' + value];
+if (kind === 'attribute') {
+    var actual = el.getAttribute(extra);
+    return [actual === expected, actual === null ? 'attribute missing' : actual];
+}
+var text = kind === 'source' ? el.outerHTML : el.textContent;
+if (extra) { text = text.toLowerCase(); expected = expected.toLowerCase(); }
+return [text.indexOf(expected) >= 0, around(text, expected)];
+""" % SNIPPET
+
+
+def _check(driver, kind, locator, expected, extra=None):
+    by, value = locator or (None, None)
+    return driver.execute_script(CHECK_JS, kind, by, value, expected, extra)
+
+
+def assert_text_in(driver, locator, text, ignore_case=False):
+    """``text`` occurs in the text content of the element at ``locator``."""
+    ok, snippet = _check(driver, "text", locator, text, ignore_case)
+    if not ok:
+        raise AssertionError(f"{text!r} not in text of {locator}; found: {snippet!r}")
+
+
+def assert_page_contains(driver, text, ignore_case=False):
+    """``text`` occurs in the page's serialised HTML, like ``text in driver.page_source``."""
+    ok, snippet = _check(driver, "source", None, text, ignore_case)
+    if not ok:
+        raise AssertionError(f"{text!r} not in page source; closest: {snippet!r}")
+
+
+def assert_count(driver, locator, count):
+    """Exactly ``count`` elements match ``locator``."""
+    ok, actual = _check(driver, "count", locator, count)
+    if not ok:
+        raise AssertionError(f"expected {count} elements at {locator}, found {actual}")
+
+
+def assert_attribute(driver, locator, name, value):
+    """The element at ``locator`` has attribute ``name`` equal to ``value``."""
+    ok, actual = _check(driver, "attribute", locator, value, name)
+    if not ok:
+        raise AssertionError(f"{locator} [{name}] expected {value!r}, found {actual!r}")
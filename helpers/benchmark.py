@@ -0,0 +1,234 @@
+"""Repeatable timing of the SauceDemo and DemoQA flows.
+
+    python -m helpers.benchmark -n 10
+    python -m helpers.benchmark -n 10 --flows login_id,order_confirmation --threshold 0.15
+
+Each flow runs N times (after one warm-up run) on a pooled driver. The report
+gives median/p95 wall time, WebDriver command count and bytes per flow. Runs
+are saved under .benchmarks/ and compared with the previous run, or with
+--baseline; the exit status is 1 when a flow's median or p95 regresses by
+more than --threshold (--p95-threshold for the p95, which is noisier with few
+iterations).
+
+By default the environment is pinned: the local stand-in with no added
+latency and the fast browser profile. --live benchmarks the public sites.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import selenium
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = ROOT / ".benchmarks"
+
+
+def _load(filename):
+    """Import one of the top-level suite files (their names are not valid modules)."""
+    name = "_bench_" + "".join(c if c.isalnum() else "_" for c in filename)
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, ROOT / filename)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        sys.modules[name] = module
+    return sys.modules[name]
+
+
+def _assignment1(name):
+    return lambda driver: getattr(_load("Assignment-1_login.py"), name)(driver)
+
+
+def _demoqa(name):
+    def flow(driver):
+        from helpers import demoqa
+        return getattr(demoqa, name)(driver)
+    return flow
+
+
+def order_confirmation(driver):
+    from helpers import utils
+    from selenium.webdriver.common.by import By
+    utils.session_login(driver)
+    utils.add_to_cart(driver)
+    utils.go_to_cart(driver)
+    utils.checkout(driver)
+    driver.find_element(By.ID, "finish").click()
+
+
+def order_cancellation(driver):
+    from helpers import utils
+    from selenium.webdriver.common.by import By
+    utils.session_login(driver)
+    utils.add_to_cart(driver, "Sauce Labs Bike Light")
+    utils.go_to_cart(driver)
+    utils.checkout(driver)
+    driver.find_element(By.ID, "cancel").click()
+
+
+FLOWS = {
+    "login_id": _assignment1("login_with_id"),
+    "login_name": _assignment1("login_with_name"),
+    "login_xpath": _assignment1("login_with_xpath"),
+    "order_confirmation": order_confirmation,
+    "order_cancellation": order_cancellation,
+    "demoqa_text_box": _demoqa("input_field"),
+    "demoqa_radio": _demoqa("radio_button"),
+    "demoqa_checkbox": _demoqa("checkbox"),
+    "demoqa_buttons": _demoqa("buttons"),
+    "demoqa_alerts": _demoqa("alerts"),
+    "demoqa_links": _demoqa("navigation"),
+    "demoqa_modal": _demoqa("modal_dialog"),
+}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+
+def _transferred(records):
+    """Bytes the browser fetched, from the Resource/Navigation Timing of each get()."""
+    total = 0
+    for r in records:
+        timing = r.get("timing") or {}
+        total += (timing.get("navigation") or {}).get("transferSize", 0)
+        total += sum(res.get("size", 0) for res in timing.get("resources", []))
+    return total
+
+
+def run_flow(pool, name, iterations):
+    flow = FLOWS[name]
+    from helpers import instrumentation
+
+    samples = []
+    for i in range(iterations + 1):
+        with pool.lease() as driver:
+            instrumentation.instrument(driver)  # off by default outside pytest
+            instrumentation.recorder.start(name)
+            start = time.perf_counter()
+            flow(driver)
+            wall = time.perf_counter() - start
+            records = instrumentation.recorder.take()
+        if i == 0:
+            continue  # warm-up
+        stats = instrumentation.summarize(records)
+        samples.append({
+            "wall": wall,
+            "commands": stats["commands"],
+            "webdriver_bytes": stats["bytes"],
+            "transferred_bytes": _transferred(records),
+        })
+    walls = [s["wall"] for s in samples]
+    return {
+        "iterations": iterations,
+        "median": statistics.median(walls),
+        "p95": percentile(walls, 95),
+        "commands": statistics.median(s["commands"] for s in samples),
+        "webdriver_bytes": statistics.median(s["webdriver_bytes"] for s in samples),
+        "transferred_bytes": statistics.median(s["transferred_bytes"] for s in samples),
+    }
+
+
+def environment(live):
+    from helpers import driver_cache, standin
+    return {
+        "target": "live" if live else "standin",
+        "latency": os.getenv("STANDIN_LATENCY", "none"),
+        "fast_profile": os.getenv("FAST_PROFILE") == "1",
+        "chrome": driver_cache.chrome_version(),
+        "selenium": selenium.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "saucedemo": standin.saucedemo_url(),
+        "demoqa": standin.demoqa_url(),
+    }
+
+
+# a baseline recorded with any of these set differently measures something else
+COMPARABLE = ("target", "latency", "fast_profile")
+
+
+def mismatched(current, baseline):
+    """Environment keys in COMPARABLE on which two results files differ."""
+    before = baseline.get("environment", {})
+    return [key for key in COMPARABLE if before.get(key) != current["environment"][key]]
+
+
+def compare(current, baseline, threshold, p95_threshold=None):
+    """``(flow, statistic, before, after)`` for each median or p95 that got slower
+    than ``baseline`` by more than its threshold (``p95_threshold`` defaults to ``threshold``)."""
+    limits = {"median": threshold, "p95": threshold if p95_threshold is None else p95_threshold}
+    regressions = []
+    for name, result in current["flows"].items():
+        before = baseline["flows"].get(name)
+        for stat, limit in limits.items():
+            if before and stat in before and result[stat] > before[stat] * (1 + limit):
+                regressions.append((name, stat, before[stat], result[stat]))
+    return regressions
+
+
+def previous_run():
+    runs = sorted(RESULTS_DIR.glob("*.json"))
+    return json.loads(runs[-1].read_text()) if runs else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-n", "--iterations", type=int, default=5)
+    parser.add_argument("--flows", default=",".join(FLOWS), help="comma-separated subset of: " + ", ".join(FLOWS))
+    parser.add_argument("--live", action="store_true", help="benchmark the public sites instead of the stand-in")
+    parser.add_argument("--baseline", type=Path, help="results file to compare with (default: previous run)")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed median slowdown, e.g. 0.10 for 10%%")
+    parser.add_argument("--p95-threshold", type=float, default=0.25, help="allowed p95 slowdown (default 0.25)")
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.flows.split(",") if name not in FLOWS]
+    if unknown:
+        parser.error(f"unknown flow(s): {', '.join(unknown)} (choose from {', '.join(FLOWS)})")
+
+    if not args.live:
+        os.environ["STANDIN"] = "1"
+        os.environ.setdefault("STANDIN_LATENCY", "none")
+    os.environ.setdefault("FAST_PROFILE", "1")
+
+    from helpers.driver_pool import get_pool
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else previous_run()
+    pool = get_pool()
+    results = {"started": time.strftime("%Y-%m-%dT%H:%M:%S"), "environment": environment(args.live), "flows": {}}
+    print(f"{'flow':24} {'median':>9} {'p95':>9} {'cmds':>6} {'wd bytes':>10} {'net bytes':>10}")
+    for name in args.flows.split(","):
+        result = run_flow(pool, name, args.iterations)
+        results["flows"][name] = result
+        print(f"{name:24} {result['median'] * 1000:7.0f}ms {result['p95'] * 1000:7.0f}ms "
+              f"{result['commands']:6.0f} {result['webdriver_bytes']:10.0f} {result['transferred_bytes']:10.0f}")
+    pool.close()
+
+    if not args.no_save:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        path = RESULTS_DIR / (time.strftime("%Y%m%d-%H%M%S") + ".json")
+        path.write_text(json.dumps(results, indent=2))
+        print("saved", path)
+
+    if baseline is None:
+        return 0
+    differences = mismatched(results, baseline)
+    if differences:
+        print(f"baseline was recorded with a different {', '.join(differences)}; not comparing")
+        return 0
+    regressions = compare(results, baseline, args.threshold, args.p95_threshold)
+    for name, stat, before, after in regressions:
+        print(f"REGRESSION {name}: {stat} {before * 1000:.0f}ms -> {after * 1000:.0f}ms")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
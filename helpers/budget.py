@@ -0,0 +1,62 @@
+"""Startup budget: how long pytest takes before the first test can run.
+
+Measures process CPU time (interpreter start, pytest, plugins, test module
+imports and collection) up to the end of collection, and lists the heavy
+dependencies that got imported on the way. With ``--startup-budget SECONDS``
+(or STARTUP_BUDGET) a run that exceeds the budget exits non-zero, so
+``pytest --collect-only --startup-budget 1.5`` can gate CI.
+"""
+import os
+import sys
+import time
+
+import pytest
+
+
+# modules that should only load once a test actually drives a browser
+HEAVY = (
+    "selenium.webdriver.remote.webdriver",
+    "selenium.webdriver.common.action_chains",
+    "webdriver_manager",
+    "trio",
+    "PIL",
+    "numpy",
+)
+
+
+def pytest_addoption(parser):
+    parser.addoption("--startup-budget", type=float, default=None, metavar="SECONDS",
+                     help="fail the run when startup + collection exceeds SECONDS of CPU time (STARTUP_BUDGET)")
+
+
+def pytest_collection_finish(session):
+    session.config._startup = (time.process_time(), [m for m in HEAVY if m in sys.modules])
+
+
+def _budget(config):
+    budget = config.getoption("--startup-budget")
+    if budget is None and os.getenv("STARTUP_BUDGET"):
+        budget = float(os.environ["STARTUP_BUDGET"])
+    return budget
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not hasattr(config, "_startup"):
+        return
+    elapsed, heavy = config._startup
+    budget = _budget(config)
+    line = f"startup + collection: {elapsed:.2f}s CPU"
+    if budget is not None:
+        line += f" (budget {budget:.2f}s)"
+    terminalreporter.write_sep("-", "startup", bold=False)
+    terminalreporter.write_line(line, red=budget is not None and elapsed > budget)
+    if heavy:
+        terminalreporter.write_line("imported before the first test: " + ", ".join(heavy))
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session, exitstatus):
+    budget = _budget(session.config)
+    startup = getattr(session.config, "_startup", None)
+    if budget is not None and startup and startup[0] > budget and exitstatus == pytest.ExitCode.OK:
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
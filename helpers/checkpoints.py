@@ -0,0 +1,33 @@
+"""Named browser-state checkpoints.
+
+A checkpoint is built once per worker by replaying a flow (e.g. log in, add
+an item, open checkout), captured as URL + cookies + local/session storage,
+and restored in later tests with a single page load instead of the replay.
+"""
+from urllib.parse import urlsplit
+
+from helpers import sessions
+
+
+store = sessions.SessionStore()
+
+
+def restored(driver, state):
+    """The restore landed where the checkpoint was taken (not e.g. bounced to login)."""
+    return urlsplit(driver.current_url).path == urlsplit(state["url"]).path
+
+
+def checkpoint(driver, key, build, validate=restored):
+    """Restore checkpoint ``key``, or run ``build()`` and capture it on first use.
+
+    Returns True when an existing checkpoint was restored.
+    """
+    state = store.get(key)
+    if state is not None:
+        sessions.inject(driver, state, state["url"])
+        if validate(driver, state):
+            return True
+        store.drop(key)
+    build()
+    store.put(key, sessions.capture(driver))
+    return False
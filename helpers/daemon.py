@@ -0,0 +1,225 @@
+"""Keep N Chrome instances warm between runs for the edit-run loop.
+
+    python -m helpers.daemon start -n 2     # foreground; Ctrl-C or `stop` ends it
+    python -m helpers.daemon status
+    python -m helpers.daemon stop
+
+The daemon launches Chrome with ``--remote-debugging-port`` and records the
+instances in a state file next to the chromedriver cache. It checks each
+instance every few seconds through ``/json/version`` and relaunches any that
+died. driver_pool.new_driver() (and so setup_driver() and every pooled
+fixture) attaches to an idle instance through ``debuggerAddress``. Each
+instance is leased by one process at a time, guarded by a per-instance
+FileLock. When no instance is free or healthy, Chrome is launched normally.
+``driver.quit()`` on an attached driver runs the pool's reset (windows,
+storage, cookies, about:blank) and detaches, leaving the browser warm for
+the next run. BROWSER_DAEMON=0 disables attaching.
+"""
+import argparse
+import json
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+from helpers import profiles
+from helpers.driver_cache import CACHE_DIR, FileLock, resolve_chromedriver
+
+
+STATE = CACHE_DIR / "daemon.json"
+HEALTH_INTERVAL = 5.0
+CHROME_CANDIDATES = (
+    "google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+)
+
+
+def enabled():
+    return os.getenv("BROWSER_DAEMON", "1") != "0" and STATE.exists()
+
+
+def _lock(instance):
+    return FileLock(CACHE_DIR / f"daemon-{instance['port']}.lock", blocking=False)
+
+
+def _get(port, path, method="GET"):
+    request = urllib.request.Request(f"http://127.0.0.1:{port}{path}", method=method)
+    with urllib.request.urlopen(request, timeout=1) as response:
+        return json.loads(response.read())
+
+
+def healthy(instance):
+    """DevTools answers and there is a page to attach to (one is opened if needed)."""
+    try:
+        _get(instance["port"], "/json/version")
+        if not any(t["type"] == "page" for t in _get(instance["port"], "/json/list")):
+            _get(instance["port"], "/json/new?about:blank", method="PUT")
+        return True
+    except (OSError, ValueError):
+        return False
+
+
+def read_state():
+    try:
+        return json.loads(STATE.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def attach():
+    """A WebDriver attached to an idle, healthy daemon instance, or None."""
+    from selenium import webdriver
+    from selenium.common.exceptions import WebDriverException
+    from selenium.webdriver.chrome.service import Service
+
+    state = read_state()
+    for instance in state["instances"] if state else []:
+        lock = _lock(instance)
+        try:
+            lock.__enter__()
+        except BlockingIOError:
+            continue
+        if not healthy(instance):
+            lock.__exit__(None, None, None)
+            continue
+        options = webdriver.ChromeOptions()
+        options.debugger_address = f"127.0.0.1:{instance['port']}"
+        options.set_capability("goog:loggingPrefs", {"browser": "ALL"})
+        try:
+            driver = webdriver.Chrome(service=Service(resolve_chromedriver()), options=options)
+        except WebDriverException:
+            lock.__exit__(None, None, None)
+            continue
+        _detach_on_quit(driver, lock)
+        return driver
+    return None
+
+
+def _detach_on_quit(driver, lock):
+    from helpers.driver_pool import DriverPool
+    quit_driver = driver.quit
+
+    def quit():
+        try:
+            DriverPool.reset(driver)
+            quit_driver()  # stops this chromedriver; the daemon's Chrome keeps running
+        finally:
+            lock.__exit__(None, None, None)
+
+    driver.quit = quit
+    driver.daemon_attached = True
+
+
+# ---- daemon ----
+
+def chrome_binary():
+    if os.getenv("CHROME_BINARY"):
+        return os.environ["CHROME_BINARY"]
+    for candidate in CHROME_CANDIDATES:
+        path = shutil.which(candidate) or (candidate if os.path.isfile(candidate) else None)
+        if path:
+            return path
+    raise RuntimeError("Chrome not found; set CHROME_BINARY")
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def launch(fast):
+    port = _free_port()
+    profile = tempfile.mkdtemp(prefix="chrome-daemon-")
+    args = [a for a in profiles.chrome_options(fast).arguments if not a.startswith("--user-data-dir")]
+    cmd = [chrome_binary(), f"--remote-debugging-port={port}", f"--user-data-dir={profile}",
+           "--no-first-run", "--no-default-browser-check", *args, "about:blank"]
+    process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    instance = {"port": port, "pid": process.pid, "profile": profile}
+    deadline = time.monotonic() + 20
+    while not healthy(instance):
+        if process.poll() is not None or time.monotonic() > deadline:
+            raise RuntimeError(f"Chrome did not come up on port {port}")
+        time.sleep(0.1)
+    return instance, process
+
+
+def _write_state(instances):
+    STATE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = STATE.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"pid": os.getpid(), "instances": instances}, indent=1))
+    os.replace(tmp, STATE)
+
+
+def _terminate(instance, process):
+    process.terminate()
+    try:
+        process.wait(5)
+    except subprocess.TimeoutExpired:
+        process.kill()
+    shutil.rmtree(instance["profile"], ignore_errors=True)
+
+
+def serve(count, fast):
+    running = [launch(fast) for _ in range(count)]
+    _write_state([instance for instance, _ in running])
+    signal.signal(signal.SIGTERM, lambda *a: sys.exit(0))
+    print(f"{count} Chrome instance(s) warm on port(s) "
+          f"{', '.join(str(i['port']) for i, _ in running)}; state in {STATE}")
+    try:
+        while True:
+            time.sleep(HEALTH_INTERVAL)
+            for i, (instance, process) in enumerate(running):
+                if process.poll() is None and healthy(instance):
+                    continue
+                print(f"instance on port {instance['port']} is unhealthy, relaunching")
+                _terminate(instance, process)
+                running[i] = launch(fast)
+                _write_state([instance for instance, _ in running])
+    except KeyboardInterrupt:
+        pass
+    finally:
+        STATE.unlink(missing_ok=True)
+        for instance, process in running:
+            _terminate(instance, process)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-warmed Chrome instances for local runs.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    start = sub.add_parser("start", help="launch the instances and watch them (foreground)")
+    start.add_argument("-n", "--instances", type=int, default=2)
+    start.add_argument("--fast-profile", action="store_true", help="launch with the fast profile flags")
+    sub.add_parser("status", help="show the instances and whether they are healthy and leased")
+    sub.add_parser("stop", help="stop a running daemon")
+    args = parser.parse_args(argv)
+
+    if args.command == "start":
+        serve(args.instances, args.fast_profile or profiles.fast_profile_enabled())
+        return 0
+    state = read_state()
+    if state is None:
+        print("no daemon running")
+        return 1
+    if args.command == "stop":
+        os.kill(state["pid"], signal.SIGTERM)
+        return 0
+    for instance in state["instances"]:
+        try:
+            with _lock(instance):
+                leased = False
+        except BlockingIOError:
+            leased = True
+        print(f"port {instance['port']}: {'healthy' if healthy(instance) else 'DOWN'}"
+              f"{', leased' if leased else ''}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
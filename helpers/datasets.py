@@ -0,0 +1,140 @@
+"""Streaming data-driven parametrization from CSV or JSONL files.
+
+    @pytest.mark.dataset("data/checkout.csv")
+    def test_checkout(login_helper, dataset_row):
+        login_helper.submit_checkout_info(dataset_row["first"], ...)
+
+Collection only scans the file for record offsets. pytest still needs one
+case per row, but each case is a small slotted Row holding an offset and
+line number; the record is read and parsed when the test first touches it.
+Test ids are ``<file stem>:<line>``. One record per line: CSV fields with
+embedded newlines are not supported.
+
+Marker options: ``argname`` (default ``dataset_row``), ``sample`` (reservoir
+sample of N rows) and ``seed``. ``--dataset-sample N`` and
+``--dataset-shard I/N`` apply the same to every dataset from the command line.
+"""
+import csv
+import json
+import random
+from itertools import islice
+from pathlib import Path
+
+
+class Dataset:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.format = "jsonl" if self.path.suffix in (".jsonl", ".ndjson") else "csv"
+        self._header = None
+
+    @property
+    def header(self):
+        if self._header is None and self.format == "csv":
+            with open(self.path, newline="", encoding="utf-8") as fh:
+                self._header = next(csv.reader([fh.readline()]))
+        return self._header
+
+    def offsets(self):
+        """Yield ``(line_number, byte_offset)`` of every record, streaming the file."""
+        with open(self.path, "rb") as fh:
+            if self.format == "csv":
+                fh.readline()
+            lineno = 1 if self.format == "csv" else 0
+            while True:
+                offset = fh.tell()
+                line = fh.readline()
+                if not line:
+                    return
+                lineno += 1
+                if line.strip():
+                    yield lineno, offset
+
+    def read(self, offset):
+        with open(self.path, "rb") as fh:
+            fh.seek(offset)
+            line = fh.readline().decode("utf-8")
+        if self.format == "jsonl":
+            return json.loads(line)
+        return dict(zip(self.header, next(csv.reader([line]))))
+
+    def rows(self, sample=None, seed=0, shard=None):
+        """Lazy rows, optionally reservoir-sampled and/or sliced to shard ``(index, count)``."""
+        records = self.offsets()
+        if shard is not None:
+            index, count = shard
+            records = islice(records, index, None, count)
+        if sample is not None:
+            records = sorted(_reservoir(records, sample, random.Random(seed)))
+        for lineno, offset in records:
+            yield Row(self, lineno, offset)
+
+
+def _reservoir(iterable, k, rng):
+    chosen = []
+    for i, item in enumerate(iterable):
+        if i < k:
+            chosen.append(item)
+        else:
+            j = rng.randint(0, i)
+            if j < k:
+                chosen[j] = item
+    return chosen
+
+
+class Row:
+    """One record, parsed on first access."""
+
+    __slots__ = ("dataset", "lineno", "offset", "_data")
+
+    def __init__(self, dataset, lineno, offset):
+        self.dataset = dataset
+        self.lineno = lineno
+        self.offset = offset
+        self._data = None
+
+    @property
+    def data(self):
+        if self._data is None:
+            self._data = self.dataset.read(self.offset)
+        return self._data
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    @property
+    def id(self):
+        return f"{self.dataset.path.stem}:{self.lineno}"
+
+    def __repr__(self):
+        return f"Row({self.id})"
+
+
+def pytest_addoption(parser):
+    parser.addoption("--dataset-sample", type=int, default=None, metavar="N",
+                     help="run a reservoir sample of N rows from each dataset")
+    parser.addoption("--dataset-shard", default=None, metavar="I/N",
+                     help="run every N-th dataset row starting at row I")
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "dataset(path, argname='dataset_row', sample=None, seed=0): parametrize from a CSV/JSONL file"
+    )
+
+
+def pytest_generate_tests(metafunc):
+    marker = metafunc.definition.get_closest_marker("dataset")
+    if marker is None:
+        return
+    config = metafunc.config
+    dataset = Dataset(config.rootpath / marker.args[0])
+    shard = config.getoption("--dataset-shard")
+    rows = list(dataset.rows(
+        sample=config.getoption("--dataset-sample") or marker.kwargs.get("sample"),
+        seed=marker.kwargs.get("seed", 0),
+        shard=tuple(int(n) for n in shard.split("/")) if shard else None,
+    ))
+    metafunc.parametrize(marker.kwargs.get("argname", "dataset_row"), rows, ids=lambda row: row.id)
@@ -0,0 +1,157 @@
+"""DemoQA flows shared by the Assignment-2 script and the Assignment-3 tests.
+
+Each flow opens its page under ``base_url`` (default: demoqa_url()), performs
+the interaction and waits for its post-condition. Assertions are left to the
+callers.
+"""
+import os
+
+from selenium.webdriver.common.by import By
+
+from helpers.dom_batch import fill_form
+from helpers.standin import demoqa_url
+from helpers.waits import (
+    wait_for, element_present, element_visible, element_invisible, element_clickable,
+    text_present, alert_present, window_count,
+)
+
+
+UPLOAD_FILE = os.getenv("UPLOAD_FILE", "C:\\Users\\User\\Downloads\\testfile.txt")  # change path
+
+
+def _open(driver, base_url, path):
+    driver.get((base_url or demoqa_url()) + path)
+
+
+def _actions(driver):
+    # ActionChains pulls in the input device stack; only the two flows below need it
+    from selenium.webdriver.common.action_chains import ActionChains
+    return ActionChains(driver)
+
+
+def input_field(driver, base_url=None):
+    _open(driver, base_url, "/text-box")
+    fill_form(driver, {
+        (By.ID, "userName"): "Khadija QA",
+        (By.ID, "userEmail"): "khadijamosammad577@gmail.com",
+        (By.ID, "currentAddress"): "Dhaka, Bangladesh",
+        (By.ID, "permanentAddress"): "Same as above",
+    }, submit=(By.ID, "submit"))
+    wait_for(driver, element_present((By.CSS_SELECTOR, "#output #name")))
+
+
+def radio_button(driver, base_url=None):
+    _open(driver, base_url, "/radio-button")
+    driver.find_element(By.XPATH, "//label[@for='yesRadio']").click()
+    wait_for(driver, text_present((By.CLASS_NAME, "text-success"), "Yes"))
+
+
+def checkbox(driver, base_url=None):
+    _open(driver, base_url, "/checkbox")
+    driver.find_element(By.CLASS_NAME, "rct-icon-expand-close").click()
+    driver.find_element(By.CLASS_NAME, "rct-checkbox").click()
+    wait_for(driver, element_present((By.ID, "result")))
+
+
+def buttons(driver, base_url=None):
+    _open(driver, base_url, "/buttons")
+    actions = _actions(driver)
+    double_btn = driver.find_element(By.ID, "doubleClickBtn")
+    right_btn = driver.find_element(By.ID, "rightClickBtn")
+    click_btn = driver.find_element(By.XPATH, "//button[text()='Click Me']")
+
+    actions.double_click(double_btn).perform()
+    actions.context_click(right_btn).perform()
+    click_btn.click()
+    wait_for(driver, element_present((By.ID, "dynamicClickMessage")))
+
+
+def hover_menu(driver, base_url=None):
+    _open(driver, base_url, "/menu")
+    menu_item = driver.find_element(By.XPATH, "//a[text()='Main Item 2']")
+    _actions(driver).move_to_element(menu_item).perform()
+    wait_for(driver, element_visible((By.XPATH, "//a[text()='SUB SUB LIST »']")))
+
+
+def file_upload(driver, base_url=None, path=UPLOAD_FILE):
+    _open(driver, base_url, "/upload-download")
+    driver.find_element(By.ID, "uploadFile").send_keys(path)
+    wait_for(driver, element_present((By.ID, "uploadedFilePath")))
+
+
+def alerts(driver, base_url=None):
+    """Accept the alert, dismiss the confirm, answer the prompt.
+
+    Returns ``[kind, message]`` for each dialog answered, in order.
+    """
+    from helpers import fused
+    _open(driver, base_url, "/alerts")
+    if fused.enabled():
+        # the page answers the dialogs itself, so the three clicks are one script
+        with fused.plan(driver, dialogs={"confirm": False, "prompt": "Khadija"}) as page:
+            for button in ("alertButton", "confirmButton", "promtButton"):
+                page.find_element(By.ID, button).click()
+        wait_for(driver, text_present((By.ID, "confirmResult"), "Cancel"))
+        wait_for(driver, text_present((By.ID, "promptResult"), "Khadija"))
+        return [list(dialog) for dialog in page.plan.dialog_messages]
+
+    answered = []
+
+    # Normal alert
+    driver.find_element(By.ID, "alertButton").click()
+    alert = wait_for(driver, alert_present())
+    answered.append(["alert", alert.text])
+    alert.accept()
+
+    # Confirm alert
+    driver.find_element(By.ID, "confirmButton").click()
+    alert = wait_for(driver, alert_present())
+    answered.append(["confirm", alert.text])
+    alert.dismiss()
+    wait_for(driver, text_present((By.ID, "confirmResult"), "Cancel"))
+
+    # Prompt alert
+    driver.find_element(By.ID, "promtButton").click()
+    alert = wait_for(driver, alert_present())
+    answered.append(["prompt", alert.text])
+    alert.send_keys("Khadija")
+    alert.accept()
+    wait_for(driver, text_present((By.ID, "promptResult"), "Khadija"))
+    return answered
+
+
+def alert_wait(driver, base_url=None):
+    _open(driver, base_url, "/alerts")
+    driver.find_element(By.ID, "timerAlertButton").click()
+    wait_for(driver, alert_present(), timeout=10).accept()
+
+
+def dynamic_button(driver, base_url=None):
+    """Return the "enable after 5 seconds" button once it is clickable."""
+    _open(driver, base_url, "/dynamic-properties")
+    return wait_for(driver, element_clickable((By.ID, "enableAfter")), timeout=10)
+
+
+def navigation(driver, base_url=None):
+    """Follow the new-tab link and return the new tab's title."""
+    _open(driver, base_url, "/links")
+    driver.find_element(By.ID, "simpleLink").click()
+    wait_for(driver, window_count(2))
+    driver.switch_to.window(driver.window_handles[1])
+    title = driver.title
+    driver.close()
+    driver.switch_to.window(driver.window_handles[0])
+    return title
+
+
+def modal_dialog(driver, base_url=None):
+    """Open and close the small modal; return the title it showed while open."""
+    from helpers import visual
+    _open(driver, base_url, "/modal-dialogs")
+    driver.find_element(By.ID, "showSmallModal").click()
+    close = wait_for(driver, element_visible((By.ID, "closeSmallModal")))
+    title = driver.find_element(By.ID, "example-modal-sizes-title-sm").text
+    visual.checkpoint(driver, "demoqa-small-modal", element=(By.CLASS_NAME, "modal-content"))
+    close.click()
+    wait_for(driver, element_invisible((By.CLASS_NAME, "modal-content")))
+    return title
@@ -0,0 +1,175 @@
+"""Read and write many elements in one script execution instead of one command each."""
+import weakref
+
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+
+
+# locate()/locateAll() accept any selenium By strategy, optionally under a root element.
+LOCATE_JS = """
+function locateAll(by, value, root) {
+    root = root || document;
+    switch (by) {
+        case 'id': return Array.prototype.slice.call(root.querySelectorAll('#' + CSS.escape(value)));
+        case 'name': return Array.prototype.slice.call(root.querySelectorAll('[name="' + CSS.escape(value) + '"]'));
+        case 'class name': return Array.prototype.slice.call(root.getElementsByClassName(value));
+        case 'tag name': return Array.prototype.slice.call(root.getElementsByTagName(value));
+        case 'css selector': return Array.prototype.slice.call(root.querySelectorAll(value));
+        case 'link text':
+        case 'partial link text':
+            return Array.prototype.filter.call(root.querySelectorAll('a'), function (a) {
+                var text = a.textContent.trim();
+                return by === 'link text' ? text === value : text.indexOf(value) >= 0;
+            });
+        case 'xpath':
+            var result = document.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var nodes = [];
+            for (var i = 0; i < result.snapshotLength; i++) nodes.push(result.snapshotItem(i));
+            return nodes;
+    }
+    throw new Error('unsupported locator strategy: ' + by);
+}
+function locate(by, value, root) {
+    return locateAll(by, value, root)[0] || null;
+}
+"""
+
+# window.__domVersion is bumped by a MutationObserver on any structural or
+# text change; together with the URL it tells us whether a snapshot is stale.
+# The counter restarts with every document, so a per-document token keeps a
+# reload of the same URL from matching a snapshot of the previous page.
+DOM_VERSION_JS = """
+if (window.__domVersion === undefined) {
+    window.__domVersion = 0;
+    window.__domToken = performance.timeOrigin + '-' + Math.random().toString(36).slice(2);
+    new MutationObserver(function () { window.__domVersion++; })
+        .observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+}
+return location.href + '#' + window.__domToken + ':' + window.__domVersion;
+"""
+
+COLLECT_JS = LOCATE_JS + """
+var rows = locateAll(arguments[0], arguments[1]);
+var fields = arguments[2], handles = arguments[3];
+var out = rows.map(function (row) {
+    var item = {};
+    for (var name in fields) {
+        var el = locate(fields[name][0], fields[name][1], row);
+        item[name] = el && handles.indexOf(name) < 0 ? el.textContent.trim() : el;
+    }
+    return item;
+});
+""" + "var version = (function () {" + DOM_VERSION_JS + "})();\nreturn [version, out];"
+
+# Values go through the prototype's native setter so frameworks that track the
+# last value (React) see a real change, then input/change fire as for typing.
+SET_VALUE_JS = """
+function setValue(el, value) {
+    var proto = Object.getPrototypeOf(el);
+    var setter = Object.getOwnPropertyDescriptor(proto, 'value');
+    el.focus();
+    if (setter && setter.set) { setter.set.call(el, value); } else { el.value = value; }
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+    el.blur();
+}
+"""
+
+FILL_JS = LOCATE_JS + SET_VALUE_JS + """
+var fields = arguments[0], submit = arguments[1], missing = [];
+fields.forEach(function (f) {
+    var el = locate(f[0], f[1]);
+    if (!el) { missing.push(f[0] + '=' + f[1]); return; }
+    setValue(el, f[2]);
+});
+if (!missing.length && submit) {
+    var button = locate(submit[0], submit[1]);
+    if (button) { button.click(); } else { missing.push(submit[0] + '=' + submit[1]); }
+}
+return missing;
+"""
+
+
+def _missing_fields(missing):
+    return NoSuchElementException(f"Form fields not found: {', '.join(missing)}")
+
+
+def fill_form(driver, values, submit=None):
+    """Set every ``locator: value`` pair (and optionally click ``submit``) in one script call."""
+    fields = [[by, value, str(text)] for (by, value), text in values.items()]
+    defer = getattr(driver, "defer_script", None)
+    if defer is not None:
+        # inside a fused plan (helpers.fused) the fill joins the plan's other steps.
+        # The submit becomes a click step of its own: the plan ends its script
+        # after a click that navigates, so later steps never hit the unloading page.
+        defer(FILL_JS, [fields, None], _missing_fields)
+        if submit:
+            driver.find_element(*submit).click()
+        return
+    missing = driver.execute_script(FILL_JS, fields, list(submit) if submit else None)
+    if missing:
+        raise _missing_fields(missing)
+
+
+class CollectionIndex:
+    """In-memory snapshot of a repeated block of the page (e.g. inventory items).
+
+    ``fields`` maps a name to a locator relative to each row; names listed in
+    ``handles`` come back as WebElements, the rest as stripped text. The whole
+    collection is read with one script call and reused until the DOM changes,
+    which costs one cheap version check per lookup.
+    """
+
+    def __init__(self, driver, rows, fields, key, handles=()):
+        self.driver = driver
+        self.rows_locator = rows
+        self.fields = fields
+        self.key = key
+        self.handles = list(handles)
+        self._version = None
+        self._items = []
+
+    def invalidate(self):
+        self._version = None
+
+    def refresh(self):
+        by, value = self.rows_locator
+        self._version, self._items = self.driver.execute_script(
+            COLLECT_JS, by, value, {k: list(v) for k, v in self.fields.items()}, self.handles
+        )
+        return self._items
+
+    def items(self):
+        if self._version is None or self.driver.execute_script(DOM_VERSION_JS) != self._version:
+            return self.refresh()
+        return self._items
+
+    def get(self, key_value):
+        for item in self.items():
+            if item[self.key] == key_value:
+                return item
+        return None
+
+    def click(self, key_value, handle):
+        """Click ``handle`` on the row whose key is ``key_value``; False if no such row."""
+        for attempt in range(2):
+            item = self.get(key_value)
+            if item is None:
+                return False
+            try:
+                item[handle].click()
+                return True
+            except StaleElementReferenceException:
+                if attempt:
+                    raise
+                self.invalidate()
+
+
+_indexes = weakref.WeakKeyDictionary()
+
+
+def collection_index(driver, name, *args, **kwargs):
+    """The driver's CollectionIndex called ``name``, created on first use."""
+    per_driver = _indexes.setdefault(driver, {})
+    if name not in per_driver:
+        per_driver[name] = CollectionIndex(driver, *args, **kwargs)
+    return per_driver[name]
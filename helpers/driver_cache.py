@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+
+CACHE_DIR = Path(os.getenv("DRIVER_CACHE_DIR", Path.home() / ".cache" / "selenium-suite"))
+INDEX = CACHE_DIR / "chromedriver.json"
+
+
+class FileLock:
+    """Exclusive advisory lock on a file, shared by parallel workers.
+
+    With ``blocking=False`` entering raises BlockingIOError if another process
+    holds the lock.
+    """
+
+    def __init__(self, path, blocking=True):
+        self.path = Path(path)
+        self.blocking = blocking
+        self._fh = None
+
+    def __enter__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = open(self.path, "a+b")
+        try:
+            if os.name == "nt":
+                import msvcrt
+                self._fh.seek(0)
+                msvcrt.locking(self._fh.fileno(), msvcrt.LK_LOCK if self.blocking else msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(self._fh.fileno(), fcntl.LOCK_EX | (0 if self.blocking else fcntl.LOCK_NB))
+        except OSError as err:
+            self._fh.close()
+            self._fh = None
+            raise BlockingIOError(f"{self.path} is locked") from err
+        return self
+
+    def __exit__(self, *exc):
+        if os.name == "nt":
+            import msvcrt
+            self._fh.seek(0)
+            msvcrt.locking(self._fh.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(self._fh.fileno(), fcntl.LOCK_UN)
+        self._fh.close()
+        self._fh = None
+
+
+def chrome_version():
+    """Installed Chrome version, read from the local binary (no network)."""
+    from webdriver_manager.core.os_manager import ChromeType, OperationSystemManager
+    return OperationSystemManager().get_browser_version_from_os(ChromeType.GOOGLE) or "unknown"
+
+
+def sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _load_index():
+    try:
+        return json.loads(INDEX.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _valid(entry):
+    """Check a cache entry; the full hash only runs when size or mtime moved."""
+    try:
+        stat = os.stat(entry["path"])
+    except (OSError, KeyError):
+        return False
+    if stat.st_size == entry.get("size") and stat.st_mtime_ns == entry.get("mtime_ns"):
+        return True
+    return sha256(entry["path"]) == entry.get("sha256")
+
+
+def _record(index, version, path):
+    stat = os.stat(path)
+    index[version] = {
+        "path": str(path),
+        "sha256": sha256(path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+    tmp = INDEX.with_suffix(".tmp")
+    tmp.write_text(json.dumps(index, indent=2))
+    os.replace(tmp, INDEX)
+
+
+def resolve_chromedriver():
+    """Path to a chromedriver matching the installed Chrome.
+
+    CHROMEDRIVER_PATH wins outright. Otherwise a checksummed on-disk cache keyed
+    by Chrome version answers warm runs without touching the network; misses
+    fall back to ChromeDriverManager under a file lock so parallel workers
+    download once. With DRIVER_OFFLINE=1 a miss is an error instead.
+    """
+    if os.getenv("CHROMEDRIVER_PATH"):
+        return os.environ["CHROMEDRIVER_PATH"]
+    version = chrome_version()
+    entry = _load_index().get(version)
+    if entry and _valid(entry):
+        return entry["path"]
+
+    with FileLock(CACHE_DIR / "chromedriver.lock"):
+        index = _load_index()
+        entry = index.get(version)
+        if entry and _valid(entry):
+            return entry["path"]
+        if os.getenv("DRIVER_OFFLINE") == "1":
+            raise RuntimeError(
+                f"No cached chromedriver for Chrome {version} and DRIVER_OFFLINE=1; "
+                f"warm the cache on a connected machine or set CHROMEDRIVER_PATH"
+            )
+        from webdriver_manager.chrome import ChromeDriverManager
+        path = ChromeDriverManager().install()
+        _record(index, version, path)
+        return path
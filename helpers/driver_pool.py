@@ -0,0 +1,243 @@
+import atexit
+import os
+import threading
+import weakref
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.service import Service
+
+from helpers import instrumentation, profiles
+from helpers.driver_cache import resolve_chromedriver
+
+
+MAX_USES = int(os.getenv("DRIVER_POOL_MAX_USES", "50"))
+
+
+def default_pool_size():
+    """Pick a pool size from DRIVER_POOL_SIZE or the pytest-xdist worker count.
+
+    Every xdist worker is its own process with its own pool, so a worker only
+    ever needs one browser. Outside xdist we allow a few for threaded callers.
+    """
+    if os.getenv("DRIVER_POOL_SIZE"):
+        return max(1, int(os.environ["DRIVER_POOL_SIZE"]))
+    if os.getenv("PYTEST_XDIST_WORKER"):
+        return 1
+    workers = int(os.getenv("PYTEST_XDIST_WORKER_COUNT", "1"))
+    return max(1, min(4, (os.cpu_count() or 1) // workers))
+
+
+def new_driver():
+    """A fresh Chrome, using the fast profile when FAST_PROFILE=1.
+
+    Attaches to an idle instance of the browser daemon (helpers.daemon) when
+    one is running, and launches Chrome otherwise.
+    """
+    from helpers import daemon
+    fast = profiles.fast_profile_enabled()
+    driver = daemon.attach() if daemon.enabled() else None
+    if driver is None:
+        service = Service(resolve_chromedriver())
+        options = profiles.chrome_options(fast)
+        driver = webdriver.Chrome(service=service, options=options)
+        profile = profiles.user_data_dir(options)
+        if profile:
+            profiles.remove_profile_on_quit(driver, profile)
+    if fast:
+        profiles.block_resources(driver)
+    else:
+        driver.maximize_window()
+    return instrumentation.instrument(driver) if instrumentation.enabled() else driver
+
+
+class DriverPool:
+    """Lease warm Chrome instances instead of starting one per module.
+
+    A released driver is reset (cookies, storage, extra windows) and kept for
+    the next lease. It is quit instead once it has served ``max_uses`` leases,
+    fails its health check or was marked with mark_for_recycle().
+    """
+
+    def __init__(self, size=None, max_uses=MAX_USES, factory=new_driver):
+        self.size = size or default_pool_size()
+        self.max_uses = max_uses
+        self.factory = factory
+        self._idle = []
+        self._uses = {}
+        self._leased = set()
+        self._launching = 0
+        self._recycle = set()
+        self._cond = threading.Condition()
+        _pools.add(self)
+
+    def acquire(self):
+        with self._cond:
+            while not self._idle and len(self._leased) + self._launching >= self.size:
+                self._cond.wait()
+            driver = self._idle.pop() if self._idle else None
+            if driver is None:
+                self._launching += 1
+        if driver is None:
+            try:
+                driver = self.factory()
+                self._uses[id(driver)] = 0
+            finally:
+                with self._cond:
+                    self._launching -= 1
+                    self._cond.notify()
+        with self._cond:
+            self._leased.add(driver)
+        self._uses[id(driver)] += 1
+        return driver
+
+    def release(self, driver):
+        """End ``driver``'s lease. Releasing a driver that is not leased (twice,
+        or after close()) does nothing, so it can never be idle twice."""
+        with self._cond:
+            if driver not in self._leased:
+                return
+            self._leased.discard(driver)
+            recycle = id(driver) in self._recycle
+            self._recycle.discard(id(driver))
+        if recycle or self._uses.get(id(driver), 0) >= self.max_uses or not self.reset(driver):
+            self.discard(driver)
+        else:
+            with self._cond:
+                self._idle.append(driver)
+        with self._cond:
+            self._cond.notify()
+
+    @contextmanager
+    def lease(self):
+        driver = self.acquire()
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def mark_for_recycle(self, driver):
+        """Quit ``driver`` instead of reusing it when its current lease ends."""
+        with self._cond:
+            self._recycle.add(id(driver))
+
+    def marked_for_recycle(self, driver):
+        with self._cond:
+            return id(driver) in self._recycle
+
+    def owns(self, driver):
+        with self._cond:
+            return driver in self._leased or any(d is driver for d in self._idle)
+
+    def discard(self, driver):
+        self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+
+    @staticmethod
+    def healthy(driver):
+        try:
+            driver.window_handles
+            return True
+        except WebDriverException:
+            return False
+
+    @staticmethod
+    def reset(driver):
+        """Bring a driver back to a blank state. Returns False if it is broken."""
+        if not DriverPool.healthy(driver):
+            return False
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.execute_script(
+                "try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}"
+            )
+            try:
+                driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            except (AttributeError, WebDriverException):
+                driver.delete_all_cookies()
+            driver.get("about:blank")
+            return True
+        except WebDriverException:
+            return False
+
+    def close(self):
+        with self._cond:
+            drivers = self._idle + list(self._leased)
+            self._idle, self._leased = [], set()
+        for driver in drivers:
+            self.discard(driver)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+_pools = weakref.WeakSet()
+
+
+def owning_pool(driver):
+    """The DriverPool ``driver`` was leased from, or None (tab sessions, hand-made drivers)."""
+    for pool in list(_pools):
+        if pool.owns(driver):
+            return pool
+    return None
+
+
+def get_pool():
+    """Process-wide pool shared by every suite and script."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool()
+            atexit.register(_pool.close)
+        return _pool
+
+
+def tab_sessions_enabled():
+    return os.getenv("TAB_SESSIONS") == "1"
+
+
+@contextmanager
+def lease_driver():
+    """What the suite fixtures use: a whole pooled browser, or with
+    TAB_SESSIONS=1 an isolated tab session in a shared one."""
+    if tab_sessions_enabled():
+        from helpers.tab_sessions import tab_session
+        with tab_session() as driver:
+            yield driver
+    else:
+        with get_pool().lease() as driver:
+            yield driver
+
+
+def fixture_drivers(item):
+    """WebDrivers a test item received through its fixtures (directly or as ``.driver``)."""
+    for value in (getattr(item, "funcargs", None) or {}).values():
+        driver = getattr(value, "driver", value)
+        if hasattr(driver, "execute_script"):
+            yield driver
+
+
+def pytest_addoption(parser):
+    parser.addoption("--tab-sessions", action="store_true",
+                     help="give each driver fixture an isolated tab in a shared Chrome (TAB_SESSIONS=1)")
+
+
+def pytest_configure(config):
+    if config.getoption("--tab-sessions"):
+        os.environ["TAB_SESSIONS"] = "1"
+
+
+def setup_driver():
+    """Lease a driver for a script; hand it back with release_driver()."""
+    return get_pool().acquire()
+
+
+def release_driver(driver):
+    get_pool().release(driver)
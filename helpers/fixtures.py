@@ -0,0 +1,38 @@
+"""Fixtures shared by the pytest suites."""
+import pytest
+
+from helpers import standin
+from helpers.driver_pool import lease_driver, tab_sessions_enabled
+
+
+def lease_scope(default):
+    """Fixture scope for a leased driver: ``default``, or per test with --tab-sessions or --monitor.
+
+    A tab session is cheap enough to give every test its own cookies and
+    storage. Under the resource monitor, per-test leases let the pool swap
+    out a browser that crossed a limit before the next test.
+    """
+    def scope(fixture_name, config):
+        if config.getoption("--tab-sessions", False) or tab_sessions_enabled():
+            return "function"
+        if config.getoption("--monitor", False) or config.getoption("--monitor-log", None):
+            return "function"
+        return default
+    return scope
+
+
+@pytest.fixture(scope=lease_scope("module"))
+def driver():
+    """Lease a warm WebDriver (or tab session) from the shared pool."""
+    with lease_driver() as driver:
+        yield driver
+
+
+@pytest.fixture(scope="module")
+def demoqa_url():
+    return standin.demoqa_url()
+
+
+@pytest.fixture(scope="module")
+def saucedemo_url():
+    return standin.saucedemo_url()
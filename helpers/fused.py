@@ -0,0 +1,388 @@
+"""Fused execution: run a page-object flow as a few in-browser scripts.
+
+    with fused.plan(driver) as page_driver:
+        CartPage(page_driver).click_checkout()
+        CheckoutPage(page_driver).fill_info("John", "Doe", "12345")
+        CheckoutPage(page_driver).continue_checkout()
+
+Inside the block page objects get a recording driver. ``find_element()``
+returns a placeholder, and ``click``, ``send_keys``, ``clear`` and
+``fill_form`` are recorded as steps instead of being sent. Pending steps run
+as one ``execute_async_script`` when something needs an answer (``.text``,
+``current_url``, ``get`` or any other driver attribute) and when the block
+ends. A plan started while another is open on the same driver joins it; its
+``dialogs`` answers are added to the open plan's, and asking for a different
+answer or ``fallback`` raises ValueError.
+
+A click that starts a navigation ends its script. The script reports the
+steps it ran, and the rest go out in a new script once chromedriver has
+loaded the next page. If a step fails in the browser (element missing or not
+displayed, script error), the steps before it stand. The rest then run step
+by step through the real driver, so a genuine failure raises the usual
+Selenium exception. With ``fallback=False`` the browser-side error is raised
+instead, mapped to the matching Selenium exception.
+
+Native dialogs block scripts. ``dialogs={"confirm": False, "prompt": "text"}``
+answers alert/confirm/prompt inside the page for the duration of the plan,
+and the messages are kept in ``plan.dialog_messages``.
+
+Off unless ``--fused`` (or FUSED=1) is set. plan() then yields the real
+driver and every step is an ordinary command.
+"""
+import itertools
+import os
+from contextlib import contextmanager
+
+from selenium.common.exceptions import (
+    ElementNotInteractableException, JavascriptException, NoSuchElementException, WebDriverException,
+)
+
+from helpers.dom_batch import LOCATE_JS, SET_VALUE_JS
+
+
+ERRORS = {
+    "no such element": NoSuchElementException,
+    "element not interactable": ElementNotInteractableException,
+    "javascript error": JavascriptException,
+}
+PROGRESS_KEY = "__fused_progress"
+
+# Dialog stubs live on window until the plan restores them, so they survive
+# between the plan's scripts as long as the page does.
+DIALOGS_JS = """
+function installDialogs(answers) {
+    if (window.__fusedDialogs) { window.__fusedDialogs.answers = answers; return; }
+    var state = window.__fusedDialogs = {answers: answers, seen: [],
+        alert: window.alert, confirm: window.confirm, prompt: window.prompt};
+    window.alert = function (message) { state.seen.push(['alert', String(message)]); };
+    window.confirm = function (message) {
+        state.seen.push(['confirm', String(message)]);
+        return state.answers.confirm === undefined ? true : state.answers.confirm;
+    };
+    window.prompt = function (message) {
+        state.seen.push(['prompt', String(message)]);
+        return state.answers.prompt === undefined ? null : state.answers.prompt;
+    };
+}
+function drainDialogs() {
+    var state = window.__fusedDialogs;
+    return state ? state.seen.splice(0) : [];
+}
+"""
+
+RESTORE_DIALOGS_JS = DIALOGS_JS + """
+var state = window.__fusedDialogs, seen = drainDialogs();
+if (state) {
+    window.alert = state.alert; window.confirm = state.confirm; window.prompt = state.prompt;
+    delete window.__fusedDialogs;
+}
+return seen;
+"""
+
+# SCRIPTS (deferred script bodies, one function each) is prepended per batch.
+# After each click the runner yields one task: a navigation the click started
+# has fired beforeunload by then, and the batch stops there.
+RUN_JS = LOCATE_JS + SET_VALUE_JS + DIALOGS_JS + """
+var steps = arguments[0], dialogs = arguments[1], run = arguments[2];
+var done = arguments[arguments.length - 1];
+var results = [], unloading = false, i = 0;
+function onUnload() { unloading = true; }
+window.addEventListener('beforeunload', onUnload);
+if (dialogs) installDialogs(dialogs);
+
+function finish(error) {
+    window.removeEventListener('beforeunload', onUnload);
+    done({results: results, error: error, navigated: unloading, dialogs: drainDialogs()});
+}
+function fail(code, message, value) {
+    return {code: code, message: message, value: value};
+}
+function resolve(chain) {
+    var el = null;
+    for (var k = 0; k < chain.length; k++) {
+        el = locate(chain[k][0], chain[k][1], el);
+        if (!el) throw fail('no such element', 'Unable to locate element: ' + chain[k][0] + '=' + chain[k][1]);
+    }
+    return el;
+}
+function perform(step) {
+    if (step.kind === 'script') {
+        var value = SCRIPTS[step.script].apply(null, step.arg);
+        if (value && !(Array.isArray(value) && !value.length)) throw fail('script', 'deferred script failed', value);
+        return value;
+    }
+    var el = resolve(step.chain);
+    switch (step.kind) {
+        case 'text':
+            return el.innerText.trim();
+        case 'click':
+            if (!el.getClientRects().length) throw fail('element not interactable', 'element not displayed');
+            el.scrollIntoView({block: 'center', inline: 'nearest'});
+            el.click();
+            return null;
+        case 'clear':
+        case 'send_keys':
+            if (el.type === 'file' || !('value' in el)) throw fail('unfusable', step.kind + ' needs the real driver');
+            setValue(el, step.kind === 'clear' ? '' : el.value + step.arg);
+            return null;
+    }
+    throw fail('unfusable', 'unknown step ' + step.kind);
+}
+(function next() {
+    for (; i < steps.length; i++) {
+        try {
+            results.push(perform(steps[i]));
+        } catch (e) {
+            return finish(e && e.code ? e : fail('javascript error', String(e && e.message || e)));
+        }
+        try { sessionStorage.setItem('""" + PROGRESS_KEY + """', run + ':' + (i + 1)); } catch (e) {}
+        if (steps[i].kind === 'click') {
+            i++;
+            return setTimeout(function () { if (unloading) { finish(null); } else { next(); } }, 0);
+        }
+    }
+    finish(null);
+})();
+"""
+
+_runs = itertools.count(1)
+
+
+def enabled():
+    return os.getenv("FUSED") == "1"
+
+
+class Step:
+    def __init__(self, kind, chain=None, arg=None, error=None):
+        self.kind = kind
+        self.chain = chain      # [[by, value], ...] from the page down to the element
+        self.arg = arg          # text for send_keys; (source, args) for scripts
+        self.error = error      # scripts: builds the exception for a failing result
+        self.result = None
+
+    def __repr__(self):
+        target = " > ".join(f"{by}={value}" for by, value in self.chain or ())
+        return f"<Step {self.kind} {target}>"
+
+
+class RecordedElement:
+    """Placeholder for an element located by the plan's script when it runs."""
+
+    def __init__(self, plan, chain):
+        self._plan = plan
+        self._chain = chain
+
+    def find_element(self, by="id", value=None):
+        return RecordedElement(self._plan, self._chain + [[by, value]])
+
+    def click(self):
+        self._plan.add(Step("click", self._chain))
+
+    def clear(self):
+        self._plan.add(Step("clear", self._chain))
+
+    def send_keys(self, *value):
+        self._plan.add(Step("send_keys", self._chain, "".join(str(v) for v in value)))
+
+    @property
+    def text(self):
+        return self._plan.add(Step("text", self._chain), wait=True)
+
+    def __getattr__(self, name):
+        # anything else needs the real element
+        self._plan.flush()
+        return getattr(self._plan.resolve(self._chain), name)
+
+
+class RecordingDriver:
+    """What page objects see inside a plan; unrecorded attributes go to the real driver."""
+
+    def __init__(self, plan):
+        self.plan = plan
+
+    def find_element(self, by="id", value=None):
+        return RecordedElement(self.plan, [[by, value]])
+
+    def defer_script(self, source, args, error):
+        """Queue a script that returns nothing (or an empty list) on success; see dom_batch.fill_form."""
+        self.plan.add(Step("script", arg=(source, list(args)), error=error))
+
+    def __getattr__(self, name):
+        self.plan.flush()
+        return getattr(self.plan.driver, name)
+
+
+class Plan:
+    def __init__(self, driver, dialogs=None, fallback=True):
+        self.driver = driver
+        self.dialogs = dialogs
+        self.fallback = fallback
+        self.pending = []
+        self.results = []           # every finished step, in recording order
+        self.dialog_messages = []   # [kind, message] for each answered dialog
+        self.scripts = 0
+        self.fallbacks = 0
+
+    def add(self, step, wait=False):
+        if step.kind == "send_keys" and any("\ue000" <= ch <= "\uf8ff" for ch in step.arg):
+            wait = True  # Keys.ENTER and friends only mean something to the real driver
+            self.flush()
+            self._finish(step, self._perform(step))
+        else:
+            self.pending.append(step)
+        if wait:
+            self.flush()
+        return step.result
+
+    def flush(self):
+        while self.pending:
+            batch, self.pending = self.pending, []
+            ran, error = self._run(batch)
+            rest = batch[ran:]
+            if error is None:
+                self.pending = rest + self.pending  # stopped at a navigation
+                continue
+            if error == "unfusable":
+                self._finish(rest[0], self._perform(rest[0]))
+                self.pending = rest[1:] + self.pending
+                continue
+            if not self.fallback:
+                raise error
+            self.fallbacks += 1
+            for step in rest:
+                self._finish(step, self._perform(step))
+
+    def _run(self, batch):
+        """Run ``batch`` as one script; return (steps completed, error or None)."""
+        sources = []
+        payload = []
+        for step in batch:
+            item = {"kind": step.kind, "chain": step.chain, "arg": step.arg}
+            if step.kind == "script":
+                source, args = step.arg
+                if source not in sources:
+                    sources.append(source)
+                item.update(arg=args, script=sources.index(source))
+            payload.append(item)
+        script = "var SCRIPTS = [" + ",".join(f"function () {{\n{s}\n}}" for s in sources) + "];\n" + RUN_JS
+        run = next(_runs)
+        self.scripts += 1
+        try:
+            response = self.driver.execute_async_script(script, payload, self.dialogs, run)
+        except WebDriverException:
+            # the page unloaded before the script answered; its progress survives in sessionStorage
+            ran = self._progress(run)
+            if ran is None:
+                raise
+            for step in batch[:ran]:
+                self._finish(step, None)
+            return ran, None
+        self.dialog_messages.extend(response["dialogs"])
+        for step, result in zip(batch, response["results"]):
+            self._finish(step, result)
+        error = response["error"]
+        if error is None:
+            return len(response["results"]), None
+        ran = len(response["results"])
+        if error["code"] == "unfusable":
+            return ran, "unfusable"
+        failed = batch[ran]
+        if error["code"] == "script":
+            return ran, failed.error(error["value"])
+        return ran, ERRORS.get(error["code"], JavascriptException)(f"{error['message']} (fused step {failed!r})")
+
+    def _progress(self, run):
+        try:
+            value = self.driver.execute_script(f"try {{ return sessionStorage.getItem('{PROGRESS_KEY}'); }} "
+                                               "catch (e) { return null; }")
+        except WebDriverException:
+            return None
+        done_run, _, count = (value or "").partition(":")
+        return int(count) if done_run == str(run) else None
+
+    def _finish(self, step, result):
+        step.result = result
+        self.results.append(step)
+
+    def resolve(self, chain):
+        element = self.driver
+        for by, value in chain:
+            element = element.find_element(by, value)
+        return element
+
+    def _perform(self, step):
+        """Run one step through the real driver."""
+        if self.dialogs:
+            # a real click may navigate away from the stubs; reinstall them before each step
+            self.driver.execute_script(DIALOGS_JS + "installDialogs(arguments[0]);", self.dialogs)
+        if step.kind == "script":
+            source, args = step.arg
+            value = self.driver.execute_script(source, *args)
+            if value:
+                raise step.error(value)
+            return value
+        element = self.resolve(step.chain)
+        if step.kind == "text":
+            return element.text
+        if step.kind == "click":
+            return element.click()
+        if step.kind == "clear":
+            return element.clear()
+        return element.send_keys(step.arg)
+
+    def join(self, dialogs=None, fallback=None):
+        """Take on a nested plan's arguments; steps recorded so far keep the old answers."""
+        if fallback is not None and fallback != self.fallback:
+            raise ValueError(f"nested fused.plan(fallback={fallback}) inside a plan with fallback={self.fallback}")
+        if not dialogs:
+            return
+        answers = dict(self.dialogs or {})
+        for kind, answer in dialogs.items():
+            if kind in answers and answers[kind] != answer:
+                raise ValueError(f"nested fused.plan() answers {kind} with {answer!r}, "
+                                 f"the open plan with {answers[kind]!r}")
+            answers[kind] = answer
+        if answers != self.dialogs:
+            self.flush()
+            self.dialogs = answers  # the next script reinstalls the stubs with these
+
+    def close(self):
+        if self.dialogs:
+            try:
+                self.dialog_messages.extend(self.driver.execute_script(RESTORE_DIALOGS_JS) or [])
+            except WebDriverException:
+                pass
+
+
+@contextmanager
+def plan(driver, dialogs=None, fallback=None):
+    """Record the steps run against the yielded driver and send them fused (see module doc)."""
+    if isinstance(driver, RecordingDriver):
+        driver.plan.join(dialogs, fallback)
+        yield driver
+        return
+    current = getattr(driver, "_fused_plan", None)
+    if current is not None:
+        current.join(dialogs, fallback)
+        yield RecordingDriver(current)
+        return
+    if not enabled():
+        yield driver
+        return
+    current = driver._fused_plan = Plan(driver, dialogs, fallback is not False)
+    try:
+        yield RecordingDriver(current)
+        current.flush()
+    finally:
+        driver._fused_plan = None
+        current.close()
+
+
+def pytest_addoption(parser):
+    parser.addoption("--fused", action="store_true",
+                     help="send page-object steps inside fused.plan() blocks as batched scripts (FUSED=1)")
+
+
+def pytest_configure(config):
+    if config.getoption("--fused"):
+        os.environ["FUSED"] = "1"
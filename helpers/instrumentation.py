@@ -0,0 +1,204 @@
+"""Per-command WebDriver timing.
+
+instrument(driver) wraps ``driver.execute`` so every command (find, click,
+get, execute_script, ...) is recorded with its locator, wall time and payload
+size; every ``get`` also pulls the page's Navigation and Resource Timing. As a
+pytest plugin it groups the records per test, renders them as a timeline in
+the pytest-html report and exports them as JSONL with --webdriver-timings.
+
+Off unless something collects the records: --webdriver-timings, an --html
+report, WEBDRIVER_TIMINGS=1, or the benchmark, which instruments its drivers
+itself. Records are kept only between recorder.start() and take(), at most
+MAX_RECORDS of them.
+"""
+import html
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.command import Command
+
+
+TIMING_JS = """
+var nav = performance.getEntriesByType('navigation')[0];
+return {
+    navigation: nav ? nav.toJSON() : null,
+    resources: performance.getEntriesByType('resource').map(function (r) {
+        return {name: r.name, type: r.initiatorType, start: r.startTime,
+                duration: r.duration, size: r.transferSize};
+    })
+};
+"""
+MAX_RECORDS = int(os.getenv("WEBDRIVER_TIMINGS_MAX", "5000"))
+
+
+def enabled():
+    return os.getenv("WEBDRIVER_TIMINGS") == "1"
+
+
+def _size(value):
+    """Rough payload size in bytes without serialising the value."""
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(len(str(k)) + _size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(_size(v) for v in value)
+    return 8
+
+
+class CommandRecorder:
+    """Collects command records for the test that is currently running."""
+
+    def __init__(self):
+        self.test = None
+        self.started = time.perf_counter()
+        self.records = deque(maxlen=MAX_RECORDS)
+        self._lock = threading.Lock()
+
+    def start(self, test):
+        with self._lock:
+            self.test = test
+            self.started = time.perf_counter()
+            self.records.clear()
+
+    def take(self):
+        """Hand over the records and stop collecting until the next start()."""
+        with self._lock:
+            records = list(self.records)
+            self.records.clear()
+            self.test = None
+            return records
+
+    def add(self, record):
+        with self._lock:
+            if self.test is None:
+                return  # nobody is collecting (a script, or between tests)
+            record["offset"] = record.pop("t0") - self.started
+            self.records.append(record)
+
+
+recorder = CommandRecorder()
+
+
+def instrument(driver):
+    """Record every command ``driver`` sends. Safe to call more than once."""
+    if getattr(driver, "_instrumented", False):
+        return driver
+    original = driver.execute
+
+    def execute(command, params=None):
+        t0 = time.perf_counter()
+        response = original(command, params)
+        elapsed = time.perf_counter() - t0
+        record = {
+            "t0": t0,
+            "command": command,
+            "wall": elapsed,
+            "sent": _size(params or {}),
+            "received": _size((response or {}).get("value")),
+        }
+        if params and "using" in params:
+            record["locator"] = f"{params['using']}={params.get('value')}"
+        if command == Command.GET:
+            record["url"] = params.get("url")
+            # sent through ``original`` so it is not a command of its own in the
+            # counts; a page that alerts on load must not fail the driver.get
+            try:
+                record["timing"] = original(Command.W3C_EXECUTE_SCRIPT, {"script": TIMING_JS, "args": []}).get("value")
+            except WebDriverException:
+                record["timing"] = None
+        recorder.add(record)
+        return response
+
+    driver.execute = execute
+    driver._instrumented = True
+    return driver
+
+
+def summarize(records):
+    return {
+        "commands": len(records),
+        "wall": sum(r["wall"] for r in records),
+        "bytes": sum(r["sent"] + r["received"] for r in records),
+    }
+
+
+def timeline_html(records):
+    """A compact per-test timeline: one bar per command, positioned by start offset."""
+    if not records:
+        return ""
+    end = max(r["offset"] + r["wall"] for r in records) or 1.0
+    rows = []
+    for r in records:
+        left = 100 * r["offset"] / end
+        width = max(0.2, 100 * r["wall"] / end)
+        label = r["command"] + (f" {r['locator']}" if "locator" in r else "") + (f" {r['url']}" if "url" in r else "")
+        title = f"{label}: {r['wall'] * 1000:.1f}ms, {r['sent'] + r['received']} bytes"
+        color = "#d9534f" if r["command"] == Command.GET else "#5bc0de"
+        rows.append(
+            f'<div style="position:relative;height:14px;font-size:10px;white-space:nowrap">'
+            f'<div title="{html.escape(title)}" style="position:absolute;left:{left:.2f}%;width:{width:.2f}%;'
+            f'height:12px;background:{color}"></div>'
+            f'<span style="position:absolute;left:{min(left, 80):.2f}%;padding-left:2px">{html.escape(label[:80])}</span></div>'
+        )
+    stats = summarize(records)
+    return (
+        f'<div class="webdriver-timeline"><p>{stats["commands"]} WebDriver commands, '
+        f'{stats["wall"] * 1000:.0f}ms in chromedriver round trips, {stats["bytes"]} bytes '
+        f'over {end * 1000:.0f}ms</p>' + "".join(rows) + "</div>"
+    )
+
+
+def pytest_addoption(parser):
+    parser.addoption("--webdriver-timings", default=None, metavar="PATH",
+                     help="append per-command WebDriver timings as JSONL to PATH")
+
+
+_export = None
+
+
+def pytest_configure(config):
+    global _export
+    path = config.getoption("--webdriver-timings")
+    if path:
+        _export = open(path, "a", encoding="utf-8")
+    if path or getattr(config.option, "htmlpath", None):
+        os.environ["WEBDRIVER_TIMINGS"] = "1"
+
+
+def pytest_unconfigure(config):
+    if _export is not None:
+        _export.close()
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    recorder.start(item.nodeid)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    if call.when != "call" or not recorder.records:
+        return
+    try:
+        import pytest_html
+    except ImportError:
+        return
+    report = outcome.get_result()
+    extra = pytest_html.extras.html(timeline_html(list(recorder.records)))
+    report.extras = getattr(report, "extras", []) + [extra]
+
+
+def pytest_runtest_logfinish(nodeid):
+    records = recorder.take()
+    if _export is None:
+        return
+    for record in records:
+        _export.write(json.dumps({"test": nodeid, **record}, default=str) + "\n")
+    _export.flush()
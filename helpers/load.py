@@ -0,0 +1,279 @@
+"""Run the SauceDemo checkout flow as a load test with N virtual users.
+
+    python -m helpers.load -u 20 --ramp-up 10 --duration 60 --think exp:1
+    python -m helpers.load -u 4 --client browser --iterations 5
+    SAUCEDEMO_URL=https://staging.example/ python -m helpers.load --live -u 50
+
+Virtual users are asyncio tasks. They start evenly spread over --ramp-up
+seconds and repeat the flow until --duration runs out (or for --iterations
+each). Between steps a user pauses for a think time drawn from --think:
+``const:S``, ``uniform:A-B``, ``exp:MEAN`` or ``normal:MEAN,SD``.
+
+The flow is the one the suites use: login, add_to_cart, go_to_cart, checkout
+and finish from helpers.utils.
+- ``--client browser`` runs those functions on pooled headless Chromes, one
+  per user.
+- ``--client http`` (the default) is a protocol-level user. For each step it
+  requests the pages the browser would navigate to, plus their same-origin
+  scripts and stylesheets, over one keep-alive connection with a per-user
+  asset cache. After login it sends the ``session-username`` cookie the
+  login page sets, for the user's own SAUCE_USERS name. Steps that stay
+  inside the page (add_to_cart) make no requests.
+
+The report gives count, errors, throughput and p50/p90/p95/p99 latency per
+step. A user whose client cannot start (no browser, pool exhausted) counts
+as a ``start`` error, and the report is printed even if the run is cut short.
+Without --live the run targets the local stand-in.
+"""
+import argparse
+import asyncio
+import http.client
+import json
+import os
+import random
+import re
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote, urljoin, urlsplit
+
+from helpers.benchmark import percentile
+
+
+Step = namedtuple("Step", "name browser pages")
+
+
+def _finish(driver, username):
+    from selenium.webdriver.common.by import By
+    from helpers.waits import wait_for, url_contains
+    driver.find_element(By.ID, "finish").click()
+    wait_for(driver, url_contains("checkout-complete"))
+
+
+def _utils():
+    from helpers import utils
+    return utils
+
+
+# pages: what a browser navigates to during the step, relative to the base URL
+CHECKOUT_FLOW = [
+    Step("login", lambda d, u: _utils().login(d, u), ["", "inventory.html"]),
+    Step("add_to_cart", lambda d, u: _utils().add_to_cart(d), []),
+    Step("go_to_cart", lambda d, u: _utils().go_to_cart(d), ["cart.html"]),
+    Step("checkout", lambda d, u: _utils().checkout(d), ["checkout-step-one.html", "checkout-step-two.html"]),
+    Step("finish", _finish, ["checkout-complete.html"]),
+]
+
+
+def think_time(spec):
+    """Parse a think-time spec into a function returning seconds."""
+    kind, _, value = spec.partition(":")
+    if kind == "const":
+        return lambda: float(value)
+    if kind == "uniform":
+        low, high = (float(v) for v in value.split("-"))
+        return lambda: random.uniform(low, high)
+    if kind == "exp":
+        mean = float(value)
+        return lambda: random.expovariate(1 / mean) if mean > 0 else 0.0
+    if kind == "normal":
+        mean, sd = (float(v) for v in value.split(","))
+        return lambda: max(0.0, random.gauss(mean, sd))
+    raise ValueError(f"unknown think-time distribution {spec!r}")
+
+
+ASSET_RE = re.compile(r"""<(?:script[^>]+src|link[^>]+href)=["']([^"']+)["']""", re.I)
+
+
+class HttpClient:
+    """Protocol-level virtual user: one keep-alive connection and an asset cache."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        parts = urlsplit(base_url)
+        conn_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self.conn = conn_class(parts.netloc, timeout=30)
+        self.origin = f"{parts.scheme}://{parts.netloc}"
+        self.cached = set()
+        self.cookie = None
+
+    def fetch(self, url):
+        path = urlsplit(url)
+        headers = {"Accept-Encoding": "identity"}
+        if self.cookie:
+            headers["Cookie"] = self.cookie
+        self.conn.request("GET", path.path + (f"?{path.query}" if path.query else ""), headers=headers)
+        try:
+            response = self.conn.getresponse()
+            body = response.read()
+        except (OSError, http.client.HTTPException):
+            self.conn.close()  # reconnects on the next request
+            raise
+        if response.status >= 400:
+            raise RuntimeError(f"GET {url}: HTTP {response.status}")
+        return body
+
+    def run(self, step, username):
+        for i, page in enumerate(step.pages):
+            if step.name == "login" and i == 1:
+                # what the login form's script stores before it moves on
+                self.cookie = f"session-username={quote(username)}"
+            url = urljoin(self.base_url, page)
+            html = self.fetch(url).decode("utf-8", "replace")
+            for asset in ASSET_RE.findall(html):
+                asset_url = urljoin(url, asset)
+                if asset_url.startswith(self.origin) and asset_url not in self.cached:
+                    self.fetch(asset_url)
+                    self.cached.add(asset_url)
+
+    def end_iteration(self):
+        self.cookie = None
+
+    def close(self):
+        self.conn.close()
+
+
+class BrowserClient:
+    """Virtual user driving a pooled headless Chrome through the suite's helpers."""
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.driver = pool.acquire()
+
+    def run(self, step, username):
+        step.browser(self.driver, username)
+
+    def end_iteration(self):
+        self.pool.reset(self.driver)
+
+    def close(self):
+        self.pool.release(self.driver)
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self.iterations = 0
+
+    def add(self, step, seconds, error=None):
+        if error is None:
+            self.latencies.setdefault(step, []).append(seconds)
+        else:
+            self.errors.setdefault(step, []).append(error)
+
+    def report(self, elapsed, flow):
+        rows = {}
+        names = [s.name for s in flow]
+        for step in [name for name in self.errors if name not in names] + names:
+            values = self.latencies.get(step, [])
+            rows[step] = {
+                "count": len(values),
+                "errors": len(self.errors.get(step, [])),
+                "throughput": len(values) / elapsed if elapsed else 0.0,
+                **{f"p{p}": percentile(values, p) if values else None for p in (50, 90, 95, 99)},
+            }
+        return {"elapsed": elapsed, "iterations": self.iterations,
+                "iterations_per_s": self.iterations / elapsed if elapsed else 0.0, "steps": rows}
+
+
+async def virtual_user(index, args, make_client, think, stats, deadline, executor):
+    loop = asyncio.get_running_loop()
+    users = os.getenv("SAUCE_USERS", "standard_user").split(",")
+    username = users[index % len(users)]
+    await asyncio.sleep(args.ramp_up * index / max(1, args.users))
+    try:
+        client = await loop.run_in_executor(executor, make_client)
+    except Exception as exc:
+        stats.add("start", 0.0, f"{type(exc).__name__}: {exc}")
+        return
+    try:
+        done = 0
+        while time.monotonic() < deadline and (args.iterations is None or done < args.iterations):
+            for step in CHECKOUT_FLOW:
+                start = time.perf_counter()
+                try:
+                    await loop.run_in_executor(executor, client.run, step, username)
+                except Exception as exc:
+                    stats.add(step.name, 0.0, f"{type(exc).__name__}: {exc}")
+                    break
+                stats.add(step.name, time.perf_counter() - start)
+                await asyncio.sleep(think())
+            else:
+                stats.iterations += 1
+            await loop.run_in_executor(executor, client.end_iteration)
+            done += 1
+    finally:
+        await loop.run_in_executor(executor, client.close)
+
+
+async def run(args, stats):
+    from helpers.standin import saucedemo_url
+    base_url = saucedemo_url()
+    think = think_time(args.think)
+    executor = ThreadPoolExecutor(max_workers=args.users)
+    if args.client == "browser":
+        from helpers.driver_pool import DriverPool
+        pool = DriverPool(size=args.users)
+        make_client = lambda: BrowserClient(pool)  # noqa: E731
+    else:
+        pool = None
+        make_client = lambda: HttpClient(base_url)  # noqa: E731
+    deadline = time.monotonic() + args.ramp_up + args.duration
+    try:
+        await asyncio.gather(*(
+            virtual_user(i, args, make_client, think, stats, deadline, executor) for i in range(args.users)
+        ))
+    finally:
+        if pool is not None:
+            pool.close()
+        executor.shutdown()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-u", "--users", type=int, default=10)
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="seconds over which users start")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to keep running after ramp-up")
+    parser.add_argument("--iterations", type=int, default=None, help="flow iterations per user (overrides --duration)")
+    parser.add_argument("--think", default="exp:1", help="think time: const:S, uniform:A-B, exp:MEAN, normal:MEAN,SD")
+    parser.add_argument("--client", choices=("http", "browser"), default="http")
+    parser.add_argument("--live", action="store_true", help="use SAUCEDEMO_URL or the public site instead of the stand-in")
+    parser.add_argument("--json", metavar="PATH", help="also write the report as JSON")
+    args = parser.parse_args(argv)
+    if args.iterations is not None:
+        args.duration = float("inf")
+
+    if not args.live:
+        os.environ["STANDIN"] = "1"
+    if args.client == "browser":
+        os.environ.setdefault("FAST_PROFILE", "1")
+
+    stats = Stats()
+    started = time.monotonic()
+    try:
+        asyncio.run(run(args, stats))
+    finally:
+        # whatever ran, including a run cut short by Ctrl-C or a crash
+        _print_report(args, stats, time.monotonic() - started)
+    return 1 if stats.errors else 0
+
+
+def _print_report(args, stats, elapsed):
+    report = stats.report(elapsed, CHECKOUT_FLOW)
+    print(f"{args.users} users, {report['iterations']} flows in {elapsed:.1f}s "
+          f"({report['iterations_per_s']:.2f} flows/s)")
+    print(f"{'step':14} {'count':>6} {'errors':>6} {'steps/s':>7} {'p50':>8} {'p90':>8} {'p95':>8} {'p99':>8}")
+    for name, row in report["steps"].items():
+        cells = " ".join(f"{row[p] * 1000:6.0f}ms" if row[p] is not None else f"{'-':>8}" for p in ("p50", "p90", "p95", "p99"))
+        print(f"{name:14} {row['count']:6} {row['errors']:6} {row['throughput']:7.2f} {cells}")
+    for step, errors in stats.errors.items():
+        print(f"{step}: {len(errors)} error(s), first: {errors[0]}")
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(report, fh, indent=2)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""Per-test browser resource sampling and leak detection.
+
+    pytest --monitor --monitor-log resources.jsonl
+
+Around every test that has a driver fixture, the monitor collects garbage in
+the page and samples DevTools ``Performance.getMetrics``: JS heap, DOM nodes,
+documents and event listeners. With psutil installed it also samples RSS and
+CPU time of the chromedriver process tree, which includes Chrome. Each
+record holds the values after the test and the change during it.
+
+A browser whose post-GC heap or node count grew across the last
+MONITOR_WINDOW tests is reported as leaking, with those tests named. A
+browser that crosses MONITOR_MAX_HEAP_MB, MONITOR_MAX_NODES or
+MONITOR_MAX_RSS_MB is marked for recycling in the pool that leased it, so
+the pool quits it instead of reusing it when its lease ends. While the
+monitor is on, the driver fixtures lease per test (helpers.fixtures), so
+that happens before the next test even for the session-scoped ``browser``.
+Tab sessions and drivers that no pool leased are reported, not recycled.
+"""
+import heapq
+import itertools
+import json
+import os
+import time
+from collections import deque
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from helpers.driver_pool import fixture_drivers, owning_pool
+
+
+WINDOW = int(os.getenv("MONITOR_WINDOW", "5"))
+TOP = 5  # tests listed by heap growth in the terminal summary
+MAX_HEAP = float(os.getenv("MONITOR_MAX_HEAP_MB", "512")) * 2 ** 20
+MAX_NODES = int(os.getenv("MONITOR_MAX_NODES", "50000"))
+MAX_RSS = float(os.getenv("MONITOR_MAX_RSS_MB", "2048")) * 2 ** 20
+METRICS = {"JSHeapUsedSize": "heap", "JSHeapTotalSize": "heap_total", "Nodes": "nodes",
+           "Documents": "documents", "JSEventListeners": "listeners"}
+
+
+def process_stats(driver):
+    """RSS and CPU seconds of chromedriver and its descendants, or {} without psutil."""
+    try:
+        import psutil
+    except ImportError:
+        return {}
+    process = getattr(getattr(driver, "service", None), "process", None)
+    if process is None:
+        return {}
+    try:
+        root = psutil.Process(process.pid)
+        tree = [root] + root.children(recursive=True)
+    except psutil.Error:
+        return {}
+    rss = cpu = 0.0
+    for proc in tree:
+        try:
+            rss += proc.memory_info().rss
+            times = proc.cpu_times()
+            cpu += times.user + times.system
+        except psutil.Error:
+            pass
+    return {"rss": rss, "cpu": cpu, "processes": len(tree)}
+
+
+def sample(driver):
+    """Post-GC page metrics plus process stats for ``driver``."""
+    try:
+        if not getattr(driver, "_performance_enabled", False):
+            driver.execute_cdp_cmd("Performance.enable", {})
+            driver._performance_enabled = True
+        driver.execute_cdp_cmd("HeapProfiler.collectGarbage", {})
+        metrics = driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+    except (AttributeError, WebDriverException):
+        return None
+    values = {METRICS[m["name"]]: m["value"] for m in metrics if m["name"] in METRICS}
+    values.update(process_stats(driver))
+    return values
+
+
+class Monitor:
+    def __init__(self, log_path=None):
+        self.log = open(log_path, "a", encoding="utf-8") if log_path else None
+        self.history = {}  # id(driver) -> deque of the last WINDOW + 1 (nodeid, sample after test)
+        self.leaks = {}    # nodeid -> description
+        self.recycled = []  # (nodeid, limits crossed, why it was not recycled or None)
+        self.top = []      # min-heap of (heap growth, seq, record), the TOP largest; the rest go to the log
+        self.count = 0
+        self._seq = itertools.count()
+
+    def record(self, nodeid, driver, before, after):
+        delta = {k: after[k] - before[k] for k in after if k in before}
+        if "cpu" in delta:
+            delta["cpu"] = round(delta["cpu"], 3)
+        record = {"test": nodeid, "time": time.time(), "after": after, "delta": delta}
+        self.count += 1
+        entry = (delta.get("heap", 0), next(self._seq), record)
+        if len(self.top) < TOP:
+            heapq.heappush(self.top, entry)
+        elif entry[0] > self.top[0][0]:
+            heapq.heapreplace(self.top, entry)
+        if self.log is not None:
+            self.log.write(json.dumps(record) + "\n")
+            self.log.flush()
+        history = self.history.setdefault(id(driver), deque(maxlen=WINDOW + 1))
+        history.append((nodeid, after))
+        self._check_growth(list(history))
+        self._check_limits(nodeid, driver, after)
+
+    def _check_growth(self, window):
+        if len(window) <= WINDOW:
+            return
+        for key in ("heap", "nodes"):
+            values = [s.get(key, 0) for _, s in window]
+            if all(b > a for a, b in zip(values, values[1:])):
+                growth = values[-1] - values[0]
+                for nodeid, _ in window[1:]:
+                    self.leaks.setdefault(nodeid, f"{key} grew monotonically by {growth:,.0f} over {WINDOW} tests")
+
+    def _check_limits(self, nodeid, driver, after):
+        over = [name for name, value, limit in (
+            ("heap", after.get("heap", 0), MAX_HEAP),
+            ("nodes", after.get("nodes", 0), MAX_NODES),
+            ("rss", after.get("rss", 0), MAX_RSS),
+        ) if value > limit]
+        if not over:
+            return
+        if getattr(driver, "tab_session", None) is not None:
+            self.recycled.append((nodeid, over, "tab session; its context is disposed with the session"))
+            return
+        pool = owning_pool(driver)
+        if pool is None:
+            self.recycled.append((nodeid, over, "not leased from a driver pool"))
+            return
+        if not pool.marked_for_recycle(driver):
+            pool.mark_for_recycle(driver)
+            self.history.pop(id(driver), None)
+            self.recycled.append((nodeid, over, None))
+
+    def close(self):
+        if self.log is not None:
+            self.log.close()
+
+
+def pytest_addoption(parser):
+    parser.addoption("--monitor", action="store_true", help="sample browser memory/DOM/CPU around each test")
+    parser.addoption("--monitor-log", default=None, metavar="PATH", help="append per-test samples as JSONL to PATH")
+
+
+def pytest_configure(config):
+    if config.getoption("--monitor") or config.getoption("--monitor-log"):
+        config._resource_monitor = Monitor(config.getoption("--monitor-log"))
+
+
+def pytest_unconfigure(config):
+    monitor = getattr(config, "_resource_monitor", None)
+    if monitor is not None:
+        monitor.close()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    monitor = getattr(item.config, "_resource_monitor", None)
+    drivers = {id(d): d for d in fixture_drivers(item)}.values() if monitor is not None else ()
+    before = [(d, sample(d)) for d in drivers]
+    yield
+    for driver, start in before:
+        after = sample(driver) if start is not None else None
+        if after is not None:
+            monitor.record(item.nodeid, driver, start, after)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    monitor = getattr(config, "_resource_monitor", None)
+    if monitor is None or not monitor.count:
+        return
+    terminalreporter.write_sep("-", "browser resources")
+    for _, _, record in sorted(monitor.top, reverse=True):
+        delta = record["delta"]
+        cpu = f" {delta['cpu']:6.2f}s cpu" if "cpu" in delta else ""
+        terminalreporter.write_line(
+            f"{delta.get('heap', 0) / 2 ** 20:+8.2f} MB heap {delta.get('nodes', 0):+7.0f} nodes{cpu}  {record['test']}"
+        )
+    for nodeid, description in monitor.leaks.items():
+        terminalreporter.write_line(f"possible leak: {nodeid}: {description}", yellow=True)
+    for nodeid, over, skipped in monitor.recycled:
+        if skipped:
+            terminalreporter.write_line(f"browser over limit after {nodeid} ({', '.join(over)}), "
+                                        f"not recycled: {skipped}", yellow=True)
+        else:
+            terminalreporter.write_line(f"browser marked for recycling after {nodeid} ({', '.join(over)} over limit)",
+                                        red=True)
@@ -0,0 +1,223 @@
+"""Record network traffic per test and replay it deterministically.
+
+    pytest --network=record          # save every response to network/<test>.har.json
+    pytest --network=replay          # serve recorded responses, pass the rest through
+    pytest --network=replay-strict   # serve recorded responses, block and fail on the rest
+
+Requests are intercepted with the DevTools Fetch domain over
+``driver.bidi_connection()``, which runs on trio in a background thread for
+the duration of the test. Archives follow the HAR layout (log.entries with
+request/response/content) so they open in the usual HAR viewers. Responses
+are matched on method, URL (without fragment) and request body. Repeated
+requests are served in recorded order, and the last response is repeated
+when they run out.
+"""
+import base64
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import urldefrag
+
+import pytest
+
+from helpers.artifacts import slug
+from helpers.driver_pool import fixture_drivers
+
+
+NETWORK_DIR = Path(os.getenv("NETWORK_DIR", "network"))
+MODES = ("off", "record", "replay", "replay-strict")
+# the recorded body is already decoded, so these would no longer be true
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+STARTUP_TIMEOUT = float(os.getenv("NETWORK_STARTUP_TIMEOUT", "30"))
+
+
+def mode():
+    return os.getenv("NETWORK_MODE", "off")
+
+
+def archive_path(nodeid):
+    return NETWORK_DIR / (slug(nodeid) + ".har.json")
+
+
+def _key(method, url, post_data):
+    return method, urldefrag(url)[0], post_data or ""
+
+
+class Interceptor:
+    """Fetch-domain interception of one driver's current tab."""
+
+    def __init__(self, driver, mode, entries=()):
+        self.driver = driver
+        self.mode = mode
+        self.entries = []
+        self.unmatched = []
+        self._replay = {}
+        for entry in entries:
+            request = entry["request"]
+            key = _key(request["method"], request["url"], request.get("postData", {}).get("text"))
+            self._replay.setdefault(key, []).append(entry["response"])
+        self._served = {}
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._abandoned = False
+        self._error = None
+        self._scope = self._token = self._thread = None
+
+    def start(self):
+        import trio
+        self._thread = threading.Thread(target=trio.run, args=(self._main,), name=f"network-{self.mode}", daemon=True)
+        self._thread.start()
+        self._ready.wait(STARTUP_TIMEOUT)
+        with self._lock:
+            if not self._ready.is_set():
+                # without interception the test would hit real traffic; the
+                # thread gives up on its own if it comes up later
+                self._abandoned = True
+                raise TimeoutError(f"network {self.mode}: DevTools interception did not start "
+                                   f"within {STARTUP_TIMEOUT:g}s")
+        if self._error is not None:
+            raise self._error
+
+    def stop(self):
+        import trio
+        if self._token is not None:
+            trio.from_thread.run_sync(self._scope.cancel, trio_token=self._token)
+        self._thread.join(10)
+
+    async def _main(self):
+        import trio
+        try:
+            async with self.driver.bidi_connection() as connection:
+                session, devtools = connection.session, connection.devtools
+                stage = devtools.fetch.RequestStage.RESPONSE if self.mode == "record" else devtools.fetch.RequestStage.REQUEST
+                await session.execute(devtools.fetch.enable(
+                    patterns=[devtools.fetch.RequestPattern(url_pattern="*", request_stage=stage)]
+                ))
+                with trio.CancelScope() as self._scope:
+                    self._token = trio.lowlevel.current_trio_token()
+                    with self._lock:
+                        if self._abandoned:
+                            return  # start() timed out; leaving drops the Fetch interception
+                        self._ready.set()
+                    async with trio.open_nursery() as nursery:
+                        async for event in session.listen(devtools.fetch.RequestPaused):
+                            nursery.start_soon(self._handle, session, devtools, event)
+        except Exception as exc:
+            self._error = exc
+            self._ready.set()
+
+    async def _handle(self, session, devtools, event):
+        fetch = devtools.fetch
+        request = event.request
+        if self.mode == "record":
+            if event.response_status_code is not None and event.response_error_reason is None:
+                try:
+                    body, encoded = await session.execute(fetch.get_response_body(event.request_id))
+                except Exception:
+                    body, encoded = "", False  # redirects have no body
+                self.entries.append(_entry(request, event, body, encoded))
+            await session.execute(fetch.continue_request(event.request_id))
+            return
+        response = self._lookup(_key(request.method, request.url, request.post_data))
+        if response is None:
+            self.unmatched.append(f"{request.method} {request.url}")
+            if self.mode == "replay-strict":
+                await session.execute(fetch.fail_request(event.request_id, devtools.network.ErrorReason.BLOCKED_BY_CLIENT))
+            else:
+                await session.execute(fetch.continue_request(event.request_id))
+            return
+        content = response["content"]
+        body = content.get("text", "")
+        if content.get("encoding") != "base64":
+            body = base64.b64encode(body.encode("utf-8")).decode("ascii")
+        await session.execute(fetch.fulfill_request(
+            event.request_id,
+            response_code=response["status"],
+            response_headers=[fetch.HeaderEntry(name=h["name"], value=h["value"]) for h in response["headers"]],
+            body=body,
+        ))
+
+    def _lookup(self, key):
+        responses = self._replay.get(key)
+        if not responses:
+            return None
+        served = self._served.get(key, 0)
+        self._served[key] = served + 1
+        return responses[min(served, len(responses) - 1)]
+
+
+def _entry(request, event, body, encoded):
+    headers = [
+        {"name": h.name, "value": h.value}
+        for h in event.response_headers or [] if h.name.lower() not in DROPPED_HEADERS
+    ]
+    mime = next((h["value"] for h in headers if h["name"].lower() == "content-type"), "")
+    entry = {
+        "startedDateTime": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "request": {"method": request.method, "url": request.url},
+        "response": {
+            "status": event.response_status_code,
+            "statusText": event.response_status_text or "",
+            "headers": headers,
+            "content": {"mimeType": mime, "text": body, **({"encoding": "base64"} if encoded else {})},
+        },
+    }
+    if request.post_data is not None:
+        entry["request"]["postData"] = {"text": request.post_data}
+    return entry
+
+
+def load(path):
+    path = Path(path)
+    return json.loads(path.read_text())["log"]["entries"] if path.exists() else []
+
+
+def save(path, entries):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    har = {"log": {"version": "1.2", "creator": {"name": "helpers.network", "version": "1"}, "entries": entries}}
+    path.write_text(json.dumps(har, indent=1))
+
+
+@contextmanager
+def intercept(driver, mode, path):
+    """Record into or replay from the archive at ``path`` while the block runs."""
+    interceptor = Interceptor(driver, mode, load(path) if mode.startswith("replay") else ())
+    interceptor.start()
+    try:
+        yield interceptor
+    finally:
+        interceptor.stop()
+        if mode == "record":
+            save(path, interceptor.entries)
+
+
+def pytest_addoption(parser):
+    parser.addoption("--network", choices=MODES, default=None,
+                     help="record network traffic per test, or replay it (NETWORK_MODE)")
+
+
+def pytest_configure(config):
+    if config.getoption("--network"):
+        os.environ["NETWORK_MODE"] = config.getoption("--network")
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    current = mode()
+    driver = next(fixture_drivers(item), None) if current != "off" else None
+    if driver is None:
+        yield
+        return
+    with intercept(driver, current, archive_path(item.nodeid)) as interceptor:
+        outcome = yield
+    if interceptor.unmatched:
+        item.add_report_section("call", "network", "unmatched requests:\n" + "\n".join(interceptor.unmatched))
+        if current == "replay-strict" and outcome.excinfo is None:
+            outcome.force_exception(AssertionError(
+                f"{len(interceptor.unmatched)} request(s) not in {archive_path(item.nodeid)}, "
+                f"first: {interceptor.unmatched[0]}"
+            ))
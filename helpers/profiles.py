@@ -0,0 +1,107 @@
+import atexit
+import os
+import shutil
+import tempfile
+
+from selenium.webdriver.chrome.options import Options
+
+
+WINDOW_SIZE = os.getenv("FAST_PROFILE_WINDOW", "1366,768")
+
+# Network.setBlockedURLs patterns: payloads no test asserts on.
+BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.mp4", "*.webm", "*.mp3",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*doubleclick.net*", "*googlesyndication.com*", "*googletagservices.com*",
+    "*google-analytics.com*", "*googletagmanager.com*", "*adservice.google.*",
+    "*amazon-adsystem.com*", "*adsafeprotected.com*", "*moatads.com*",
+    "*pubmatic.com*", "*rubiconproject.com*", "*criteo.com*", "*taboola.com*",
+    "*facebook.net*", "*hotjar.com*", "*ezoic.net*", "*ezojs.com*",
+]
+
+_profile_dirs = []
+
+
+def fast_profile_enabled():
+    return os.getenv("FAST_PROFILE") == "1"
+
+
+def _user_data_dir():
+    """A throwaway profile dir, on tmpfs where the OS provides one."""
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else None
+    path = tempfile.mkdtemp(prefix="chrome-profile-", dir=base)
+    if not _profile_dirs:
+        atexit.register(_cleanup)
+    _profile_dirs.append(path)
+    return path
+
+
+def _cleanup():
+    for path in _profile_dirs:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def user_data_dir(options):
+    """The --user-data-dir that chrome_options() gave ``options``, or None."""
+    for arg in options.arguments:
+        if arg.startswith("--user-data-dir="):
+            return arg.split("=", 1)[1]
+    return None
+
+
+def remove_profile_on_quit(driver, path):
+    """Delete ``path`` when ``driver`` quits, so recycled browsers don't pile up in /dev/shm."""
+    quit_driver = driver.quit
+
+    def quit():
+        try:
+            quit_driver()
+        finally:
+            shutil.rmtree(path, ignore_errors=True)
+            if path in _profile_dirs:
+                _profile_dirs.remove(path)
+
+    driver.quit = quit
+
+
+def chrome_options(fast=None):
+    """Chrome options for the pool; the fast profile trims everything tests don't assert on."""
+    options = Options()
+    # lets helpers.artifacts read the console log after a failure
+    options.set_capability("goog:loggingPrefs", {"browser": "ALL"})
+    if fast is None:
+        fast = fast_profile_enabled()
+    if not fast:
+        return options
+    options.add_argument("--headless=new")
+    options.add_argument(f"--window-size={WINDOW_SIZE}")
+    options.add_argument(f"--user-data-dir={_user_data_dir()}")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-background-networking")
+    options.add_argument("--disable-component-update")
+    options.add_argument("--disable-default-apps")
+    options.add_argument("--disable-sync")
+    options.add_argument("--no-first-run")
+    options.add_argument("--mute-audio")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+    })
+    return options
+
+
+def block_resources(driver, patterns=BLOCKED_URLS):
+    """Drop matching requests in the browser before they hit the network."""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+
+
+def pytest_addoption(parser):
+    parser.addoption("--fast-profile", action="store_true",
+                     help="headless Chrome with a fixed viewport, no images/fonts/media/ads (FAST_PROFILE=1)")
+
+
+def pytest_configure(config):
+    if config.getoption("--fast-profile"):
+        os.environ["FAST_PROFILE"] = "1"
@@ -0,0 +1,533 @@
+"""Streaming test report: JSONL while tests run, paginated HTML built from it.
+
+    pytest --stream-report report-stream
+    python -m helpers.reporting report-stream              # render again by hand
+    python -m helpers.reporting report-stream --rebuild
+
+Every process that runs tests appends one JSON line per finished test to
+``<dir>/results-<worker>.jsonl``. That is each xdist worker, each shard, or
+the single pytest process. A line holds the outcome, duration, markers,
+worker, reruns, the failure text (capped at MESSAGE_LIMIT), and the paths of
+failure artifacts, which the HTML links to instead of embedding.
+
+``<dir>/html/`` is built incrementally. ``state.json`` records how far each
+JSONL file has been read, so a render reads only the lines appended since
+the previous one and rewrites only the pages and indexes they touch. Renders
+run under a file lock, so workers and shards take turns. Each writer renders
+at most every STREAM_REPORT_INTERVAL seconds while tests run, and once more
+when its session ends, which leaves little work for the end of the run.
+
+Results are stored as script files of PAGE_SIZE records, next to id lists
+per outcome, marker and duration bucket and a list of the slowest tests.
+index.html uses the pytest-html stylesheet from assets/style.css. It loads
+only the summary up front, then the pages and indexes it needs as they are
+shown, so it opens straight from disk.
+"""
+import argparse
+import heapq
+import html
+import json
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from helpers.artifacts import slug
+from helpers.driver_cache import FileLock
+
+
+PAGE_SIZE = int(os.getenv("STREAM_REPORT_PAGE_SIZE", "500"))
+INTERVAL = float(os.getenv("STREAM_REPORT_INTERVAL", "30"))
+MESSAGE_LIMIT = 4000
+SLOWEST = 200
+DURATION_BUCKETS = ((0.1, "<0.1s"), (1.0, "0.1-1s"), (5.0, "1-5s"), (30.0, "5-30s"), (float("inf"), ">=30s"))
+IGNORED_MARKERS = {"parametrize", "usefixtures", "filterwarnings"}
+PAGE_FIELDS = ("id", "outcome", "duration", "markers", "worker", "reruns", "message", "start")
+STYLESHEET = Path(__file__).resolve().parent.parent / "assets" / "style.css"
+
+
+def worker_name():
+    if os.getenv("PYTEST_XDIST_WORKER"):
+        return os.environ["PYTEST_XDIST_WORKER"]
+    if os.getenv("SHARD_INDEX"):
+        return f"shard{os.environ['SHARD_INDEX']}"
+    return "main"
+
+
+def reset(directory):
+    """Drop the results and HTML of a previous run in ``directory``."""
+    directory = Path(directory)
+    for path in directory.glob("results-*.jsonl"):
+        path.unlink()
+    shutil.rmtree(directory / "html", ignore_errors=True)
+
+
+def directory_from_args(args):
+    """The --stream-report directory in a pytest argument list (or STREAM_REPORT), else None."""
+    for i, arg in enumerate(args):
+        if arg == "--stream-report" and i + 1 < len(args):
+            return args[i + 1]
+        if arg.startswith("--stream-report="):
+            return arg.split("=", 1)[1]
+    return os.getenv("STREAM_REPORT")
+
+
+# ---- writer ----
+
+def _outcome(report, current):
+    if hasattr(report, "wasxfail"):
+        return "xfailed" if report.skipped else "xpassed"
+    if report.when == "call":
+        return report.outcome
+    if report.failed:
+        return "error" if current in (None, "passed") else current
+    if report.skipped:
+        return "skipped"
+    return current
+
+
+def _message(report):
+    if report.skipped and isinstance(report.longrepr, tuple):
+        return report.longrepr[2]
+    if hasattr(report, "wasxfail"):
+        return report.wasxfail or None
+    if not report.failed:
+        return None
+    text = report.longreprtext
+    if len(text) > MESSAGE_LIMIT:
+        text = text[:MESSAGE_LIMIT // 4] + "\n...\n" + text[-MESSAGE_LIMIT * 3 // 4:]
+    return text
+
+
+class StreamWriter:
+    """Collects the phases of each test and appends one line when its teardown is reported."""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / f"results-{worker_name()}.jsonl"
+        self.file = open(self.path, "a", encoding="utf-8")
+        self.pending = {}
+        self.last_render = time.monotonic()
+
+    def add(self, report):
+        record = self.pending.get(report.nodeid)
+        if record is None:
+            record = self.pending[report.nodeid] = {
+                "id": report.nodeid, "outcome": None, "duration": 0.0, "markers": [],
+                "worker": worker_name(), "start": getattr(report, "start", time.time()),
+                "reruns": 0, "message": None, "artifacts": {}, "_rerun": False,
+            }
+        record["duration"] += report.duration
+        record["markers"] = getattr(report, "stream_markers", record["markers"])
+        for kind, path in getattr(report, "artifacts", {}).items():
+            record["artifacts"][f"{report.when} {kind}"] = os.path.abspath(path)
+        if report.outcome == "rerun":
+            record["_rerun"] = True
+        else:
+            record["outcome"] = _outcome(report, record["outcome"])
+            record["message"] = _message(report) or record["message"]
+        if report.when != "teardown":
+            return
+        if record.pop("_rerun"):
+            # a retried attempt: the next attempt reports the same test again
+            record.update(reruns=record["reruns"] + 1, outcome=None, message=None, _rerun=False)
+            return
+        del self.pending[report.nodeid]
+        record["outcome"] = record["outcome"] or "passed"
+        record["duration"] = round(record["duration"], 4)
+        self.file.write(json.dumps(record) + "\n")
+        self.file.flush()
+        if INTERVAL and time.monotonic() - self.last_render > INTERVAL:
+            self.last_render = time.monotonic()
+            render(self.directory, blocking=False)
+
+    def close(self):
+        self.file.close()
+
+
+# ---- renderer ----
+
+INDEX_HTML = """<!DOCTYPE html>
+<html>
+  <head>
+    <meta charset="utf-8"/>
+    <title id="head-title">{title}</title>
+    <link href="assets/style.css" rel="stylesheet" type="text/css"/>
+    <style>
+      .pager {{ margin: 10px 0; }}
+      .pager button {{ margin-right: 5px; }}
+      .filters button.active {{ color: black; font-weight: bold; }}
+    </style>
+  </head>
+  <body>
+    <h1 id="title">{title}</h1>
+    <p id="generated"></p>
+    <div class="summary">
+      <div class="summary__data">
+        <h2>Summary</h2>
+        <p class="run-count"></p>
+        <div class="controls"><div class="filters"></div></div>
+      </div>
+    </div>
+    <div class="pager"></div>
+    <table id="results-table">
+      <thead id="results-table-head">
+        <tr><th>Result</th><th>Test</th><th>Duration</th><th>Worker</th><th>Links</th></tr>
+      </thead>
+    </table>
+    <div class="pager"></div>
+    <script src="report.js"></script>
+    <script>report.start();</script>
+  </body>
+</html>
+"""
+
+# report.summary/page/index are the callbacks the data/*.js files invoke.
+REPORT_JS = """
+var report = (function () {
+    var ROWS = 100;
+    var summary = null, pages = {}, indexes = {}, files = {}, waiting = {};
+    var view = {key: null, page: 0};
+
+    function load(file, key, done) {
+        if (waiting[key]) { waiting[key].push(done); return; }
+        waiting[key] = [done];
+        var script = document.createElement('script');
+        script.src = 'data/' + file + (summary ? '?v=' + summary.generated : '?v=' + Date.now());
+        script.onerror = function () { document.querySelector('.run-count').textContent = 'Could not load ' + file; };
+        document.head.appendChild(script);
+    }
+    function loaded(key) {
+        var callbacks = waiting[key] || [];
+        delete waiting[key];
+        callbacks.forEach(function (done) { done(); });
+    }
+    function pageFile(n) { return 'page-' + ('0000' + n).slice(-5) + '.js'; }
+    function withPage(n, done) {
+        if (pages[n]) { done(); } else { load(pageFile(n), 'page-' + n, done); }
+    }
+    function withIds(key, done) {
+        if (key === null) { done(null); } else if (indexes[key]) { done(indexes[key]); }
+        else { load(files[key], key, function () { done(indexes[key]); }); }
+    }
+    function el(tag, className, text) {
+        var node = document.createElement(tag);
+        if (className) node.className = className;
+        if (text !== undefined && text !== null) node.textContent = text;
+        return node;
+    }
+
+    function filters() {
+        var box = document.querySelector('.filters');
+        box.innerHTML = '';
+        function button(label, key, className) {
+            var b = el('button', key === view.key ? 'active' : '');
+            b.appendChild(el('span', className, label));
+            b.onclick = function () { view = {key: key, page: 0}; filters(); show(); };
+            box.appendChild(b);
+        }
+        button('All (' + summary.count + ')', null);
+        ['outcome', 'duration', 'marker'].forEach(function (kind) {
+            (summary.indexes[kind] || []).forEach(function (entry) {
+                var key = kind + ':' + entry[0];
+                files[key] = entry[2];
+                button(entry[0] + ' (' + entry[1] + ')', key, kind === 'outcome' ? entry[0] : '');
+            });
+        });
+        files.slowest = summary.slowest;
+        button('slowest ' + summary.slowest_count, 'slowest');
+    }
+
+    function show() {
+        withIds(view.key, function (ids) {
+            var total = ids ? ids.length : summary.count;
+            var first = view.page * ROWS, wanted = [], needed = {};
+            for (var i = first; i < Math.min(first + ROWS, total); i++) {
+                var n = ids ? ids[i] : i;
+                wanted.push(n);
+                needed[Math.floor(n / summary.page_size)] = true;
+            }
+            var missing = Object.keys(needed), left = missing.length;
+            if (!left) { draw(wanted, total); return; }
+            missing.forEach(function (p) { withPage(p, function () { if (--left === 0) draw(wanted, total); }); });
+        });
+    }
+
+    function row(record) {
+        var body = el('tbody', 'results-table-row');
+        var main = el('tr', 'collapsible ' + record.outcome);
+        main.appendChild(el('td', 'col-result collapsed',
+            record.outcome.charAt(0).toUpperCase() + record.outcome.slice(1) + (record.reruns ? ' (' + record.reruns + ' reruns)' : '')));
+        main.appendChild(el('td', 'col-name', record.id));
+        main.appendChild(el('td', 'col-duration', record.duration.toFixed(2) + 's'));
+        main.appendChild(el('td', 'col-worker', record.worker));
+        var links = el('td', 'col-links');
+        Object.keys(record.links || {}).forEach(function (kind) {
+            var a = el('a', 'col-links__extra', kind);
+            a.href = record.links[kind];
+            links.appendChild(a);
+        });
+        main.appendChild(links);
+        body.appendChild(main);
+        if (record.message || record.markers.length) {
+            var extra = el('tr', 'extras-row hidden'), cell = el('td', 'extra');
+            cell.colSpan = 5;
+            var wrapper = el('div', 'logwrapper');
+            wrapper.appendChild(el('div', 'log', (record.markers.length ? 'markers: ' + record.markers.join(', ') + '\\n\\n' : '') + (record.message || '')));
+            cell.appendChild(wrapper);
+            extra.appendChild(cell);
+            body.appendChild(extra);
+            main.onclick = function (event) {
+                if (event.target.tagName === 'A') return;
+                extra.classList.toggle('hidden');
+                main.firstChild.classList.toggle('collapsed');
+            };
+        }
+        return body;
+    }
+
+    function draw(wanted, total) {
+        var table = document.getElementById('results-table');
+        Array.prototype.slice.call(table.tBodies).forEach(function (b) { table.removeChild(b); });
+        wanted.forEach(function (n) {
+            var p = Math.floor(n / summary.page_size);
+            table.appendChild(row(pages[p][n - p * summary.page_size]));
+        });
+        var last = Math.max(0, Math.ceil(total / ROWS) - 1);
+        Array.prototype.forEach.call(document.querySelectorAll('.pager'), function (pager) {
+            pager.innerHTML = '';
+            var prev = el('button', '', '< prev'), next = el('button', '', 'next >');
+            prev.disabled = view.page === 0;
+            next.disabled = view.page >= last;
+            prev.onclick = function () { view.page--; show(); };
+            next.onclick = function () { view.page++; show(); };
+            pager.appendChild(prev);
+            pager.appendChild(next);
+            pager.appendChild(el('span', '', total ? 'rows ' + (view.page * ROWS + 1) + '-' +
+                Math.min(total, (view.page + 1) * ROWS) + ' of ' + total : 'no results'));
+        });
+    }
+
+    return {
+        start: function () { load('summary.js', 'summary', function () {}); },
+        summary: function (data) {
+            summary = data;
+            loaded('summary');
+            document.getElementById('generated').textContent = 'Report generated on ' +
+                new Date(data.generated * 1000).toLocaleString() + ' from ' + data.workers.join(', ') + '.';
+            document.querySelector('.run-count').textContent =
+                data.count + ' tests took ' + data.duration.toFixed(1) + ' s of test time.';
+            filters();
+            show();
+        },
+        page: function (n, records) { pages[n] = records; loaded('page-' + n); },
+        index: function (key, ids) { indexes[key] = ids; loaded(key); }
+    };
+})();
+"""
+
+
+def _empty_state():
+    return {"offsets": {}, "count": 0, "duration": 0.0, "workers": [],
+            "indexes": {"outcome": {}, "duration": {}, "marker": {}}, "slowest": []}
+
+
+def _page_path(data, n):
+    return data / f"page-{n:05d}.js"
+
+
+def _write_js(path, call, *args):
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(f"report.{call}({', '.join(json.dumps(a, separators=(',', ':')) for a in args)});\n",
+                   encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _read_page(path):
+    text = path.read_text(encoding="utf-8")
+    return json.loads(text[text.index(",") + 1:text.rindex(")")])
+
+
+def _bucket(duration):
+    return next(label for limit, label in DURATION_BUCKETS if duration < limit)
+
+
+def _index_file(kind, name):
+    return f"index-{kind}-{slug(name)}.js"
+
+
+def render(directory, rebuild=False, blocking=True):
+    """Bring ``<directory>/html`` up to date with the JSONL files; returns the record count.
+
+    With ``blocking=False`` a render already running elsewhere makes this a no-op (None).
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    try:
+        with FileLock(directory / ".render.lock", blocking=blocking):
+            return _render(directory, rebuild)
+    except BlockingIOError:
+        return None
+
+
+def _render(directory, rebuild):
+    out = directory / "html"
+    data = out / "data"
+    sources = sorted(directory.glob("results-*.jsonl"))
+    state = None
+    if not rebuild:
+        try:
+            state = json.loads((out / "state.json").read_text())
+        except (OSError, ValueError):
+            pass
+    # a results file that shrank or vanished belongs to another run
+    if state is None or any(
+        not (directory / name).exists() or (directory / name).stat().st_size < offset
+        for name, offset in state["offsets"].items()
+    ):
+        shutil.rmtree(out, ignore_errors=True)
+        state = _empty_state()
+    data.mkdir(parents=True, exist_ok=True)
+
+    page = _read_page(_page_path(data, state["count"] // PAGE_SIZE)) if state["count"] % PAGE_SIZE else []
+    dirty = set()
+    added = 0
+    for path in sources:
+        offset = state["offsets"].get(path.name, 0)
+        with open(path, "rb") as fh:
+            fh.seek(offset)
+            for line in fh:
+                if not line.endswith(b"\n"):
+                    break  # still being written
+                offset += len(line)
+                record = json.loads(line)
+                n = state["count"]
+                state["count"] += 1
+                added += 1
+                state["duration"] += record["duration"]
+                if record["worker"] not in state["workers"]:
+                    state["workers"].append(record["worker"])
+                keys = [("outcome", record["outcome"]), ("duration", _bucket(record["duration"]))]
+                keys += [("marker", name) for name in record["markers"]]
+                for kind, name in keys:
+                    state["indexes"][kind].setdefault(name, []).append(n)
+                    dirty.add((kind, name))
+                entry = [record["duration"], n]
+                if len(state["slowest"]) < SLOWEST:
+                    heapq.heappush(state["slowest"], entry)
+                elif entry > state["slowest"][0]:
+                    heapq.heapreplace(state["slowest"], entry)
+                links = {kind: Path(os.path.relpath(p, out)).as_posix() for kind, p in record["artifacts"].items()}
+                item = {key: record[key] for key in PAGE_FIELDS}
+                item["links"] = links
+                page.append(item)
+                if len(page) == PAGE_SIZE:
+                    _write_js(_page_path(data, n // PAGE_SIZE), "page", n // PAGE_SIZE, page)
+                    page = []
+        state["offsets"][path.name] = offset
+    if page and added:
+        _write_js(_page_path(data, state["count"] // PAGE_SIZE), "page", state["count"] // PAGE_SIZE, page)
+
+    for kind, name in dirty:
+        _write_js(data / _index_file(kind, name), "index", f"{kind}:{name}", state["indexes"][kind][name])
+    slowest = [n for _, n in sorted(state["slowest"], reverse=True)]
+    _write_js(data / "index-slowest.js", "index", "slowest", slowest)
+    bucket_order = [label for _, label in DURATION_BUCKETS]
+    order = {
+        "outcome": lambda name: (-len(state["indexes"]["outcome"][name]), name),
+        "duration": bucket_order.index,
+        "marker": lambda name: name,
+    }
+    _write_js(data / "summary.js", "summary", {
+        "count": state["count"],
+        "duration": state["duration"],
+        "page_size": PAGE_SIZE,
+        "generated": int(time.time()),
+        "workers": state["workers"],
+        "indexes": {kind: [[name, len(ids), _index_file(kind, name)]
+                           for name, ids in sorted(names.items(), key=lambda item: order[kind](item[0]))]
+                    for kind, names in state["indexes"].items()},
+        "slowest": "index-slowest.js",
+        "slowest_count": len(slowest),
+    })
+
+    if not (out / "index.html").exists():
+        (out / "index.html").write_text(INDEX_HTML.format(title=html.escape(f"Test report: {directory.name}")),
+                                        encoding="utf-8")
+        (out / "report.js").write_text(REPORT_JS, encoding="utf-8")
+        if STYLESHEET.exists():
+            (out / "assets").mkdir(exist_ok=True)
+            shutil.copyfile(STYLESHEET, out / "assets" / "style.css")
+    tmp = out / "state.json.tmp"
+    tmp.write_text(json.dumps(state, separators=(",", ":")))
+    os.replace(tmp, out / "state.json")
+    return state["count"]
+
+
+# ---- pytest plugin ----
+
+_writer = None
+
+
+def pytest_addoption(parser):
+    parser.addoption("--stream-report", default=os.getenv("STREAM_REPORT"), metavar="DIR",
+                     help="stream results to DIR/results-*.jsonl and render a paginated HTML report in DIR/html")
+
+
+def pytest_configure(config):
+    global _writer
+    directory = config.getoption("--stream-report")
+    if not directory:
+        return
+    if not hasattr(config, "workerinput") and not os.getenv("SHARD_INDEX"):
+        reset(directory)  # top-level process: a new run starts a new report
+    _writer = StreamWriter(directory)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    if _writer is not None:
+        outcome.get_result().stream_markers = sorted({m.name for m in item.iter_markers()} - IGNORED_MARKERS)
+
+
+def pytest_runtest_logreport(report):
+    # under xdist the controller sees each worker's reports too (with .node set); the worker wrote them
+    if _writer is not None and not hasattr(report, "node"):
+        _writer.add(report)
+
+
+def pytest_sessionfinish(session):
+    if _writer is None:
+        return
+    _writer.close()
+    if not hasattr(session.config, "workerinput"):
+        start = time.perf_counter()
+        session.config._stream_report = (render(_writer.directory), time.perf_counter() - start)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    rendered = getattr(config, "_stream_report", None)
+    if rendered is not None and _writer is not None:
+        count, seconds = rendered
+        terminalreporter.write_line(f"stream report: {_writer.directory / 'html' / 'index.html'} "
+                                    f"({count} tests, final render {seconds:.2f}s)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a --stream-report directory as paginated HTML.")
+    parser.add_argument("directory")
+    parser.add_argument("--rebuild", action="store_true", help="ignore the saved state and render from scratch")
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    count = render(args.directory, rebuild=args.rebuild)
+    print(f"{count} tests -> {Path(args.directory) / 'html' / 'index.html'} in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""Classified, adaptive retries for ``@pytest.mark.retry(max=2)`` tests.
+
+A failure is classified as stale element, timeout, network or assertion (or
+other error). Only the first three are retried. Assertion failures and
+unknown errors fail right away.
+
+Before a retry, only the broken state is repaired. A stale element needs
+nothing beyond re-running the test. A timeout stops pending loads. A network
+error resets the driver's cookies, storage and windows. The browser itself is
+kept. The wait before a retry starts from the median delay that let this test
+recover before (or a per-class default) and doubles per attempt. A class that
+almost never recovers for a test stops being retried.
+
+Per-test run, failure and flake counts are kept in .flake_history.json.
+"""
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+
+import pytest
+from _pytest.runner import runtestprotocol
+from selenium.common.exceptions import (
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+
+from helpers.driver_cache import FileLock
+from helpers.driver_pool import fixture_drivers, get_pool
+
+
+HISTORY = Path(os.getenv("FLAKE_HISTORY", ".flake_history.json"))
+TRANSIENT = ("stale", "timeout", "network")
+DEFAULT_DELAY = {"stale": 0.0, "timeout": 0.5, "network": 1.0}
+MAX_DELAY = 30.0
+NETWORK_MARKERS = ("net::ERR_", "ERR_CONNECTION", "ERR_NAME_NOT_RESOLVED", "disconnected", "Connection refused")
+
+
+def classify(exc):
+    if isinstance(exc, StaleElementReferenceException):
+        return "stale"
+    if isinstance(exc, (TimeoutException, TimeoutError)):
+        return "timeout"
+    if isinstance(exc, ConnectionError) or (
+        isinstance(exc, WebDriverException) and any(m in str(exc) for m in NETWORK_MARKERS)
+    ):
+        return "network"
+    if isinstance(exc, AssertionError):
+        return "assertion"
+    return "error"
+
+
+def recover(item, failure):
+    """Repair just the state that ``failure`` breaks, keeping the browser."""
+    for driver in fixture_drivers(item):
+        try:
+            if failure == "timeout":
+                driver.execute_script("window.stop();")
+            elif failure == "network":
+                get_pool().reset(driver)
+        except WebDriverException:
+            pass
+
+
+class FlakeHistory:
+    def __init__(self, path=HISTORY):
+        self.path = path
+        self.tests = json.loads(path.read_text()) if path.exists() else {}
+        self.session = {}
+
+    def _entry(self, nodeid):
+        return self.tests.setdefault(nodeid, {"runs": 0, "failures": 0, "flaky": 0, "classes": {}})
+
+    def _class(self, nodeid, failure):
+        return self._entry(nodeid)["classes"].setdefault(failure, {"retries": 0, "recovered": 0, "delays": []})
+
+    def worth_retrying(self, nodeid, failure):
+        stats = self._class(nodeid, failure)
+        return stats["retries"] < 5 or stats["recovered"] / stats["retries"] >= 0.1
+
+    def delay(self, nodeid, failure, attempt):
+        delays = self._class(nodeid, failure)["delays"]
+        base = statistics.median(delays) if delays else DEFAULT_DELAY[failure]
+        return min(MAX_DELAY, base * 2 ** attempt)
+
+    def record(self, nodeid, retries, passed):
+        """``retries``: list of (failure class, delay) that preceded the final attempt."""
+        entry = self._entry(nodeid)
+        entry["runs"] += 1
+        if not passed:
+            entry["failures"] += 1
+        elif retries:
+            entry["flaky"] += 1
+        for i, (failure, delay) in enumerate(retries):
+            stats = self._class(nodeid, failure)
+            stats["retries"] += 1
+            if passed and i == len(retries) - 1:
+                stats["recovered"] += 1
+                stats["delays"] = (stats["delays"] + [delay])[-20:]
+        self.session[nodeid] = entry
+
+    def save(self):
+        if not self.session:
+            return
+        with FileLock(self.path.with_suffix(".lock")):
+            on_disk = json.loads(self.path.read_text()) if self.path.exists() else {}
+            on_disk.update(self.session)
+            self.path.write_text(json.dumps(on_disk, indent=1, sort_keys=True))
+
+
+def pytest_addoption(parser):
+    parser.addoption("--no-retries", action="store_true", help="ignore pytest.mark.retry")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "retry(max=2): retry transient (stale/timeout/network) failures")
+    config._flake_history = FlakeHistory()
+
+
+def pytest_sessionfinish(session):
+    session.config._flake_history.save()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    yield
+    if call.excinfo is None or call.when == "teardown" or not item.get_closest_marker("retry"):
+        return
+    item._failure_class = classify(call.excinfo.value)
+    if item._failure_class in TRANSIENT:
+        recover(item, item._failure_class)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_protocol(item, nextitem):
+    marker = item.get_closest_marker("retry")
+    if marker is None or item.config.getoption("--no-retries"):
+        return None
+    history = item.config._flake_history
+    limit = marker.kwargs.get("max", 2)
+    retries = []
+    item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+    while True:
+        item._failure_class = None
+        reports = runtestprotocol(item, nextitem=nextitem, log=False)
+        failed = any(r.failed for r in reports)
+        failure = item._failure_class
+        if (failed and failure in TRANSIENT and len(retries) < limit
+                and history.worth_retrying(item.nodeid, failure)):
+            for report in reports:
+                if report.failed:
+                    report.outcome = "rerun"
+                item.ihook.pytest_runtest_logreport(report=report)
+            delay = history.delay(item.nodeid, failure, len(retries))
+            retries.append((failure, delay))
+            time.sleep(delay)
+            continue
+        for report in reports:
+            item.ihook.pytest_runtest_logreport(report=report)
+        history.record(item.nodeid, retries, passed=not failed)
+        break
+    item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+    return True
+
+
+def pytest_report_teststatus(report):
+    if report.outcome == "rerun":
+        return "rerun", "R", ("RERUN", {"yellow": True})
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    flaky = {k: v for k, v in config._flake_history.session.items() if v["flaky"]}
+    if not flaky:
+        return
+    terminalreporter.write_sep("-", "flaky tests (passed after retry)")
+    for nodeid, entry in sorted(flaky.items()):
+        terminalreporter.write_line(f"{entry['flaky'] / entry['runs']:6.1%} flake rate over {entry['runs']} runs  {nodeid}")
@@ -0,0 +1,126 @@
+import json
+import threading
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+
+
+class SessionStore:
+    """Captured login sessions, keyed by (base_url, username)."""
+
+    def __init__(self):
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            return self._states.get(key)
+
+    def put(self, key, state):
+        with self._lock:
+            self._states[key] = state
+
+    def drop(self, key):
+        with self._lock:
+            self._states.pop(key, None)
+
+
+store = SessionStore()
+
+
+def capture(driver):
+    """Snapshot URL, cookies, localStorage and sessionStorage of the current page."""
+    url, local, session = driver.execute_script(
+        "return [location.href, Object.assign({}, localStorage), Object.assign({}, sessionStorage)];"
+    )
+    return {
+        "url": url,
+        "origin": _origin(url),
+        "cookies": driver.get_cookies(),
+        "local_storage": local,
+        "session_storage": session,
+    }
+
+
+def _origin(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+STORAGE_JS = """
+if (location.origin === %s) {
+    [[localStorage, %s], [sessionStorage, %s]].forEach(function (pair) {
+        pair[0].clear();
+        for (var k in pair[1]) pair[0].setItem(k, pair[1][k]);
+    });
+}
+"""
+
+
+def _cdp_cookie(cookie, origin):
+    param = {
+        "name": cookie["name"],
+        "value": cookie["value"],
+        "path": cookie.get("path", "/"),
+        "secure": cookie.get("secure", False),
+        "httpOnly": cookie.get("httpOnly", False),
+    }
+    if cookie.get("domain"):
+        param["domain"] = cookie["domain"]
+    else:
+        param["url"] = origin
+    if "expiry" in cookie:
+        param["expires"] = cookie["expiry"]
+    if cookie.get("sameSite"):
+        param["sameSite"] = cookie["sameSite"]
+    return param
+
+
+def inject(driver, state, landing_url):
+    """Restore ``state`` and open ``landing_url`` in a single page load.
+
+    On Chrome the cookies go in through DevTools and storage is seeded by
+    a script that runs before the page's own scripts, so there is no need to
+    load the origin first. Other browsers take the slower WebDriver route.
+    """
+    origin = state["origin"]
+    source = STORAGE_JS % (
+        json.dumps(origin), json.dumps(state["local_storage"]), json.dumps(state.get("session_storage", {}))
+    )
+    try:
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        driver.execute_cdp_cmd(
+            "Network.setCookies",
+            {"cookies": [_cdp_cookie(c, origin) for c in state["cookies"]]},
+        )
+        script = driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source})
+    except (AttributeError, WebDriverException):
+        driver.get(origin)
+        driver.delete_all_cookies()
+        for cookie in state["cookies"]:
+            driver.add_cookie(cookie)
+        driver.execute_script(source)
+        driver.get(landing_url)
+        return
+    try:
+        driver.get(landing_url)
+    finally:
+        driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": script["identifier"]})
+
+
+def session_login(driver, key, landing_url, ui_login, validate):
+    """Log in by injecting a cached session, falling back to ``ui_login``.
+
+    ``ui_login()`` must leave the browser logged in on the app's origin;
+    ``validate(driver)`` says whether the injected session was accepted.
+    Returns True when the cached session was used.
+    """
+    state = store.get(key)
+    if state is not None:
+        inject(driver, state, landing_url)
+        if validate(driver):
+            return True
+        store.drop(key)
+    ui_login()
+    store.put(key, capture(driver))
+    return False
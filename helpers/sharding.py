@@ -0,0 +1,224 @@
+"""Run the suite in parallel shards balanced by historical test duration.
+
+    python -m helpers.sharding -n 16 -- "Final Assignment_POM_SauceDemo_pytest.py" --fast-profile
+
+The runner collects the tests once, groups tests that must stay together
+(pytest.mark.dependency edges, and modules that pin an order with
+pytest.mark.order), spreads the groups over N worker processes with the
+longest-first heuristic using .test_durations.json, runs one pytest per shard
+and merges their JUnit XML into a single report.
+
+Shards (and plain runs with --record-durations) fold their test durations
+into .test_durations.json as a moving average, weighting the new run by
+DURATION_SMOOTHING (default 0.3), so one slow run does not skew the next
+plan.
+
+Each worker has its own process, driver pool and browser, and its own
+SauceDemo user from SAUCE_USERS (see sauce_user()).
+"""
+import argparse
+import heapq
+import json
+import os
+import statistics
+import subprocess
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from helpers.driver_cache import FileLock
+
+
+DURATIONS = Path(os.getenv("TEST_DURATIONS", ".test_durations.json"))
+SHARD_DIR = Path(".shards")
+SMOOTHING = float(os.getenv("DURATION_SMOOTHING", "0.3"))
+
+
+def sauce_user():
+    """The SauceDemo user for this worker: SAUCE_USERS[SHARD_INDEX % len]."""
+    users = os.getenv("SAUCE_USERS", "standard_user").split(",")
+    return users[int(os.getenv("SHARD_INDEX", "0")) % len(users)]
+
+
+# ---- pytest plugin: record durations, write the shard plan ----
+
+def pytest_addoption(parser):
+    parser.addoption("--shard-plan", default=None, metavar="PATH",
+                     help="with --collect-only: write test ids and their shard groups to PATH")
+    parser.addoption("--record-durations", action="store_true",
+                     help=f"fold this run's test durations into {DURATIONS} (shards always do)")
+
+
+_durations = {}
+
+
+def pytest_runtest_logreport(report):
+    _durations[report.nodeid] = _durations.get(report.nodeid, 0.0) + report.duration
+
+
+def smooth(known, durations, weight=SMOOTHING):
+    """Moving average of each test's duration; a test seen for the first time takes its value."""
+    merged = dict(known)
+    for test, duration in durations.items():
+        old = merged.get(test)
+        merged[test] = round(duration if old is None else old + weight * (duration - old), 4)
+    return merged
+
+
+def pytest_sessionfinish(session):
+    if not _durations or not (os.getenv("SHARD_INDEX") or session.config.getoption("--record-durations")):
+        return
+    with FileLock(DURATIONS.with_suffix(".lock")):
+        known = json.loads(DURATIONS.read_text()) if DURATIONS.exists() else {}
+        DURATIONS.write_text(json.dumps(smooth(known, _durations), indent=1, sort_keys=True))
+
+
+def pytest_collection_modifyitems(session, config, items):
+    path = config.getoption("--shard-plan")
+    if path:
+        # the positional arguments as pytest parsed them, so the runner can
+        # tell test selectors from option values
+        Path(path).write_text(json.dumps({"groups": plan_groups(items), "selectors": config.option.file_or_dir}))
+
+
+def plan_groups(items):
+    """Map each test id to a group id; tests in one group run on one shard."""
+    parent = {item.nodeid: item.nodeid for item in items}
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(a, b):
+        parent[find(a)] = find(b)
+
+    by_module = {}
+    for item in items:
+        by_module.setdefault(item.nodeid.split("::", 1)[0], []).append(item)
+    for module_items in by_module.values():
+        # pytest-dependency names tests by name within a module; a base name
+        # also covers all of its parametrized cases.
+        named = {}
+        for item in module_items:
+            named.setdefault(item.name, []).append(item.nodeid)
+            if getattr(item, "originalname", item.name) != item.name:
+                named.setdefault(item.originalname, []).append(item.nodeid)
+        ordered = [item for item in module_items if item.get_closest_marker("order")]
+        for a, b in zip(ordered, ordered[1:]):
+            union(a.nodeid, b.nodeid)
+        for item in module_items:
+            marker = item.get_closest_marker("dependency")
+            for dep in marker.kwargs.get("depends", []) if marker else []:
+                for nodeid in named.get(dep, []):
+                    union(item.nodeid, nodeid)
+    return {item.nodeid: find(item.nodeid) for item in items}
+
+
+# ---- runner ----
+
+def balance(groups, durations, shards):
+    """Longest-processing-time-first assignment of groups to shards."""
+    known = [d for d in durations.values() if d > 0]
+    default = statistics.median(known) if known else 1.0
+    totals = {}
+    for test, group in groups.items():
+        totals.setdefault(group, []).append(test)
+    weighted = sorted(
+        ((sum(durations.get(t, default) for t in tests), group) for group, tests in totals.items()),
+        reverse=True,
+    )
+    heap = [(0.0, i) for i in range(shards)]
+    assigned = [set() for _ in range(shards)]
+    for weight, group in weighted:
+        load, i = heapq.heappop(heap)
+        assigned[i].update(totals[group])
+        heapq.heappush(heap, (load + weight, i))
+    order = list(groups)
+    return [[t for t in order if t in shard] for shard in assigned]
+
+
+def without_selectors(args, selectors):
+    """``args`` minus the test selectors pytest found among them.
+
+    A selector is removed only where pytest parsed one, counting from the end,
+    so an option value that happens to name an existing path is kept.
+    """
+    remaining = list(selectors)
+    kept = []
+    for arg in reversed(args):
+        if arg in remaining:
+            remaining.remove(arg)
+        else:
+            kept.append(arg)
+    return kept[::-1]
+
+
+def merge_junit(paths, target):
+    merged = ET.Element("testsuites")
+    for attr in ("tests", "failures", "errors", "skipped"):
+        merged.set(attr, "0")
+    total_time = 0.0
+    for path in paths:
+        if not path.exists():
+            continue
+        root = ET.parse(path).getroot()
+        for suite in ([root] if root.tag == "testsuite" else root.findall("testsuite")):
+            merged.append(suite)
+            for attr in ("tests", "failures", "errors", "skipped"):
+                merged.set(attr, str(int(merged.get(attr)) + int(suite.get(attr, 0))))
+            total_time = max(total_time, float(suite.get("time", 0)))
+    merged.set("time", f"{total_time:.3f}")
+    ET.ElementTree(merged).write(target, encoding="utf-8", xml_declaration=True)
+    return merged
+
+
+def main(argv=None):
+    from helpers import reporting
+
+    parser = argparse.ArgumentParser(description="Run pytest in N duration-balanced shards.")
+    parser.add_argument("-n", "--shards", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--junitxml", default="report-parallel.xml", help="merged report path")
+    parser.add_argument("pytest_args", nargs="*", help="arguments passed to every pytest run (put them after --)")
+    args = parser.parse_args(argv)
+
+    SHARD_DIR.mkdir(exist_ok=True)
+    plan_path = SHARD_DIR / "plan.json"
+    plan_path.unlink(missing_ok=True)
+    collected = subprocess.run(
+        [sys.executable, "-m", "pytest", "--collect-only", "-q", f"--shard-plan={plan_path}", *args.pytest_args],
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+    )
+    if collected.returncode or not plan_path.exists():
+        print(collected.stdout[-4000:], end="")
+        reason = "no tests collected" if collected.returncode == 5 else "collection failed"
+        print(f"{reason} (pytest exit {collected.returncode}); no shards started", file=sys.stderr)
+        return collected.returncode or 1
+    plan = json.loads(plan_path.read_text())
+    durations = json.loads(DURATIONS.read_text()) if DURATIONS.exists() else {}
+    shards = [s for s in balance(plan["groups"], durations, args.shards) if s]
+    # test selection now comes from the shard's args file; keep everything else
+    options = without_selectors(args.pytest_args, plan["selectors"])
+    report_dir = reporting.directory_from_args(options)
+    if report_dir:
+        reporting.reset(report_dir)  # shards append to it; the last one to finish renders the rest
+
+    procs = []
+    for i, tests in enumerate(shards):
+        args_file = SHARD_DIR / f"shard-{i}.args"
+        args_file.write_text("\n".join(tests) + "\n")
+        env = dict(os.environ, SHARD_INDEX=str(i), SHARD_COUNT=str(len(shards)), DRIVER_POOL_SIZE="1")
+        cmd = [sys.executable, "-m", "pytest", "-q", f"@{args_file}", f"--junitxml={SHARD_DIR / f'shard-{i}.xml'}", *options]
+        procs.append(subprocess.Popen(cmd, env=env))
+        print(f"shard {i}: {len(tests)} tests")
+    codes = [p.wait() for p in procs]
+
+    merged = merge_junit([SHARD_DIR / f"shard-{i}.xml" for i in range(len(shards))], args.junitxml)
+    print(f"{merged.get('tests')} tests, {merged.get('failures')} failures, {merged.get('errors')} errors, "
+          f"{merged.get('skipped')} skipped in {merged.get('time')}s -> {args.junitxml}")
+    return max(codes, default=0)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""Local stand-in for the SauceDemo and DemoQA pages the suites touch.
+
+Set STANDIN=1 (or pass ``--standin`` to pytest) and saucedemo_url() /
+demoqa_url() point at loopback servers started on demand instead of the
+public sites. STANDIN_LATENCY picks a latency profile (see PROFILES) or a
+fixed delay in milliseconds.
+"""
+import os
+import random
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+
+SITES = Path(__file__).parent
+SAUCEDEMO_URL = "https://www.saucedemo.com/"
+DEMOQA_URL = "https://demoqa.com"
+
+# name: (base delay, jitter) in seconds
+PROFILES = {
+    "none": (0.0, 0.0),
+    "lan": (0.002, 0.001),
+    "broadband": (0.03, 0.01),
+    "dsl": (0.08, 0.03),
+    "3g": (0.3, 0.1),
+}
+
+
+def latency_profile(name=None):
+    name = name or os.getenv("STANDIN_LATENCY", "none")
+    if name in PROFILES:
+        return PROFILES[name]
+    return float(name) / 1000, 0.0
+
+
+class StandinHandler(SimpleHTTPRequestHandler):
+    """Static handler that maps /text-box to text-box.html and adds latency."""
+
+    latency = (0.0, 0.0)
+    rng = random.Random(0)
+
+    def send_head(self):
+        base, jitter = self.latency
+        if base or jitter:
+            time.sleep(max(0.0, self.rng.gauss(base, jitter)))
+        path = self.path.split("?", 1)[0].split("#", 1)[0]
+        if path != "/" and "." not in path.rsplit("/", 1)[-1]:
+            self.path = path.rstrip("/") + ".html"
+        return super().send_head()
+
+    def log_message(self, format, *args):
+        pass
+
+
+_servers = {}
+_lock = threading.Lock()
+
+
+def start(site, latency=None):
+    """Serve ``site`` ("saucedemo" or "demoqa") on a loopback port; returns its base URL."""
+    with _lock:
+        if site not in _servers:
+            handler = type("Handler", (StandinHandler,), {"latency": latency_profile(latency)})
+            server = ThreadingHTTPServer(("127.0.0.1", 0), partial(handler, directory=str(SITES / site)))
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            _servers[site] = server
+        host, port = _servers[site].server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def stop():
+    with _lock:
+        for server in _servers.values():
+            server.shutdown()
+            server.server_close()
+        _servers.clear()
+
+
+def enabled():
+    return os.getenv("STANDIN") == "1"
+
+
+def saucedemo_url():
+    """Base URL for SauceDemo, with a trailing slash like the public site."""
+    if enabled():
+        return start("saucedemo") + "/"
+    return os.getenv("SAUCEDEMO_URL", SAUCEDEMO_URL)
+
+
+def demoqa_url():
+    """Base URL for DemoQA, without a trailing slash."""
+    if enabled():
+        return start("demoqa")
+    return os.getenv("DEMOQA_URL", DEMOQA_URL)
+
+
+def pytest_addoption(parser):
+    parser.addoption("--standin", action="store_true", help="run against the local SauceDemo/DemoQA stand-in")
+    parser.addoption("--standin-latency", default=None, help="latency profile for the stand-in: "
+                     + ", ".join(PROFILES) + " or milliseconds")
+
+
+def pytest_configure(config):
+    if config.getoption("--standin"):
+        os.environ["STANDIN"] = "1"
+    if config.getoption("--standin-latency"):
+        os.environ["STANDIN_LATENCY"] = config.getoption("--standin-latency")
@@ -0,0 +1,17 @@
+import argparse
+import time
+
+from helpers.standin import PROFILES, start
+
+
+parser = argparse.ArgumentParser(description="Serve the SauceDemo/DemoQA stand-in until interrupted.")
+parser.add_argument("--latency", default=None, help=", ".join(PROFILES) + " or milliseconds")
+args = parser.parse_args()
+
+print("SauceDemo:", start("saucedemo", args.latency) + "/")
+print("DemoQA:   ", start("demoqa", args.latency))
+try:
+    while True:
+        time.sleep(3600)
+except KeyboardInterrupt:
+    pass
@@ -0,0 +1,207 @@
+// Minimal stand-in for www.saucedemo.com: same ids, classes, URLs and storage keys.
+var USERS = ["standard_user", "problem_user", "performance_glitch_user", "error_user", "visual_user"];
+var LOCKED = ["locked_out_user"];
+var PASSWORD = "secret_sauce";
+var PRODUCTS = [
+    {id: 4, name: "Sauce Labs Backpack", price: 29.99},
+    {id: 0, name: "Sauce Labs Bike Light", price: 9.99},
+    {id: 1, name: "Sauce Labs Bolt T-Shirt", price: 15.99},
+    {id: 5, name: "Sauce Labs Fleece Jacket", price: 49.99},
+    {id: 2, name: "Sauce Labs Onesie", price: 7.99},
+    {id: 3, name: "Test.allTheThings() T-Shirt (Red)", price: 15.99}
+];
+
+function slug(name) {
+    return name.toLowerCase().replace(/[^a-z0-9]+/g, "-").replace(/-$/, "");
+}
+
+function product(id) {
+    return PRODUCTS.filter(function (p) { return p.id === id; })[0];
+}
+
+function sessionUser() {
+    var m = document.cookie.match(/(?:^|; )session-username=([^;]*)/);
+    return m ? decodeURIComponent(m[1]) : null;
+}
+
+function cart() {
+    return JSON.parse(localStorage.getItem("cart-contents") || "[]");
+}
+
+function saveCart(ids) {
+    if (ids.length) {
+        localStorage.setItem("cart-contents", JSON.stringify(ids));
+    } else {
+        localStorage.removeItem("cart-contents");
+    }
+    renderBadge();
+}
+
+function el(tag, attrs, text) {
+    var node = document.createElement(tag);
+    for (var k in attrs || {}) node.setAttribute(k, attrs[k]);
+    if (text !== undefined) node.textContent = text;
+    return node;
+}
+
+function renderBadge() {
+    var link = document.querySelector(".shopping_cart_link");
+    if (!link) return;
+    var badge = link.querySelector(".shopping_cart_badge");
+    var count = cart().length;
+    if (!count && badge) badge.remove();
+    if (count) {
+        if (!badge) {
+            badge = el("span", {"class": "shopping_cart_badge", "data-test": "shopping-cart-badge"});
+            link.appendChild(badge);
+        }
+        badge.textContent = String(count);
+    }
+}
+
+function cartButton(p) {
+    var inCart = cart().indexOf(p.id) >= 0;
+    var id = (inCart ? "remove-" : "add-to-cart-") + slug(p.name);
+    var btn = el("button", {id: id, name: id, "data-test": id,
+        "class": "btn btn_small btn_inventory " + (inCart ? "btn_secondary" : "btn_primary")},
+        inCart ? "Remove" : "Add to cart");
+    btn.addEventListener("click", function () {
+        var ids = cart();
+        if (ids.indexOf(p.id) >= 0) {
+            ids.splice(ids.indexOf(p.id), 1);
+        } else {
+            ids.push(p.id);
+        }
+        saveCart(ids);
+        btn.replaceWith(cartButton(p));
+    });
+    return btn;
+}
+
+function itemRow(p, cls, withButton) {
+    var row = el("div", {"class": cls, "data-test": cls.replace("_", "-")});
+    var desc = el("div", {"class": "inventory_item_description"});
+    desc.appendChild(el("div", {"class": "inventory_item_name", "data-test": "inventory-item-name"}, p.name));
+    desc.appendChild(el("div", {"class": "inventory_item_price", "data-test": "inventory-item-price"}, "$" + p.price.toFixed(2)));
+    row.appendChild(desc);
+    if (withButton) desc.appendChild(cartButton(p));
+    return row;
+}
+
+function requireLogin(path) {
+    if (!sessionUser()) {
+        location.href = "/?error=" + encodeURIComponent(path);
+        return false;
+    }
+    return true;
+}
+
+function header() {
+    var menuBtn = document.getElementById("react-burger-menu-btn");
+    var menu = document.querySelector(".bm-menu-wrap");
+    menuBtn.addEventListener("click", function () { menu.setAttribute("aria-hidden", "false"); menu.hidden = false; });
+    document.getElementById("react-burger-cross-btn").addEventListener("click", function () { menu.hidden = true; });
+    document.getElementById("logout_sidebar_link").addEventListener("click", function (e) {
+        e.preventDefault();
+        document.cookie = "session-username=; path=/; max-age=0";
+        location.href = "/";
+    });
+    document.getElementById("reset_sidebar_link").addEventListener("click", function (e) {
+        e.preventDefault();
+        saveCart([]);
+        location.reload();
+    });
+    renderBadge();
+}
+
+var pages = {
+    login: function () {
+        var error = document.querySelector("[data-test=error]");
+        var from = new URLSearchParams(location.search).get("error");
+        if (from) {
+            error.textContent = "Epic sadface: You can only access '" + from + "' when you are logged in.";
+            error.parentNode.hidden = false;
+        }
+        document.getElementById("login_form").addEventListener("submit", function (e) {
+            e.preventDefault();
+            var user = document.getElementById("user-name").value;
+            var pass = document.getElementById("password").value;
+            var msg = null;
+            if (!user) msg = "Username is required";
+            else if (!pass) msg = "Password is required";
+            else if (LOCKED.indexOf(user) >= 0 && pass === PASSWORD) msg = "Sorry, this user has been locked out.";
+            else if (USERS.indexOf(user) < 0 || pass !== PASSWORD) msg = "Username and password do not match any user in this service";
+            if (msg) {
+                error.textContent = "Epic sadface: " + msg;
+                error.parentNode.hidden = false;
+                return;
+            }
+            document.cookie = "session-username=" + encodeURIComponent(user) + "; path=/; max-age=600";
+            location.href = "/inventory.html";
+        });
+    },
+    inventory: function () {
+        if (!requireLogin("/inventory.html")) return;
+        header();
+        var list = document.querySelector(".inventory_list");
+        PRODUCTS.forEach(function (p) { list.appendChild(itemRow(p, "inventory_item", true)); });
+    },
+    cart: function () {
+        if (!requireLogin("/cart.html")) return;
+        header();
+        var list = document.querySelector(".cart_list");
+        cart().forEach(function (id) {
+            var row = itemRow(product(id), "cart_item", false);
+            row.querySelector(".inventory_item_description").appendChild(cartButton(product(id)));
+            list.appendChild(row);
+        });
+        document.getElementById("checkout").addEventListener("click", function () { location.href = "/checkout-step-one.html"; });
+        document.getElementById("continue-shopping").addEventListener("click", function () { location.href = "/inventory.html"; });
+    },
+    "checkout-step-one": function () {
+        if (!requireLogin("/checkout-step-one.html")) return;
+        header();
+        var error = document.querySelector("[data-test=error]");
+        document.getElementById("checkout_info_form").addEventListener("submit", function (e) {
+            e.preventDefault();
+            var fields = [["first-name", "First Name"], ["last-name", "Last Name"], ["postal-code", "Postal Code"]];
+            for (var i = 0; i < fields.length; i++) {
+                if (!document.getElementById(fields[i][0]).value) {
+                    error.textContent = "Error: " + fields[i][1] + " is required";
+                    error.parentNode.hidden = false;
+                    return;
+                }
+            }
+            location.href = "/checkout-step-two.html";
+        });
+        document.getElementById("cancel").addEventListener("click", function () { location.href = "/cart.html"; });
+    },
+    "checkout-step-two": function () {
+        if (!requireLogin("/checkout-step-two.html")) return;
+        header();
+        var list = document.querySelector(".cart_list");
+        var total = 0;
+        cart().forEach(function (id) {
+            list.appendChild(itemRow(product(id), "cart_item", false));
+            total += product(id).price;
+        });
+        var tax = Math.round(total * 8) / 100;
+        document.querySelector(".summary_subtotal_label").textContent = "Item total: $" + total.toFixed(2);
+        document.querySelector(".summary_tax_label").textContent = "Tax: $" + tax.toFixed(2);
+        document.querySelector(".summary_total_label").textContent = "Total: $" + (total + tax).toFixed(2);
+        document.getElementById("finish").addEventListener("click", function () {
+            saveCart([]);
+            location.href = "/checkout-complete.html";
+        });
+        document.getElementById("cancel").addEventListener("click", function () { location.href = "/inventory.html"; });
+    },
+    "checkout-complete": function () {
+        if (!requireLogin("/checkout-complete.html")) return;
+        header();
+        document.getElementById("back-to-products").addEventListener("click", function () { location.href = "/inventory.html"; });
+    }
+};
+
+document.addEventListener("DOMContentLoaded", function () {
+    pages[document.body.dataset.page]();
+});
@@ -0,0 +1,124 @@
+"""Isolated tab sessions inside one shared Chrome.
+
+Each TabSession is a tab in its own DevTools browser context, so cookies,
+localStorage and cache are not shared with other sessions, but it costs a
+renderer rather than a whole browser. ``session.driver`` is a regular
+WebDriver object bound to that tab: every command first switches chromedriver
+to the session's window under a host-wide lock, and ``window_handles`` only
+lists the session's own windows (including popups it opened). ``quit()``
+closes the session's windows and context and leaves the host running.
+Sessions may be used from different threads; their commands are serialised
+per host.
+"""
+import atexit
+import copy
+import threading
+from contextlib import contextmanager
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.switch_to import SwitchTo
+
+from helpers.driver_pool import new_driver
+
+
+class TabHost:
+    """A Chrome that hands out tab sessions."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.execute = driver.execute
+        self.lock = threading.RLock()
+        self.current = driver.current_window_handle
+        self.home = self.current
+
+    def cdp(self, cmd, params=None):
+        return self.execute("executeCdpCommand", {"cmd": cmd, "params": params or {}})["value"]
+
+    def switch(self, handle):
+        if self.current != handle:
+            self.execute(Command.SWITCH_TO_WINDOW, {"handle": handle})
+            self.current = handle
+
+    def session(self):
+        return TabSession(self)
+
+    def close(self):
+        try:
+            self.driver.quit()
+        except WebDriverException:
+            pass
+
+
+class TabSession:
+    def __init__(self, host):
+        self.host = host
+        with host.lock:
+            self.context = host.cdp("Target.createBrowserContext", {"disposeOnDetach": True})["browserContextId"]
+            self.handle = host.cdp(
+                "Target.createTarget", {"url": "about:blank", "browserContextId": self.context}
+            )["targetId"]
+        self.driver = copy.copy(host.driver)
+        self.driver.execute = self._execute
+        self.driver._switch_to = SwitchTo(self.driver)
+        # quitting a session ends the session, not the browser every other session shares
+        self.driver.quit = self.close
+        self.driver.tab_session = self
+        self.closed = False
+
+    def _own_handles(self):
+        targets = self.host.cdp("Target.getTargets")["targetInfos"]
+        return {t["targetId"] for t in targets if t.get("browserContextId") == self.context and t["type"] == "page"}
+
+    def _execute(self, command, params=None):
+        with self.host.lock:
+            if self.handle and command != Command.SWITCH_TO_WINDOW:
+                self.host.switch(self.handle)
+            response = self.host.execute(command, params)
+            if command == Command.SWITCH_TO_WINDOW:
+                self.handle = self.host.current = params["handle"]
+            elif command == Command.W3C_GET_WINDOW_HANDLES:
+                own = self._own_handles()
+                response["value"] = [h for h in response["value"] if h in own]
+            elif command == Command.CLOSE:
+                self.handle = self.host.current = None
+            return response
+
+    def close(self):
+        """Close the session's tab and any windows it opened, then drop its context."""
+        if self.closed:
+            return
+        self.closed = True
+        with self.host.lock:
+            for handle in self._own_handles():
+                self.host.cdp("Target.closeTarget", {"targetId": handle})
+            self.host.cdp("Target.disposeBrowserContext", {"browserContextId": self.context})
+            self.host.current = None
+            self.host.switch(self.host.home)
+
+
+_host = None
+_host_lock = threading.Lock()
+
+
+def host():
+    """The process-wide tab host.
+
+    Its browser is launched outside the driver pool and quit at exit, so it
+    never holds one of the pool's slots (a pool of one would block forever).
+    """
+    global _host
+    with _host_lock:
+        if _host is None:
+            _host = TabHost(new_driver())
+            atexit.register(_host.close)
+        return _host
+
+
+@contextmanager
+def tab_session():
+    session = host().session()
+    try:
+        yield session.driver
+    finally:
+        session.close()
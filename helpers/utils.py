@@ -0,0 +1,76 @@
+"""SauceDemo flows for the script and pytest suites (``helper`` is the old import path)."""
+from selenium.webdriver.common.by import By
+from helpers import checkpoints, sessions
+from helpers.dom_batch import fill_form
+from helpers.sharding import sauce_user
+from helpers.standin import saucedemo_url
+from helpers.waits import wait_for, url_contains, text_present, element_present
+
+
+def login(driver, username=None, password="secret_sauce"):
+    username = username or sauce_user()
+    driver.get(saucedemo_url())
+    driver.find_element(By.ID, "user-name").send_keys(username)
+    driver.find_element(By.ID, "password").send_keys(password)
+    driver.find_element(By.ID, "login-button").click()
+    wait_for(driver, url_contains("inventory"))
+
+
+def logged_in(driver):
+    return "inventory" in driver.current_url and bool(driver.find_elements(By.CLASS_NAME, "inventory_list"))
+
+
+def session_login(driver, username=None, password="secret_sauce"):
+    """Like login(), but reuses the session captured by the first UI login."""
+    username = username or sauce_user()
+    base_url = saucedemo_url()
+    return sessions.session_login(
+        driver,
+        (base_url, username),
+        base_url + "inventory.html",
+        lambda: login(driver, username, password),
+        logged_in,
+    )
+
+
+def add_to_cart(driver, item_name="Sauce Labs Backpack"):
+    button = (By.XPATH, f"//div[text()='{item_name}']/ancestor::div[@class='inventory_item']//button")
+    driver.find_element(*button).click()
+    wait_for(driver, text_present(button, "Remove"))
+
+
+def go_to_cart(driver):
+    driver.find_element(By.CLASS_NAME, "shopping_cart_link").click()
+    wait_for(driver, url_contains("cart"))
+
+
+def checkout(driver, first="Khadija", last="QA", postal="1207"):
+    driver.find_element(By.ID, "checkout").click()
+    submit_checkout_info(driver, first, last, postal)
+
+
+def submit_checkout_info(driver, first="Khadija", last="QA", postal="1207"):
+    fill_form(driver, {
+        (By.ID, "first-name"): first,
+        (By.ID, "last-name"): last,
+        (By.ID, "postal-code"): postal,
+    }, submit=(By.ID, "continue"))
+    wait_for(driver, url_contains("checkout-step-two"))
+
+
+def at_checkout_info(driver, item_name="Sauce Labs Backpack", username=None):
+    """Logged in with ``item_name`` in the cart, on checkout step one.
+
+    Built once per worker, then restored from a checkpoint.
+    """
+    username = username or sauce_user()
+
+    def build():
+        session_login(driver, username)
+        add_to_cart(driver, item_name)
+        go_to_cart(driver)
+        driver.find_element(By.ID, "checkout").click()
+        wait_for(driver, element_present((By.ID, "first-name")))
+
+    key = (saucedemo_url(), username, "checkout-info", item_name)
+    return checkpoints.checkpoint(driver, key, build)
@@ -0,0 +1,191 @@
+"""Opt-in visual checkpoints compared against stored baselines.
+
+    visual.checkpoint(driver, "checkout-complete")
+    visual.checkpoint(driver, "small-modal", element=(By.CLASS_NAME, "modal"), ignore=[(By.ID, "clock")])
+
+Checkpoints do nothing unless ``--visual`` (or VISUAL=1) is set. Then the page
+or element screenshot is compared with ``visual_baselines/<name>.png``. The
+first run, or ``--visual-update``, writes the baseline instead.
+
+The comparison is vectorized with NumPy, on arrays decoded once by Pillow.
+Ignore regions (locators, elements or ``(x, y, w, h)`` rectangles in CSS
+pixels of the capture) are copied from the baseline into the capture;
+element regions are shifted by the page's scroll offset, since a page
+capture shows the viewport. Two checks follow:
+- the share of pixels whose largest channel difference exceeds
+  VISUAL_PIXEL_TOLERANCE must stay at or below VISUAL_MAX_DIFF;
+- the 63-bit DCT perceptual hashes (8x8 low frequencies without the DC
+  term) may differ in at most VISUAL_PHASH_BITS bits.
+Decoded baselines and their hashes stay in memory for the whole run, and a
+capture that is byte-identical to its baseline is never decoded. On a
+mismatch the capture and a diff overlay go to the artifacts directory through
+the background writer. numpy and Pillow are needed only with --visual.
+"""
+import io
+import os
+import threading
+from pathlib import Path
+
+from helpers.artifacts import ARTIFACT_DIR, current_test, slug, submit, unique_stem
+
+
+BASELINE_DIR = Path(os.getenv("VISUAL_BASELINES", "visual_baselines"))
+PIXEL_TOLERANCE = int(os.getenv("VISUAL_PIXEL_TOLERANCE", "16"))
+MAX_DIFF = float(os.getenv("VISUAL_MAX_DIFF", "0.001"))
+PHASH_BITS = int(os.getenv("VISUAL_PHASH_BITS", "6"))
+
+_baselines = {}
+_lock = threading.Lock()
+_dct = None
+
+
+def enabled():
+    return os.getenv("VISUAL") == "1"
+
+
+def updating():
+    return os.getenv("VISUAL_UPDATE") == "1"
+
+
+def _decode(png):
+    import numpy as np
+    from PIL import Image
+    image = Image.open(io.BytesIO(png)).convert("RGB")
+    return np.asarray(image)
+
+
+def phash(pixels):
+    """63-bit perceptual hash: signs of the 8x8 low-frequency DCT of a 32x32 grey thumbnail.
+
+    The DC term only encodes mean brightness, so it is left out.
+    """
+    global _dct
+    import numpy as np
+    from PIL import Image
+    if _dct is None:
+        n = np.arange(32)
+        _dct = np.sqrt(2 / 32) * np.cos(np.pi * (2 * n[None, :] + 1) * n[:, None] / 64)
+        _dct[0] /= np.sqrt(2)
+    thumb = Image.fromarray(pixels).resize((32, 32), Image.BOX, reducing_gap=2.0).convert("L")
+    grey = np.asarray(thumb, dtype=np.float32)
+    low = (_dct @ grey @ _dct.T)[:8, :8].ravel()
+    return low[1:] > np.median(low[1:])
+
+
+def _baseline(path):
+    """Raw bytes, decoded pixels and hash of a baseline, cached while the file is unchanged."""
+    mtime = path.stat().st_mtime_ns
+    with _lock:
+        cached = _baselines.get(path)
+        if cached is None or cached[0] != mtime:
+            raw = path.read_bytes()
+            pixels = _decode(raw)
+            cached = _baselines[path] = (mtime, raw, pixels, phash(pixels))
+    return cached[1:]
+
+
+def _regions(driver, ignore, origin, scale):
+    """Ignore regions as pixel rectangles relative to the captured image.
+
+    ``origin`` is where the capture starts in document coordinates (the
+    element's rect, or the scroll offset for a viewport capture), which is
+    what WebElement.rect reports.
+    """
+    for region in ignore:
+        if isinstance(region, tuple) and len(region) == 4:
+            x, y, w, h = region
+        else:
+            target = driver.find_element(*region) if isinstance(region, tuple) else region
+            rect = target.rect
+            x, y, w, h = rect["x"] - origin["x"], rect["y"] - origin["y"], rect["width"], rect["height"]
+        yield (max(0, int(x * scale)), max(0, int(y * scale)),
+               int((x + w) * scale + 0.999), int((y + h) * scale + 0.999))
+
+
+def compare(current, baseline, regions=(), baseline_hash=None):
+    """Return ``(diff_ratio, phash_distance, diff_mask)`` for two same-sized RGB arrays."""
+    import numpy as np
+    if regions:
+        current = current.copy()
+        for x0, y0, x1, y1 in regions:
+            current[y0:y1, x0:x1] = baseline[y0:y1, x0:x1]
+    if np.array_equal(current, baseline):
+        return 0.0, 0, np.zeros(current.shape[:2], dtype=bool)
+    # |a - b| per channel in uint8, then the largest channel; reducing over the
+    # last axis with .max(axis=2) is an order of magnitude slower
+    delta = np.maximum(current, baseline)
+    delta -= np.minimum(current, baseline)
+    mask = np.maximum(np.maximum(delta[..., 0], delta[..., 1]), delta[..., 2]) > PIXEL_TOLERANCE
+    if baseline_hash is None:
+        baseline_hash = phash(baseline)
+    distance = int(np.count_nonzero(phash(current) != baseline_hash))
+    return float(mask.mean()), distance, mask
+
+
+def _write_failure(stem, current, mask):
+    import numpy as np
+    from PIL import Image
+    ARTIFACT_DIR.mkdir(parents=True, exist_ok=True)
+    Image.fromarray(current).save(ARTIFACT_DIR / f"{stem}-actual.png")
+    overlay = (current * 0.4).astype(np.uint8)
+    overlay[mask] = (255, 0, 0)
+    Image.fromarray(overlay).save(ARTIFACT_DIR / f"{stem}-diff.png")
+
+
+def checkpoint(driver, name, element=None, ignore=()):
+    """Compare the page (or ``element``, a WebElement or locator) with baseline ``name``.
+
+    A no-op unless VISUAL=1, so page objects can call it unconditionally.
+    """
+    if not enabled():
+        return None
+    if isinstance(element, tuple):
+        element = driver.find_element(*element)
+    png = element.screenshot_as_png if element is not None else driver.get_screenshot_as_png()
+    path = BASELINE_DIR / f"{slug(name)}.png"
+    if updating() or not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(png)
+        return None
+    raw, baseline, baseline_hash = _baseline(path)
+    if png == raw:
+        return 0.0, 0  # Chrome encodes identical frames identically; skip decoding
+    current = _decode(png)
+    if current.shape != baseline.shape:
+        raise AssertionError(f"visual checkpoint {name!r}: size {current.shape[1]}x{current.shape[0]} "
+                             f"!= baseline {baseline.shape[1]}x{baseline.shape[0]}")
+    if element is not None:
+        origin = element.rect
+        width = origin["width"]
+    else:
+        width, x, y = driver.execute_script("return [innerWidth, scrollX, scrollY];")
+        origin = {"x": x, "y": y}
+    regions = list(_regions(driver, ignore, origin, current.shape[1] / width if width else 1.0))
+    ratio, distance, mask = compare(current, baseline, regions, baseline_hash)
+    if ratio > MAX_DIFF or distance > PHASH_BITS:
+        # per test and attempt, so tests that share a checkpoint keep their own diffs
+        stem = unique_stem("-".join(filter(None, [current_test(), name])))
+        submit(_write_failure, stem, current, mask)
+        raise AssertionError(
+            f"visual checkpoint {name!r}: {ratio:.3%} of pixels differ (max {MAX_DIFF:.3%}), "
+            f"phash distance {distance} (max {PHASH_BITS}); see {ARTIFACT_DIR / stem}-diff.png"
+        )
+    return ratio, distance
+
+
+def pytest_addoption(parser):
+    parser.addoption("--visual", action="store_true", help="run visual checkpoints against baselines (VISUAL=1)")
+    parser.addoption("--visual-update", action="store_true", help="rewrite visual baselines (VISUAL_UPDATE=1)")
+
+
+def pytest_configure(config):
+    if config.getoption("--visual") or config.getoption("--visual-update"):
+        import pytest
+        try:
+            import numpy  # noqa: F401
+            import PIL  # noqa: F401
+        except ImportError as err:
+            raise pytest.UsageError(f"--visual needs numpy and Pillow ({err})")
+        os.environ["VISUAL"] = "1"
+    if config.getoption("--visual-update"):
+        os.environ["VISUAL_UPDATE"] = "1"
@@ -0,0 +1,143 @@
+import logging
+import os
+import time
+from collections import namedtuple
+
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+
+
+DEFAULT_TIMEOUT = float(os.getenv("WAIT_TIMEOUT", "10"))
+POLL_START = 0.05
+POLL_MAX = 0.5
+POLL_GROWTH = 1.5
+
+log = logging.getLogger(__name__)
+
+WaitRecord = namedtuple("WaitRecord", "description elapsed polls ok")
+
+# Every wait in this process, in order. Read by the terminal summary below.
+wait_log = []
+
+
+class Condition:
+    """A post-condition: ``check(driver)`` returns a truthy value when met."""
+
+    def __init__(self, check, description):
+        self.check = check
+        self.description = description
+
+    def __call__(self, driver):
+        return self.check(driver)
+
+    def __repr__(self):
+        return self.description
+
+
+def _ec():
+    # expected_conditions imports the whole remote WebDriver; defer it to the first wait
+    from selenium.webdriver.support import expected_conditions
+    return expected_conditions
+
+
+def url_changes(url):
+    return Condition(_ec().url_changes(url), f"url changes from {url}")
+
+
+def url_contains(fragment):
+    return Condition(_ec().url_contains(fragment), f"url contains {fragment!r}")
+
+
+def element_present(locator):
+    return Condition(_ec().presence_of_element_located(locator), f"{locator} present")
+
+
+def element_visible(locator):
+    return Condition(_ec().visibility_of_element_located(locator), f"{locator} visible")
+
+
+def element_invisible(locator):
+    return Condition(_ec().invisibility_of_element_located(locator), f"{locator} invisible")
+
+
+def element_clickable(locator):
+    return Condition(_ec().element_to_be_clickable(locator), f"{locator} clickable")
+
+
+def element_stale(element):
+    return Condition(_ec().staleness_of(element), "element stale")
+
+
+def text_present(locator, text):
+    return Condition(_ec().text_to_be_present_in_element(locator, text), f"{text!r} in {locator}")
+
+
+def alert_present():
+    return Condition(_ec().alert_is_present(), "alert present")
+
+
+def window_count(count):
+    return Condition(_ec().number_of_windows_to_be(count), f"{count} windows open")
+
+
+NETWORK_IDLE_JS = """
+if (document.readyState !== 'complete') return false;
+var entries = performance.getEntriesByType('resource');
+var last = entries.length ? entries[entries.length - 1].responseEnd : 0;
+return performance.now() - last >= arguments[0];
+"""
+
+
+def network_idle(idle_ms=500):
+    """Page loaded and no resource has finished within the last ``idle_ms``."""
+    return Condition(
+        lambda driver: driver.execute_script(NETWORK_IDLE_JS, idle_ms),
+        f"network idle for {idle_ms}ms",
+    )
+
+
+def wait_for(driver, condition, timeout=DEFAULT_TIMEOUT):
+    """Poll ``condition`` until it holds and return its value.
+
+    Polling starts at 50ms and backs off to 500ms, so fast conditions return
+    almost immediately while slow ones don't flood chromedriver. Each wait is
+    appended to ``wait_log`` with how long it actually took.
+    """
+    description = getattr(condition, "description", repr(condition))
+    start = time.monotonic()
+    deadline = start + timeout
+    interval = POLL_START
+    polls = 0
+    while True:
+        polls += 1
+        try:
+            value = condition(driver)
+        except (NoSuchElementException, StaleElementReferenceException):
+            value = False
+        now = time.monotonic()
+        if value:
+            _record(description, now - start, polls, True)
+            return value
+        if now >= deadline:
+            _record(description, now - start, polls, False)
+            raise TimeoutException(f"Timed out after {timeout}s waiting for {description}")
+        time.sleep(min(interval, deadline - now))
+        interval = min(interval * POLL_GROWTH, POLL_MAX)
+
+
+def _record(description, elapsed, polls, ok):
+    wait_log.append(WaitRecord(description, elapsed, polls, ok))
+    log.debug("wait for %s: %.3fs in %d polls (%s)", description, elapsed, polls, "ok" if ok else "timeout")
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not wait_log:
+        return
+    total = sum(r.elapsed for r in wait_log)
+    terminalreporter.write_sep("-", f"waits: {len(wait_log)} totalling {total:.2f}s")
+    for r in sorted(wait_log, key=lambda r: r.elapsed, reverse=True)[:10]:
+        status = "ok" if r.ok else "TIMEOUT"
+        terminalreporter.write_line(f"{r.elapsed:7.3f}s  {r.polls:3d} polls  {status:7}  {r.description}")
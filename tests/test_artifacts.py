@@ -0,0 +1,89 @@
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from helpers import artifacts
+
+
+PNG = b"\x89PNG\r\n\x1a\n fake"
+
+
+class Driver:
+    def __init__(self, broken=False, logs=True):
+        self.broken = broken
+        self.logs = logs
+
+    def get_screenshot_as_png(self):
+        if self.broken:
+            raise WebDriverException("gone")
+        return PNG
+
+    def execute_script(self, script):
+        if self.broken:
+            raise WebDriverException("gone")
+        return "<html><body>failed</body></html>"
+
+    def get_log(self, kind):
+        if not self.logs:
+            raise WebDriverException("log type not supported")
+        return [{"level": "SEVERE", "message": "boom"}]
+
+
+@pytest.fixture
+def plain(tmp_path, monkeypatch):
+    """Artifacts under tmp_path, written without Pillow or zstandard."""
+    monkeypatch.setattr(artifacts, "ARTIFACT_DIR", tmp_path)
+    monkeypatch.setattr(artifacts, "_available", {"PIL": False, "zstandard": False})
+    return tmp_path
+
+
+def test_capture_writes_png_and_gzip_in_the_background(plain):
+    paths = artifacts.capture(Driver(), "tests/test_x.py::test_pay[visa]-call")
+    artifacts.flush()
+    assert set(paths) == {"screenshot", "dom", "console"}
+    assert Path(paths["screenshot"]).read_bytes() == PNG
+    assert gzip.decompress(Path(paths["dom"]).read_bytes()) == b"<html><body>failed</body></html>"
+    assert json.loads(gzip.decompress(Path(paths["console"]).read_bytes()))[0]["message"] == "boom"
+    assert Path(paths["dom"]).name.startswith("tests_test_x.py_test_pay_visa_-call-")
+    assert paths["dom"].endswith(".html.gz") and paths["screenshot"].endswith(".png")
+
+
+def test_a_dead_browser_yields_no_artifacts(plain):
+    assert artifacts.capture(Driver(broken=True, logs=False), "t") == {}
+
+
+def test_missing_console_logs_are_skipped(plain):
+    assert set(artifacts.capture(Driver(logs=False), "t")) == {"screenshot", "dom"}
+    artifacts.flush()
+
+
+def test_suffixes_follow_the_installed_encoders(plain, monkeypatch):
+    monkeypatch.setattr(artifacts, "_available", {"PIL": True, "zstandard": True})
+    monkeypatch.setattr(artifacts, "submit", lambda fn, *args: None)
+    paths = artifacts.capture(Driver(), "t")
+    assert paths["screenshot"].endswith(".webp") and paths["dom"].endswith(".html.zst")
+
+
+def test_stems_are_unique_per_call_and_worker(monkeypatch):
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw3")
+    first, second = artifacts.unique_stem("a::b"), artifacts.unique_stem("a::b")
+    assert first != second
+    assert first.startswith("a_b-gw3-")
+
+
+def test_current_test_strips_the_phase(monkeypatch):
+    monkeypatch.setenv("PYTEST_CURRENT_TEST", "tests/test_x.py::test_pay[visa] (call)")
+    assert artifacts.current_test() == "tests/test_x.py::test_pay[visa]"
+    monkeypatch.delenv("PYTEST_CURRENT_TEST")
+    assert artifacts.current_test() is None
+
+
+def test_a_failed_writer_surfaces_on_flush(plain):
+    def fail():
+        raise OSError("disk full")
+    artifacts.submit(fail)
+    with pytest.raises(OSError):
+        artifacts.flush()
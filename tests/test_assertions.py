@@ -0,0 +1,58 @@
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from helpers import assertions
+from helpers.assertions import CHECK_JS, assert_attribute, assert_count, assert_page_contains, assert_text_in
+
+
+class Driver:
+    def __init__(self, answer):
+        self.answer = answer
+        self.args = None
+
+    def execute_script(self, script, *args):
+        assert script == CHECK_JS
+        self.args = args
+        return self.answer
+
+
+def test_passing_checks_send_only_the_arguments():
+    driver = Driver([True, ""])
+    assert_text_in(driver, ("id", "header"), "Thank you", ignore_case=True)
+    assert driver.args == ("text", "id", "header", "Thank you", True)
+    assert_page_contains(driver, "Swag Labs")
+    assert driver.args == ("source", None, None, "Swag Labs", False)
+    assert_attribute(driver, ("id", "cart"), "data-count", "2")
+    assert driver.args == ("attribute", "id", "cart", "2", "data-count")
+
+
+def test_failures_show_what_was_there():
+    with pytest.raises(AssertionError, match="found: 'Thank you for your ord'"):
+        assert_text_in(Driver([False, "Thank you for your ord"]), ("id", "header"), "Thanks")
+    with pytest.raises(AssertionError, match="expected 2 elements at .* found 3"):
+        assert_count(Driver([False, "3"]), ("class name", "cart_item"), 2)
+
+
+def run_check(html, text, *args):
+    """Evaluate CHECK_JS in node against a document whose root has ``html`` and ``text``."""
+    script = (
+        "var document = {documentElement: {outerHTML: %s, textContent: %s}};\n"
+        "var CSS = {escape: function (s) { return s; }};\n"
+        "console.log(JSON.stringify((function () {\n%s\n}).apply(null, %s)));"
+        % (json.dumps(html), json.dumps(text), CHECK_JS, json.dumps(list(args)))
+    )
+    out = subprocess.run(["node", "-e", script], capture_output=True, text=True, check=True).stdout
+    return json.loads(out)
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="needs node to run the page script")
+def test_the_page_script_matches_and_snips_around_the_closest_prefix():
+    html = "<html><body>" + "x" * 300 + "<h2>Thank you for your order!</h2>" + "y" * 300 + "</body></html>"
+    assert run_check(html, "", "source", None, None, "Thank you", False)[0] is True
+    assert run_check(html, "", "source", None, None, "THANK YOU", True)[0] is True
+    ok, snippet = run_check(html, "", "source", None, None, "Thank you for shopping", False)
+    assert ok is False
+    assert "Thank you for " in snippet and len(snippet) == assertions.SNIPPET
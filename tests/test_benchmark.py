@@ -0,0 +1,62 @@
+from contextlib import contextmanager
+
+import pytest
+
+from helpers import benchmark, instrumentation
+
+
+def result(median, p95, **environment):
+    env = {"target": "standin", "latency": "none", "fast_profile": True, "chrome": "120"}
+    env.update(environment)
+    return {"environment": env, "flows": {"login_id": {"median": median, "p95": p95}}}
+
+
+@pytest.mark.parametrize("pct, expected", [(50, 3), (95, 5), (0, 1), (100, 5)])
+def test_percentile_is_nearest_rank(pct, expected):
+    assert benchmark.percentile([5, 1, 4, 2, 3], pct) == expected
+
+
+def test_median_and_p95_regressions_use_their_own_thresholds():
+    baseline = result(1.0, 2.0)
+    assert benchmark.compare(result(1.05, 2.4), baseline, 0.10, 0.25) == []
+    assert benchmark.compare(result(1.2, 2.0), baseline, 0.10, 0.25) == [("login_id", "median", 1.0, 1.2)]
+    assert benchmark.compare(result(1.0, 2.6), baseline, 0.10, 0.25) == [("login_id", "p95", 2.0, 2.6)]
+
+
+def test_flows_missing_from_the_baseline_are_not_compared():
+    baseline = {"flows": {}}
+    assert benchmark.compare(result(5.0, 9.0), baseline, 0.1) == []
+
+
+def test_baselines_from_another_environment_are_refused():
+    assert benchmark.mismatched(result(1, 1), result(1, 1, chrome="121")) == []
+    assert benchmark.mismatched(result(1, 1), result(1, 1, latency="3g", fast_profile=False)) == [
+        "latency", "fast_profile"]
+
+
+def test_transferred_bytes_sum_navigation_and_resources():
+    records = [{"timing": {"navigation": {"transferSize": 1000}, "resources": [{"size": 200}, {"size": 50}]}},
+               {"timing": None}, {}]
+    assert benchmark._transferred(records) == 1250
+
+
+def test_run_flow_tags_records_with_the_flow_name(monkeypatch):
+    started = []
+    monkeypatch.setattr(instrumentation.recorder, "start", started.append)
+    monkeypatch.setattr(instrumentation, "instrument", lambda driver: driver)
+    monkeypatch.setitem(benchmark.FLOWS, "noop", lambda driver: None)
+
+    class Pool:
+        @contextmanager
+        def lease(self):
+            yield object()
+
+    stats = benchmark.run_flow(Pool(), "noop", 2)
+    assert started == ["noop"] * 3
+    assert stats["iterations"] == 2 and stats["commands"] == 0
+
+
+def test_unknown_flows_are_rejected(capsys):
+    with pytest.raises(SystemExit):
+        benchmark.main(["--flows", "login_id,nope"])
+    assert "unknown flow(s): nope" in capsys.readouterr().err
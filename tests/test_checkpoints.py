@@ -0,0 +1,68 @@
+import pytest
+
+from helpers import checkpoints
+
+
+class Driver:
+    """Restoring lands on ``landing`` (the checkout page, or the login page when the session expired)."""
+
+    def __init__(self):
+        self.current_url = "about:blank"
+        self.landing = None
+        self.cookies = []
+
+    def get(self, url):
+        self.current_url = self.landing or url
+
+    def get_cookies(self):
+        return self.cookies
+
+    def execute_script(self, script, *args):
+        if script.startswith("return [location.href"):
+            return [self.current_url, {}, {}]
+
+    def execute_cdp_cmd(self, cmd, params):
+        return {"identifier": "1"} if cmd == "Page.addScriptToEvaluateOnNewDocument" else {}
+
+
+@pytest.fixture(autouse=True)
+def fresh_store(monkeypatch):
+    monkeypatch.setattr(checkpoints, "store", checkpoints.sessions.SessionStore())
+
+
+def test_the_first_use_builds_and_later_uses_restore():
+    driver = Driver()
+    builds = []
+
+    def build():
+        builds.append(1)
+        driver.current_url = "https://shop.test/checkout-step-one.html"
+
+    assert checkpoints.checkpoint(driver, "checkout", build) is False
+    driver.current_url = "about:blank"
+    assert checkpoints.checkpoint(driver, "checkout", build) is True
+    assert driver.current_url == "https://shop.test/checkout-step-one.html"
+    assert builds == [1]
+
+
+def test_a_restore_that_is_bounced_elsewhere_rebuilds():
+    driver = Driver()
+    builds = []
+
+    def build():
+        builds.append(1)
+        driver.landing = None
+        driver.current_url = "https://shop.test/checkout-step-one.html"
+
+    checkpoints.checkpoint(driver, "checkout", build)
+    driver.landing = "https://shop.test/"  # the app sent us back to login
+    assert checkpoints.checkpoint(driver, "checkout", build) is False
+    assert builds == [1, 1]
+    assert checkpoints.store.get("checkout")["url"].endswith("checkout-step-one.html")
+
+
+def test_restored_compares_paths_only():
+    driver = Driver()
+    driver.current_url = "https://shop.test/cart.html?ref=1#top"
+    assert checkpoints.restored(driver, {"url": "https://shop.test/cart.html"})
+    assert not checkpoints.restored(driver, {"url": "https://shop.test/inventory.html"})
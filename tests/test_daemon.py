@@ -0,0 +1,118 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+from selenium import webdriver
+
+from helpers import daemon
+from helpers.driver_pool import DriverPool
+
+
+class DevTools(BaseHTTPRequestHandler):
+    """Just enough of Chrome's /json endpoints."""
+    pages = []
+
+    def do_GET(self):
+        body = {"/json/version": {"Browser": "Chrome/fake"}, "/json/list": self.pages}.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        self._reply(body)
+
+    def do_PUT(self):
+        self.pages.append({"type": "page", "url": "about:blank"})
+        self._reply(self.pages[-1])
+
+    def _reply(self, body):
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def chrome():
+    DevTools.pages = []
+    server = HTTPServer(("127.0.0.1", 0), DevTools)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield {"port": server.server_address[1], "pid": 1, "profile": ""}
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def state(tmp_path, monkeypatch):
+    monkeypatch.setattr(daemon, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(daemon, "STATE", tmp_path / "daemon.json")
+    monkeypatch.setattr(daemon, "resolve_chromedriver", lambda: "chromedriver")
+    return tmp_path / "daemon.json"
+
+
+def dead_instance():
+    return {"port": daemon._free_port(), "pid": 1, "profile": ""}
+
+
+def test_healthy_opens_a_page_when_there_is_none(chrome):
+    assert daemon.healthy(chrome)
+    assert DevTools.pages == [{"type": "page", "url": "about:blank"}]
+    assert not daemon.healthy(dead_instance())
+
+
+def test_enabled_needs_a_state_file_and_no_opt_out(state, monkeypatch):
+    assert not daemon.enabled()
+    daemon._write_state([])
+    assert daemon.enabled() and daemon.read_state()["instances"] == []
+    monkeypatch.setenv("BROWSER_DAEMON", "0")
+    assert not daemon.enabled()
+    state.write_text("{broken")
+    assert daemon.read_state() is None
+
+
+class Driver:
+    def __init__(self, service=None, options=None):
+        self.options = options
+        self.quits = 0
+
+    def quit(self):
+        self.quits += 1
+
+
+def test_attach_skips_leased_and_dead_instances(state, chrome, monkeypatch):
+    monkeypatch.setattr(webdriver, "Chrome", Driver)
+    daemon._write_state([dead_instance(), chrome])
+    with daemon._lock(chrome):
+        assert daemon.attach() is None
+    driver = daemon.attach()
+    assert driver.daemon_attached
+    assert driver.options.debugger_address == f"127.0.0.1:{chrome['port']}"
+    with pytest.raises(BlockingIOError):
+        daemon._lock(chrome).__enter__()
+
+
+def test_quit_resets_detaches_and_frees_the_instance(state, chrome, monkeypatch):
+    monkeypatch.setattr(webdriver, "Chrome", Driver)
+    resets = []
+    monkeypatch.setattr(DriverPool, "reset", staticmethod(resets.append))
+    daemon._write_state([chrome])
+    driver = daemon.attach()
+    driver.quit()
+    assert resets == [driver] and driver.quits == 1
+    assert daemon.attach() is not None  # the lock was released
+
+
+def test_status_reports_health_and_leases(state, chrome, capsys):
+    assert daemon.main(["status"]) == 1
+    assert "no daemon running" in capsys.readouterr().out
+    dead = dead_instance()
+    daemon._write_state([chrome, dead])
+    with daemon._lock(chrome):
+        assert daemon.main(["status"]) == 0
+    assert capsys.readouterr().out.splitlines() == [
+        f"port {chrome['port']}: healthy, leased",
+        f"port {dead['port']}: DOWN",
+    ]
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from helpers.datasets import Dataset
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "users.csv"
+    lines = ["first,last,zip"] + [f"user{n},last{n},{10000 + n}" for n in range(20)]
+    lines.insert(5, "")  # blank lines are skipped but still counted
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def test_rows_are_parsed_lazily_with_line_ids(csv_file):
+    rows = list(Dataset(csv_file).rows())
+    assert len(rows) == 20
+    assert rows[0].id == "users:2"
+    assert rows[4].id == "users:7"
+    assert rows[0]._data is None
+    assert rows[0]["first"] == "user0"
+    assert rows[4].get("zip") == "10004"
+
+
+def test_jsonl_rows(tmp_path):
+    path = tmp_path / "cases.jsonl"
+    path.write_text("\n".join(json.dumps({"n": n, "name": f"café {n}"}) for n in range(3)) + "\n", encoding="utf-8")
+    rows = list(Dataset(path).rows())
+    assert [row["n"] for row in rows] == [0, 1, 2]
+    assert rows[2]["name"] == "café 2"
+    assert rows[0].id == "cases:1"
+
+
+def test_sample_is_seeded_and_in_file_order(csv_file):
+    dataset = Dataset(csv_file)
+    first = [row.id for row in dataset.rows(sample=5, seed=3)]
+    assert len(first) == 5
+    assert first == [row.id for row in dataset.rows(sample=5, seed=3)]
+    assert first == sorted(first, key=lambda id_: int(id_.split(":")[1]))
+    assert [row.id for row in dataset.rows(sample=50)] == [row.id for row in dataset.rows()]
+
+
+def test_shards_partition_the_rows(csv_file):
+    dataset = Dataset(csv_file)
+    everything = [row.id for row in dataset.rows()]
+    shards = [[row.id for row in dataset.rows(shard=(i, 3))] for i in range(3)]
+    assert sorted(sum(shards, []), key=everything.index) == everything
+    assert not set(shards[0]) & set(shards[1])
+    assert [len(shard) for shard in shards] == [7, 7, 6]
+
+
+def test_sample_applies_within_a_shard(csv_file):
+    dataset = Dataset(csv_file)
+    shard = {row.id for row in dataset.rows(shard=(1, 2))}
+    sampled = {row.id for row in dataset.rows(sample=4, shard=(1, 2))}
+    assert len(sampled) == 4
+    assert sampled <= shard
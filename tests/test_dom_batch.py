@@ -0,0 +1,115 @@
+import pytest
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+
+from helpers import fused
+from helpers.dom_batch import COLLECT_JS, DOM_VERSION_JS, FILL_JS, CollectionIndex, collection_index, fill_form
+
+
+class Button:
+    def __init__(self, stale=0):
+        self.clicks = 0
+        self.stale = stale
+
+    def click(self):
+        if self.stale:
+            self.stale -= 1
+            raise StaleElementReferenceException("gone")
+        self.clicks += 1
+
+
+class Page:
+    """Answers COLLECT_JS with ``rows`` and DOM_VERSION_JS with ``version``."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.version = "https://shop.test/inventory.html#t:1"
+        self.scripts = []
+
+    def execute_script(self, script, *args):
+        self.scripts.append((script, args))
+        if script == DOM_VERSION_JS:
+            return self.version
+        if script == COLLECT_JS:
+            return [self.version, [dict(row) for row in self.rows]]
+        if script == FILL_JS:
+            fields, submit = args
+            return [f"{by}={value}" for by, value, _ in fields if value == "missing"]
+        raise AssertionError("unexpected script")
+
+    def count(self, script):
+        return sum(1 for s, _ in self.scripts if s == script)
+
+
+def inventory(page):
+    return CollectionIndex(page, ("class name", "inventory_item"),
+                           {"name": ("class name", "inventory_item_name"), "button": ("tag name", "button")},
+                           key="name", handles=["button"])
+
+
+def test_the_collection_is_read_once_until_the_dom_changes():
+    page = Page([{"name": "Backpack", "button": Button()}, {"name": "Bike Light", "button": Button()}])
+    index = inventory(page)
+    assert index.get("Bike Light")["name"] == "Bike Light"
+    assert index.get("Backpack") is not None
+    assert index.get("Onesie") is None
+    assert page.count(COLLECT_JS) == 1 and page.count(DOM_VERSION_JS) == 2
+    page.version = "https://shop.test/inventory.html#t:2"
+    index.get("Backpack")
+    assert page.count(COLLECT_JS) == 2
+
+
+def test_collect_passes_locators_and_handles():
+    page = Page([])
+    inventory(page).refresh()
+    script, args = page.scripts[0]
+    assert args == ("class name", "inventory_item",
+                    {"name": ["class name", "inventory_item_name"], "button": ["tag name", "button"]}, ["button"])
+
+
+def test_click_retries_once_on_a_stale_handle():
+    button = Button(stale=1)
+    page = Page([{"name": "Backpack", "button": button}])
+    index = inventory(page)
+    assert index.click("Backpack", "button") is True
+    assert button.clicks == 1 and page.count(COLLECT_JS) == 2
+    assert index.click("Onesie", "button") is False
+
+
+def test_click_gives_up_after_a_second_stale_handle():
+    page = Page([{"name": "Backpack", "button": Button(stale=5)}])
+    with pytest.raises(StaleElementReferenceException):
+        inventory(page).click("Backpack", "button")
+
+
+def test_collection_index_is_cached_per_driver_and_name():
+    page = Page([])
+    first = collection_index(page, "items", ("class name", "row"), {}, key="name")
+    assert collection_index(page, "items", ("class name", "other"), {}, key="name") is first
+    assert collection_index(Page([]), "items", ("class name", "row"), {}, key="name") is not first
+
+
+def test_fill_form_is_one_script_and_reports_missing_fields():
+    page = Page([])
+    fill_form(page, {("id", "first-name"): "John", ("id", "postal-code"): 12345}, submit=("id", "continue"))
+    assert page.scripts == [(FILL_JS, ([["id", "first-name", "John"], ["id", "postal-code", "12345"]],
+                                       ["id", "continue"]))]
+    with pytest.raises(NoSuchElementException, match="id=missing"):
+        fill_form(page, {("id", "missing"): "x"})
+
+
+def test_fill_form_in_a_fused_plan_submits_with_a_click_step(monkeypatch):
+    monkeypatch.setenv("FUSED", "1")
+
+    class Driver:
+        def __init__(self):
+            self.batches = []
+
+        def execute_async_script(self, script, payload, dialogs, run):
+            self.batches.append([(step["kind"], step.get("arg") if step["kind"] == "script" else step["chain"])
+                                 for step in payload])
+            return {"results": [None] * len(payload), "error": None, "navigated": False, "dialogs": []}
+
+    driver = Driver()
+    with fused.plan(driver) as page:
+        fill_form(page, {("id", "zip"): "12345"}, submit=("id", "continue"))
+    assert driver.batches == [[("script", [[["id", "zip", "12345"]], None]), ("click", [["id", "continue"]])]]
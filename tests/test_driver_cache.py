@@ -0,0 +1,81 @@
+import os
+import sys
+import types
+
+import pytest
+
+from helpers import driver_cache
+from helpers.driver_cache import FileLock
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(driver_cache, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(driver_cache, "INDEX", tmp_path / "cache" / "chromedriver.json")
+    monkeypatch.setattr(driver_cache, "chrome_version", lambda: "120.0.1")
+    monkeypatch.delenv("CHROMEDRIVER_PATH", raising=False)
+    monkeypatch.delenv("DRIVER_OFFLINE", raising=False)
+    installs = []
+
+    def install():
+        path = tmp_path / f"chromedriver-{len(installs)}"
+        path.write_bytes(b"\x7fELF driver")
+        installs.append(path)
+        return str(path)
+
+    manager = types.ModuleType("webdriver_manager.chrome")
+    manager.ChromeDriverManager = lambda: types.SimpleNamespace(install=install)
+    monkeypatch.setitem(sys.modules, "webdriver_manager.chrome", manager)
+    return installs
+
+
+def test_chromedriver_path_wins(cache, monkeypatch):
+    monkeypatch.setenv("CHROMEDRIVER_PATH", "/opt/chromedriver")
+    assert driver_cache.resolve_chromedriver() == "/opt/chromedriver"
+    assert not cache
+
+
+def test_a_miss_installs_once_and_warm_runs_use_the_cache(cache):
+    first = driver_cache.resolve_chromedriver()
+    assert driver_cache.resolve_chromedriver() == first
+    assert len(cache) == 1
+    entry = driver_cache._load_index()["120.0.1"]
+    assert entry["sha256"] == driver_cache.sha256(first)
+
+
+def test_a_touched_but_unchanged_binary_is_still_valid(cache):
+    path = driver_cache.resolve_chromedriver()
+    os.utime(path, ns=(1, 1))
+    assert driver_cache.resolve_chromedriver() == path
+    assert len(cache) == 1
+
+
+def test_a_corrupted_binary_is_downloaded_again(cache):
+    path = driver_cache.resolve_chromedriver()
+    with open(path, "ab") as fh:
+        fh.write(b"garbage")
+    assert driver_cache.resolve_chromedriver() != path
+    assert len(cache) == 2
+
+
+def test_offline_miss_is_an_error(cache, monkeypatch):
+    monkeypatch.setenv("DRIVER_OFFLINE", "1")
+    with pytest.raises(RuntimeError, match="DRIVER_OFFLINE"):
+        driver_cache.resolve_chromedriver()
+    assert not cache
+
+
+def test_offline_hit_needs_no_download(cache, monkeypatch):
+    path = driver_cache.resolve_chromedriver()
+    monkeypatch.setenv("DRIVER_OFFLINE", "1")
+    assert driver_cache.resolve_chromedriver() == path
+
+
+def test_file_lock_is_exclusive(tmp_path):
+    path = tmp_path / "x.lock"
+    with FileLock(path):
+        with pytest.raises(BlockingIOError):
+            with FileLock(path, blocking=False):
+                pass
+    with FileLock(path, blocking=False):
+        pass
@@ -0,0 +1,119 @@
+import threading
+
+from selenium.common.exceptions import WebDriverException
+
+from helpers.driver_pool import DriverPool, owning_pool
+
+
+class FakeSwitch:
+    def window(self, handle):
+        pass
+
+
+class FakeDriver:
+    def __init__(self):
+        self.window_handles = ["main"]
+        self.switch_to = FakeSwitch()
+        self.quit_calls = 0
+        self.broken = False
+
+    def execute_script(self, script, *args):
+        if self.broken:
+            raise WebDriverException("gone")
+
+    def execute_cdp_cmd(self, cmd, params):
+        pass
+
+    def get(self, url):
+        pass
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+def make_pool(**kwargs):
+    made = []
+
+    def factory():
+        made.append(FakeDriver())
+        return made[-1]
+    return DriverPool(factory=factory, **kwargs), made
+
+
+def test_released_driver_is_reused():
+    pool, made = make_pool(size=2)
+    first = pool.acquire()
+    pool.release(first)
+    assert pool.acquire() is first
+    assert len(made) == 1
+
+
+def test_driver_is_quit_after_max_uses():
+    pool, made = make_pool(size=1, max_uses=2)
+    for _ in range(3):
+        with pool.lease():
+            pass
+    assert len(made) == 2
+    assert made[0].quit_calls == 1
+
+
+def test_broken_driver_is_replaced():
+    pool, made = make_pool(size=1)
+    driver = pool.acquire()
+    driver.broken = True
+    pool.release(driver)
+    assert driver.quit_calls == 1
+    assert pool.acquire() is not driver
+
+
+def test_mark_for_recycle_quits_on_release_and_clears_the_mark():
+    pool, made = make_pool(size=1)
+    driver = pool.acquire()
+    pool.mark_for_recycle(driver)
+    assert pool.marked_for_recycle(driver)
+    pool.release(driver)
+    assert driver.quit_calls == 1
+    assert not pool.marked_for_recycle(driver)
+
+
+def test_acquire_waits_for_a_free_slot():
+    pool, made = make_pool(size=1)
+    held = pool.acquire()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire()))
+    waiter.start()
+    waiter.join(0.1)
+    assert not got
+    pool.release(held)
+    waiter.join(1)
+    assert got == [held]
+
+
+def test_owning_pool_finds_the_leasing_pool():
+    pool, made = make_pool(size=1)
+    other, _ = make_pool(size=1)
+    driver = pool.acquire()
+    assert owning_pool(driver) is pool
+    assert owning_pool(FakeDriver()) is None
+    pool.close()
+    assert driver.quit_calls == 1
+    assert owning_pool(driver) is None
+
+
+def test_a_second_release_does_not_make_the_driver_idle_twice():
+    pool, made = make_pool(size=2)
+    driver = pool.acquire()
+    pool.release(driver)
+    pool.release(driver)
+    assert pool.acquire() is driver
+    assert pool.acquire() is not driver
+    assert len(made) == 2
+
+
+def test_release_after_close_is_ignored():
+    pool, made = make_pool(size=1)
+    driver = pool.acquire()
+    pool.close()
+    pool.release(driver)
+    assert driver.quit_calls == 1
+    assert not pool.owns(driver)
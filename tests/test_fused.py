@@ -0,0 +1,179 @@
+import pytest
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from selenium.webdriver.common.keys import Keys
+
+from helpers import fused
+from helpers.fused import Plan, RecordingDriver
+
+
+class FakeElement:
+    def __init__(self, driver, chain):
+        self.driver = driver
+        self.chain = chain
+        self.text = "text of " + chain[-1][1]
+
+    def find_element(self, by, value):
+        return FakeElement(self.driver, self.chain + [[by, value]])
+
+    def click(self):
+        self.driver.log.append(("click", self.chain[-1][1]))
+
+    def clear(self):
+        self.driver.log.append(("clear", self.chain[-1][1]))
+
+    def send_keys(self, value):
+        self.driver.log.append(("send_keys", self.chain[-1][1], value))
+
+
+class FakeDriver:
+    """Answers each fused script from ``responses``: a dict, or a callable of the payload."""
+
+    current_url = "https://example.test/"
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.batches = []
+        self.log = []
+        self.storage = None
+
+    def execute_async_script(self, script, payload, dialogs, run):
+        self.batches.append([(step["kind"], step["chain"] and step["chain"][-1][1]) for step in payload])
+        response = self.responses.pop(0) if self.responses else {}
+        if callable(response):
+            return response(payload, run)
+        return {"results": [None] * len(payload), "error": None, "navigated": False, "dialogs": [], **response}
+
+    def execute_script(self, script, *args):
+        if "sessionStorage" in script:
+            return self.storage
+        self.log.append(("script", args))
+        return None
+
+    def find_element(self, by, value):
+        return FakeElement(self, [[by, value]])
+
+
+def record(plan, *steps):
+    page = RecordingDriver(plan)
+    for kind, target, *arg in steps:
+        element = page.find_element("id", target)
+        if kind == "click":
+            element.click()
+        else:
+            element.send_keys(*arg)
+
+
+def test_steps_go_out_as_one_script_and_results_land_on_them():
+    driver = FakeDriver({"results": [None, None, "Thank you"]})
+    plan = Plan(driver)
+    record(plan, ("send_keys", "first-name", "John"), ("click", "continue"))
+    assert RecordingDriver(plan).find_element("id", "header").text == "Thank you"
+    assert driver.batches == [[("send_keys", "first-name"), ("click", "continue"), ("text", "header")]]
+    assert plan.scripts == 1 and not driver.log
+
+
+def test_a_navigation_sends_the_rest_in_a_new_script():
+    driver = FakeDriver({"results": [None], "navigated": True})
+    plan = Plan(driver)
+    record(plan, ("click", "checkout"), ("send_keys", "zip", "12345"))
+    plan.flush()
+    assert driver.batches == [[("click", "checkout"), ("send_keys", "zip")], [("send_keys", "zip")]]
+    assert len(plan.results) == 2
+
+
+def test_an_unloaded_page_reports_progress_through_session_storage():
+    def unload(payload, run):
+        driver.storage = f"{run}:1"
+        raise WebDriverException("javascript error: document unloaded while waiting for result")
+
+    driver = FakeDriver(unload)
+    plan = Plan(driver)
+    record(plan, ("click", "checkout"), ("click", "continue"))
+    plan.flush()
+    assert driver.batches == [[("click", "checkout"), ("click", "continue")], [("click", "continue")]]
+
+
+def test_an_unload_without_progress_raises():
+    def unload(payload, run):
+        raise WebDriverException("chrome not reachable")
+
+    plan = Plan(FakeDriver(unload))
+    record(plan, ("click", "checkout"))
+    with pytest.raises(WebDriverException):
+        plan.flush()
+
+
+def test_a_failing_step_falls_back_to_the_real_driver():
+    missing = {"code": "no such element", "message": "Unable to locate element: id=zip"}
+    driver = FakeDriver({"results": [None], "error": missing})
+    plan = Plan(driver)
+    record(plan, ("send_keys", "first-name", "John"), ("send_keys", "zip", "12345"), ("click", "continue"))
+    plan.flush()
+    assert driver.log == [("send_keys", "zip", "12345"), ("click", "continue")]
+    assert plan.fallbacks == 1 and len(plan.results) == 3
+
+
+def test_without_fallback_the_browser_error_is_raised_as_selenium_exception():
+    missing = {"code": "no such element", "message": "Unable to locate element: id=zip"}
+    plan = Plan(FakeDriver({"results": [], "error": missing}), fallback=False)
+    record(plan, ("send_keys", "zip", "12345"))
+    with pytest.raises(NoSuchElementException, match="id=zip"):
+        plan.flush()
+
+
+def test_unfusable_steps_run_alone_and_the_rest_is_batched_again():
+    driver = FakeDriver({"results": [None], "error": {"code": "unfusable", "message": "file input"}})
+    plan = Plan(driver)
+    record(plan, ("click", "open"), ("send_keys", "upload", "/tmp/a.png"), ("click", "submit"))
+    plan.flush()
+    assert driver.log == [("send_keys", "upload", "/tmp/a.png")]
+    assert driver.batches[1] == [("click", "submit")]
+
+
+def test_special_keys_go_through_the_real_driver_in_order():
+    driver = FakeDriver()
+    plan = Plan(driver)
+    record(plan, ("send_keys", "search", "shoes"), ("send_keys", "search", Keys.ENTER))
+    assert driver.batches == [[("send_keys", "search")]]
+    assert driver.log == [("send_keys", "search", Keys.ENTER)]
+
+
+def test_a_deferred_script_failure_uses_its_error():
+    driver = FakeDriver({"results": [], "error": {"code": "script", "message": "failed", "value": ["zip"]}})
+    plan = Plan(driver, fallback=False)
+    RecordingDriver(plan).defer_script("return [];", [1], lambda value: ValueError(f"missing {value}"))
+    with pytest.raises(ValueError, match="missing"):
+        plan.flush()
+
+
+def test_dialog_messages_are_collected_and_restored(monkeypatch):
+    monkeypatch.setenv("FUSED", "1")
+    driver = FakeDriver({"dialogs": [["alert", "hi"], ["confirm", "sure?"]]})
+    with fused.plan(driver, dialogs={"confirm": False}) as page:
+        page.find_element("id", "alertButton").click()
+    assert page.plan.dialog_messages == [["alert", "hi"], ["confirm", "sure?"]]
+    assert driver._fused_plan is None
+
+
+def test_attribute_access_flushes_first(monkeypatch):
+    monkeypatch.setenv("FUSED", "1")
+    driver = FakeDriver()
+    with fused.plan(driver) as page:
+        page.find_element("id", "continue").click()
+        assert page.current_url == "https://example.test/"
+        assert len(driver.batches) == 1
+
+
+def test_a_nested_plan_merges_its_dialogs_and_rejects_conflicts(monkeypatch):
+    monkeypatch.setenv("FUSED", "1")
+    driver = FakeDriver()
+    with fused.plan(driver, dialogs={"confirm": False}) as outer:
+        with fused.plan(driver, dialogs={"prompt": "Khadija"}) as inner:
+            assert inner.plan is outer.plan
+        assert outer.plan.dialogs == {"confirm": False, "prompt": "Khadija"}
+        with pytest.raises(ValueError):
+            with fused.plan(driver, dialogs={"confirm": True}):
+                pass
+        with pytest.raises(ValueError):
+            with fused.plan(outer, fallback=False):
+                pass
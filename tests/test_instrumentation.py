@@ -0,0 +1,105 @@
+import pytest
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.command import Command
+
+from helpers import instrumentation
+from helpers.instrumentation import CommandRecorder, instrument, summarize, timeline_html
+
+
+class Driver:
+    def __init__(self, timing_error=False):
+        self.sent = []
+        self.timing_error = timing_error
+
+    def execute(self, command, params=None):
+        self.sent.append(command)
+        if command == Command.W3C_EXECUTE_SCRIPT and params["script"] == instrumentation.TIMING_JS:
+            if self.timing_error:
+                raise WebDriverException("unexpected alert open")
+            return {"value": {"navigation": {"transferSize": 900}, "resources": []}}
+        if command == Command.SCREENSHOT:
+            return {"value": "A" * 4096}
+        return {"value": None}
+
+
+@pytest.fixture
+def recorder(monkeypatch):
+    recorder = CommandRecorder()
+    monkeypatch.setattr(instrumentation, "recorder", recorder)
+    return recorder
+
+
+def test_commands_are_recorded_with_locator_and_sizes(recorder):
+    driver = instrument(Driver())
+    recorder.start("t")
+    driver.execute(Command.FIND_ELEMENT, {"using": "css selector", "value": "#login"})
+    driver.execute(Command.SCREENSHOT)
+    find, shot = recorder.take()
+    assert find["locator"] == "css selector=#login" and find["command"] == Command.FIND_ELEMENT
+    assert shot["received"] == 4096
+    assert find["offset"] <= shot["offset"]
+
+
+def test_get_pulls_timing_without_counting_it(recorder):
+    driver = instrument(Driver())
+    recorder.start("t")
+    driver.execute(Command.GET, {"url": "https://shop.test/"})
+    records = recorder.take()
+    assert len(records) == 1
+    assert records[0]["url"] == "https://shop.test/"
+    assert records[0]["timing"]["navigation"]["transferSize"] == 900
+    assert summarize(records)["commands"] == 1
+
+
+def test_a_failing_timing_read_does_not_fail_the_get(recorder):
+    driver = instrument(Driver(timing_error=True))
+    recorder.start("t")
+    assert driver.execute(Command.GET, {"url": "https://shop.test/"}) == {"value": None}
+    assert recorder.take()[0]["timing"] is None
+
+
+def test_instrument_is_idempotent(recorder):
+    driver = Driver()
+    assert instrument(instrument(driver)) is driver
+    recorder.start("t")
+    driver.execute(Command.GET_TITLE)
+    assert len(recorder.take()) == 1
+
+
+def test_nothing_is_kept_while_nobody_collects(recorder):
+    driver = instrument(Driver())
+    driver.execute(Command.GET_TITLE)
+    assert not recorder.records
+    recorder.start("t")
+    recorder.take()
+    driver.execute(Command.GET_TITLE)
+    assert not recorder.records
+
+
+def test_the_recorder_is_capped(recorder, monkeypatch):
+    monkeypatch.setattr(instrumentation, "MAX_RECORDS", 3)
+    recorder = CommandRecorder()
+    monkeypatch.setattr(instrumentation, "recorder", recorder)
+    driver = instrument(Driver())
+    recorder.start("t")
+    for _ in range(10):
+        driver.execute(Command.GET_TITLE)
+    assert len(recorder.take()) == 3
+
+
+def test_enabled_follows_the_environment(monkeypatch):
+    monkeypatch.delenv("WEBDRIVER_TIMINGS", raising=False)
+    assert not instrumentation.enabled()
+    monkeypatch.setenv("WEBDRIVER_TIMINGS", "1")
+    assert instrumentation.enabled()
+
+
+def test_timeline_escapes_labels():
+    records = [{"command": Command.GET, "url": "https://shop.test/?q=<b>", "offset": 0.0, "wall": 0.2,
+                "sent": 10, "received": 20},
+               {"command": Command.FIND_ELEMENT, "locator": "id=x", "offset": 0.2, "wall": 0.1,
+                "sent": 5, "received": 5}]
+    html = timeline_html(records)
+    assert "<b>" not in html and "&lt;b&gt;" in html
+    assert "2 WebDriver commands" in html and "40 bytes" in html
+    assert timeline_html([]) == ""
@@ -0,0 +1,80 @@
+import argparse
+import asyncio
+import json
+import random
+
+import pytest
+
+from helpers import load
+
+
+@pytest.fixture
+def local(monkeypatch):
+    """Targets the stand-in, as main() does without --live."""
+    monkeypatch.setenv("STANDIN", "1")
+    monkeypatch.setenv("SAUCE_USERS", "standard_user,problem_user")
+
+
+def args(**overrides):
+    values = dict(users=2, ramp_up=0.0, duration=float("inf"), iterations=1, think="const:0", client="http")
+    values.update(overrides)
+    return argparse.Namespace(**values)
+
+
+def test_think_time_specs():
+    random.seed(1)
+    assert load.think_time("const:0.5")() == 0.5
+    assert 1 <= load.think_time("uniform:1-2")() <= 2
+    assert load.think_time("exp:0")() == 0.0
+    assert load.think_time("normal:0,0.001")() >= 0.0
+    with pytest.raises(ValueError):
+        load.think_time("poisson:1")
+
+
+def test_report_puts_start_errors_first_and_leaves_empty_steps_blank():
+    stats = load.Stats()
+    stats.add("start", 0.0, "RuntimeError: no browser")
+    for seconds in (0.1, 0.2, 0.3):
+        stats.add("login", seconds)
+    report = stats.report(2.0, load.CHECKOUT_FLOW)
+    assert list(report["steps"])[:2] == ["start", "login"]
+    assert report["steps"]["start"]["errors"] == 1
+    assert report["steps"]["login"]["count"] == 3 and report["steps"]["login"]["throughput"] == 1.5
+    assert report["steps"]["finish"]["p50"] is None
+
+
+def test_http_client_walks_the_flow_and_caches_assets(local):
+    from helpers.standin import saucedemo_url
+    client = load.HttpClient(saucedemo_url())
+    fetched = []
+    fetch = client.fetch
+    client.fetch = lambda url: fetched.append(url) or fetch(url)
+    try:
+        for step in load.CHECKOUT_FLOW:
+            client.run(step, "problem_user")
+        assert client.cookie == "session-username=problem_user"
+        client.end_iteration()
+        assert client.cookie is None
+    finally:
+        client.close()
+    assets = [url for url in fetched if not url.endswith(".html") and not url.endswith("/")]
+    assert assets and len(assets) == len(set(assets))
+
+
+def test_failing_clients_count_as_start_errors(local, monkeypatch):
+    def broken(base_url):
+        raise RuntimeError("no browser")
+    monkeypatch.setattr(load, "HttpClient", broken)
+    stats = load.Stats()
+    asyncio.run(load.run(args(), stats))
+    assert stats.errors == {"start": ["RuntimeError: no browser"] * 2}
+    assert stats.iterations == 0
+
+
+def test_main_runs_the_flow_and_writes_the_report(local, tmp_path, capsys):
+    path = tmp_path / "load.json"
+    assert load.main(["-u", "2", "--iterations", "2", "--think", "const:0", "--json", str(path)]) == 0
+    report = json.loads(path.read_text())
+    assert report["iterations"] == 4
+    assert report["steps"]["checkout"]["count"] == 4 and report["steps"]["checkout"]["errors"] == 0
+    assert capsys.readouterr().out.startswith("2 users, 4 flows in ")
@@ -0,0 +1,96 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from helpers import monitor
+from helpers.driver_pool import DriverPool
+from helpers.fixtures import lease_scope
+
+
+MB = 2 ** 20
+
+
+class Driver:
+    """Answers the DevTools calls sample() makes with scripted metrics."""
+
+    def __init__(self, *metrics):
+        self.metrics = list(metrics)
+        self.commands = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.commands.append(cmd)
+        if cmd == "Performance.getMetrics":
+            if not self.metrics:
+                raise WebDriverException("gone")
+            return {"metrics": [{"name": k, "value": v} for k, v in self.metrics.pop(0).items()]}
+        return {}
+
+    def quit(self):
+        pass
+
+
+def test_sample_collects_garbage_first_and_enables_performance_once():
+    driver = Driver({"JSHeapUsedSize": 10, "Nodes": 3, "Other": 1}, {"JSHeapUsedSize": 11})
+    assert monitor.sample(driver) == {"heap": 10, "nodes": 3}
+    assert monitor.sample(driver) == {"heap": 11}
+    assert driver.commands.count("Performance.enable") == 1
+    assert driver.commands[1:3] == ["HeapProfiler.collectGarbage", "Performance.getMetrics"]
+    assert monitor.sample(driver) is None
+
+
+def test_history_is_bounded_and_only_the_top_records_are_kept(tmp_path, monkeypatch):
+    monkeypatch.setattr(monitor, "TOP", 2)
+    log = tmp_path / "resources.jsonl"
+    mon = monitor.Monitor(log)
+    driver = object()
+    for i, growth in enumerate([5, 1, 9, 3, 7, 2, 8, 4]):
+        mon.record(f"t{i}", driver, {"heap": 0}, {"heap": growth})
+    mon.close()
+    assert len(mon.history[id(driver)]) == monitor.WINDOW + 1
+    assert sorted(record["test"] for _, _, record in mon.top) == ["t2", "t6"]
+    assert mon.count == 8 and len(log.read_text().splitlines()) == 8
+    assert json.loads(log.read_text().splitlines()[0])["delta"] == {"heap": 5}
+
+
+def test_monotonic_growth_is_reported_as_a_leak(monkeypatch):
+    monkeypatch.setattr(monitor, "WINDOW", 3)
+    mon = monitor.Monitor()
+    driver = object()
+    for i, nodes in enumerate([10, 20, 30, 25, 40, 50, 60]):
+        mon.record(f"t{i}", driver, {"nodes": 0}, {"nodes": nodes, "heap": 1})
+    assert list(mon.leaks) == ["t4", "t5", "t6"]
+    assert mon.leaks["t4"] == "nodes grew monotonically by 35 over 3 tests"
+
+
+def test_a_pooled_browser_over_a_limit_is_recycled_once():
+    pool = DriverPool(size=1, factory=Driver)
+    driver = pool.acquire()
+    mon = monitor.Monitor()
+    huge = {"heap": monitor.MAX_HEAP + MB, "nodes": monitor.MAX_NODES + 1}
+    mon.record("t1", driver, {"heap": 0}, huge)
+    mon.record("t2", driver, {"heap": 0}, huge)
+    assert mon.recycled == [("t1", ["heap", "nodes"], None)]
+    pool.release(driver)
+    assert pool.acquire() is not driver
+    pool.close()
+
+
+@pytest.mark.parametrize("driver, reason", [
+    (SimpleNamespace(tab_session=object()), "tab session; its context is disposed with the session"),
+    (SimpleNamespace(), "not leased from a driver pool"),
+])
+def test_other_browsers_over_a_limit_are_only_reported(driver, reason):
+    mon = monitor.Monitor()
+    mon._check_limits("t1", driver, {"rss": monitor.MAX_RSS + 1})
+    assert mon.recycled == [("t1", ["rss"], reason)]
+
+
+def test_the_monitor_leases_drivers_per_test():
+    options = {"--tab-sessions": False, "--monitor": False, "--monitor-log": None}
+    config = SimpleNamespace(getoption=lambda name, default=None: options.get(name, default))
+    scope = lease_scope("module")
+    assert scope("driver", config) == "module"
+    options["--monitor"] = True
+    assert scope("driver", config) == "function"
@@ -0,0 +1,100 @@
+import base64
+import time
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from helpers import network
+
+
+def entry(url, text, method="GET", post=None, status=200):
+    request = {"method": method, "url": url}
+    if post is not None:
+        request["postData"] = {"text": post}
+    return {"request": request,
+            "response": {"status": status, "headers": [{"name": "Content-Type", "value": "text/plain"}],
+                         "content": {"text": text}}}
+
+
+def test_keys_ignore_fragments_and_missing_bodies():
+    assert network._key("GET", "https://x/a#top", None) == ("GET", "https://x/a", "")
+    assert network._key("POST", "https://x/a", "q=1") != network._key("POST", "https://x/a", "q=2")
+
+
+def test_archives_are_named_after_the_test(monkeypatch, tmp_path):
+    monkeypatch.setattr(network, "NETWORK_DIR", tmp_path)
+    assert network.archive_path("tests/test_x.py::test_y[1]") == tmp_path / "tests_test_x.py_test_y_1.har.json"
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = tmp_path / "deep" / "a.har.json"
+    assert network.load(path) == []
+    network.save(path, [entry("https://x/", "hi")])
+    assert network.load(path)[0]["response"]["content"]["text"] == "hi"
+
+
+def test_repeated_requests_are_served_in_order_then_the_last_repeats():
+    interceptor = network.Interceptor(None, "replay", [entry("https://x/n", "1"), entry("https://x/n", "2")])
+    key = network._key("GET", "https://x/n", None)
+    assert [interceptor._lookup(key)["content"]["text"] for _ in range(3)] == ["1", "2", "2"]
+    assert interceptor._lookup(network._key("GET", "https://x/other", None)) is None
+
+
+def fake_devtools():
+    command = lambda name: lambda *args, **kwargs: (name, args, kwargs)
+    fetch = SimpleNamespace(continue_request=command("continue"), fail_request=command("fail"),
+                            fulfill_request=command("fulfill"), enable=command("enable"),
+                            HeaderEntry=lambda **kw: kw, RequestPattern=lambda **kw: kw,
+                            RequestStage=SimpleNamespace(REQUEST="Request", RESPONSE="Response"))
+    return SimpleNamespace(fetch=fetch, network=SimpleNamespace(ErrorReason=SimpleNamespace(BLOCKED_BY_CLIENT="blocked")))
+
+
+class Session:
+    def __init__(self):
+        self.sent = []
+
+    async def execute(self, command):
+        self.sent.append(command)
+
+
+def paused(url, method="GET", post=None):
+    return SimpleNamespace(request_id="r1", request=SimpleNamespace(method=method, url=url, post_data=post))
+
+
+@pytest.mark.parametrize("mode, expected", [("replay", "continue"), ("replay-strict", "fail")])
+def test_replay_fulfils_recorded_requests_and_handles_the_rest(mode, expected):
+    import trio
+    interceptor = network.Interceptor(None, mode, [entry("https://x/a", "hi")])
+    session, devtools = Session(), fake_devtools()
+    trio.run(interceptor._handle, session, devtools, paused("https://x/a#frag"))
+    trio.run(interceptor._handle, session, devtools, paused("https://x/b"))
+    (fulfilled, _, kwargs), (other, _, _) = session.sent
+    assert fulfilled == "fulfill" and kwargs["response_code"] == 200
+    assert base64.b64decode(kwargs["body"]) == b"hi"
+    assert other == expected
+    assert interceptor.unmatched == ["GET https://x/b"]
+
+
+def test_start_raises_when_interception_never_comes_up(monkeypatch):
+    import trio
+
+    class Driver:
+        @asynccontextmanager
+        async def bidi_connection(self):
+            await trio.sleep(0.5)
+            yield SimpleNamespace(session=session, devtools=fake_devtools())
+
+    session = Session()
+
+    monkeypatch.setattr(network, "STARTUP_TIMEOUT", 0.05)
+    interceptor = network.Interceptor(Driver(), "record")
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        interceptor.start()
+    assert time.monotonic() - started < 0.4
+    interceptor._thread.join(2)
+    # the late connection enabled Fetch, saw it was abandoned and left
+    assert not interceptor._thread.is_alive()
+    assert [name for name, _, _ in session.sent] == ["enable"]
+    assert not interceptor._ready.is_set() and interceptor._error is None
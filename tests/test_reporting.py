@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+from helpers import reporting
+
+
+def record(n, worker="main"):
+    outcome = ("passed", "passed", "failed", "skipped")[n % 4]
+    return {"id": f"tests/test_x.py::test_{worker}_{n}", "outcome": outcome, "duration": (n * 37 % 50) / 10,
+            "markers": ["smoke"] if n % 3 == 0 else [], "worker": worker, "start": 1700000000 + n,
+            "reruns": n % 5 == 0, "message": "boom" if outcome == "failed" else None, "artifacts": {}}
+
+
+def append(directory, worker, records):
+    with open(directory / f"results-{worker}.jsonl", "a", encoding="utf-8") as fh:
+        for item in records:
+            fh.write(json.dumps(item) + "\n")
+
+
+def tree(directory):
+    """Every rendered file, with the summary's render time dropped."""
+    files = {}
+    for path in sorted((directory / "html").rglob("*")):
+        if path.is_file() and path.name != "state.json":
+            files[path.relative_to(directory).as_posix()] = path.read_text(encoding="utf-8")
+    summary = files.pop("html/data/summary.js")
+    data = json.loads(summary[summary.index("(") + 1:summary.rindex(")")])
+    del data["generated"]
+    return files, data
+
+
+def loaded(directory):
+    """Rendered records and index sizes, independent of the order records were numbered in."""
+    files, summary = tree(directory)
+    pages = [reporting._read_page(directory / name) for name in files if "/page-" in name]
+    records = sorted(json.dumps(item, sort_keys=True) for page in pages for item in page)
+    del summary["slowest_count"]
+    return records, summary
+
+
+@pytest.fixture(autouse=True)
+def small_pages(monkeypatch):
+    monkeypatch.setattr(reporting, "PAGE_SIZE", 7)
+    monkeypatch.setattr(reporting, "SLOWEST", 10)
+
+
+def test_incremental_render_matches_a_rebuild(tmp_path):
+    records = [record(n) for n in range(40)]
+    for start, stop in ((0, 3), (3, 7), (7, 20), (20, 21), (21, 40)):
+        append(tmp_path, "main", records[start:stop])
+        assert reporting.render(tmp_path) == stop
+    incremental = tree(tmp_path)
+    assert reporting.render(tmp_path, rebuild=True) == 40
+    assert tree(tmp_path) == incremental
+
+
+def test_incremental_render_of_several_workers_has_the_same_content(tmp_path):
+    # renders number records in the order they were read, so only the content is compared
+    for chunk in range(3):
+        for worker in ("gw0", "gw1"):
+            append(tmp_path, worker, [record(n, worker) for n in range(chunk * 9, chunk * 9 + 9)])
+        reporting.render(tmp_path)
+    incremental = loaded(tmp_path)
+    reporting.render(tmp_path, rebuild=True)
+    assert loaded(tmp_path) == incremental
+    assert incremental[1]["count"] == 54
+
+
+def test_a_partial_line_waits_for_the_next_render(tmp_path):
+    append(tmp_path, "main", [record(0)])
+    with open(tmp_path / "results-main.jsonl", "a", encoding="utf-8") as fh:
+        fh.write(json.dumps(record(1))[:20])
+    assert reporting.render(tmp_path) == 1
+    with open(tmp_path / "results-main.jsonl", "a", encoding="utf-8") as fh:
+        fh.write(json.dumps(record(1))[20:] + "\n")
+    assert reporting.render(tmp_path) == 2
+
+
+def test_a_new_run_in_the_same_directory_starts_over(tmp_path):
+    append(tmp_path, "main", [record(n) for n in range(10)])
+    reporting.render(tmp_path)
+    (tmp_path / "results-main.jsonl").unlink()
+    append(tmp_path, "main", [record(n) for n in range(3)])
+    assert reporting.render(tmp_path) == 3
+    assert not (tmp_path / "html" / "data" / "page-00001.js").exists()
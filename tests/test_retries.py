@@ -0,0 +1,57 @@
+import pytest
+from selenium.common.exceptions import (
+    NoSuchElementException, StaleElementReferenceException, TimeoutException, WebDriverException,
+)
+
+from helpers.retries import MAX_DELAY, FlakeHistory, classify
+
+
+@pytest.mark.parametrize("exc, expected", [
+    (StaleElementReferenceException("stale"), "stale"),
+    (TimeoutException("waited"), "timeout"),
+    (TimeoutError(), "timeout"),
+    (ConnectionRefusedError(), "network"),
+    (WebDriverException("unknown error: net::ERR_CONNECTION_RESET"), "network"),
+    (WebDriverException("chrome not reachable: disconnected"), "network"),
+    (AssertionError("wrong total"), "assertion"),
+    (NoSuchElementException("no #checkout"), "error"),
+    (WebDriverException("invalid argument"), "error"),
+    (ValueError(), "error"),
+])
+def test_classify(exc, expected):
+    assert classify(exc) == expected
+
+
+def test_delay_starts_from_the_default_and_doubles(tmp_path):
+    history = FlakeHistory(tmp_path / "history.json")
+    assert history.delay("t", "timeout", 0) == 0.5
+    assert history.delay("t", "timeout", 2) == 2.0
+    assert history.delay("t", "network", 10) == MAX_DELAY
+
+
+def test_delay_follows_the_recovering_delays(tmp_path):
+    history = FlakeHistory(tmp_path / "history.json")
+    for delay in (0.2, 0.4, 3.0):
+        history.record("t", [("timeout", delay)], passed=True)
+    assert history.delay("t", "timeout", 0) == 0.4
+    assert history.tests["t"]["flaky"] == 3
+
+
+def test_a_class_that_never_recovers_stops_being_retried(tmp_path):
+    history = FlakeHistory(tmp_path / "history.json")
+    for _ in range(5):
+        assert history.worth_retrying("t", "network")
+        history.record("t", [("network", 1.0)], passed=False)
+    assert not history.worth_retrying("t", "network")
+    assert history.worth_retrying("t", "stale")
+
+
+def test_save_merges_with_the_file(tmp_path):
+    path = tmp_path / "history.json"
+    first = FlakeHistory(path)
+    first.record("a", [], passed=True)
+    second = FlakeHistory(path)
+    first.save()
+    second.record("b", [("stale", 0.0)], passed=True)
+    second.save()
+    assert set(FlakeHistory(path).tests) == {"a", "b"}
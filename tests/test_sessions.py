@@ -0,0 +1,115 @@
+import json
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from helpers import sessions
+
+
+STATE = {
+    "url": "https://shop.test/inventory.html",
+    "origin": "https://shop.test",
+    "cookies": [{"name": "session-username", "value": "standard_user", "path": "/", "expiry": 1999999999},
+                {"name": "theme", "value": "dark", "domain": "shop.test", "sameSite": "Lax"}],
+    "local_storage": {"cart-contents": "[4]"},
+    "session_storage": {},
+}
+
+
+class WebDriverOnly:
+    """A driver without DevTools: cookies and storage go through WebDriver."""
+
+    def __init__(self):
+        self.calls = []
+        self.cookies = []
+        self.current_url = None
+
+    def get(self, url):
+        self.calls.append(("get", url))
+        self.current_url = url
+
+    def delete_all_cookies(self):
+        self.calls.append(("delete_all_cookies",))
+        self.cookies = []
+
+    def add_cookie(self, cookie):
+        self.cookies.append(cookie)
+
+    def get_cookies(self):
+        return list(self.cookies)
+
+    def execute_script(self, script, *args):
+        self.calls.append(("script", script))
+        if script.startswith("return [location.href"):
+            return [self.current_url, {"cart-contents": "[4]"}, {}]
+
+
+class ChromeDriver(WebDriverOnly):
+    def execute_cdp_cmd(self, cmd, params):
+        self.calls.append((cmd, params))
+        if cmd == "Page.addScriptToEvaluateOnNewDocument":
+            return {"identifier": "7"}
+        return {}
+
+
+def test_capture_reads_url_cookies_and_storage():
+    driver = WebDriverOnly()
+    driver.get("https://shop.test/inventory.html?x=1")
+    driver.add_cookie({"name": "a", "value": "b"})
+    state = sessions.capture(driver)
+    assert state["origin"] == "https://shop.test"
+    assert state["cookies"] == [{"name": "a", "value": "b"}]
+    assert state["local_storage"] == {"cart-contents": "[4]"}
+
+
+def test_chrome_injection_is_one_page_load():
+    driver = ChromeDriver()
+    sessions.inject(driver, STATE, STATE["url"])
+    kinds = [call[0] for call in driver.calls]
+    assert kinds == ["Network.clearBrowserCookies", "Network.setCookies", "Page.addScriptToEvaluateOnNewDocument",
+                     "get", "Page.removeScriptToEvaluateOnNewDocument"]
+    cookies = driver.calls[1][1]["cookies"]
+    assert cookies[0] == {"name": "session-username", "value": "standard_user", "path": "/", "secure": False,
+                          "httpOnly": False, "url": "https://shop.test", "expires": 1999999999}
+    assert cookies[1]["domain"] == "shop.test" and cookies[1]["sameSite"] == "Lax"
+    source = driver.calls[2][1]["source"]
+    assert json.dumps("https://shop.test") in source and json.dumps({"cart-contents": "[4]"}) in source
+    assert driver.calls[4][1] == {"identifier": "7"}
+
+
+def test_the_injected_script_is_removed_even_if_the_load_fails():
+    class Failing(ChromeDriver):
+        def get(self, url):
+            raise WebDriverException("net::ERR_CONNECTION_REFUSED")
+    driver = Failing()
+    with pytest.raises(WebDriverException):
+        sessions.inject(driver, STATE, STATE["url"])
+    assert driver.calls[-1][0] == "Page.removeScriptToEvaluateOnNewDocument"
+
+
+def test_without_devtools_the_origin_is_loaded_first():
+    driver = WebDriverOnly()
+    sessions.inject(driver, STATE, STATE["url"])
+    assert driver.calls[0] == ("get", "https://shop.test")
+    assert driver.calls[-1] == ("get", STATE["url"])
+    assert driver.cookies == STATE["cookies"]
+
+
+def test_session_login_uses_the_cache_and_falls_back_when_rejected(monkeypatch):
+    monkeypatch.setattr(sessions, "store", sessions.SessionStore())
+    driver = ChromeDriver()
+    logins = []
+
+    def ui_login():
+        logins.append(1)
+        driver.get(STATE["url"])
+
+    accept = [True]
+    key = ("https://shop.test", "standard_user")
+    assert sessions.session_login(driver, key, STATE["url"], ui_login, lambda d: accept[0]) is False
+    assert sessions.session_login(driver, key, STATE["url"], ui_login, lambda d: accept[0]) is True
+    assert len(logins) == 1
+    accept[0] = False
+    assert sessions.session_login(driver, key, STATE["url"], ui_login, lambda d: accept[0]) is False
+    assert len(logins) == 2
+    assert sessions.store.get(key)["url"] == STATE["url"]
@@ -0,0 +1,58 @@
+from types import SimpleNamespace
+
+from helpers.sharding import balance, plan_groups
+
+
+class FakeItem:
+    def __init__(self, nodeid, order=False, depends=(), originalname=None):
+        self.nodeid = nodeid
+        self.name = nodeid.split("::")[-1]
+        self.originalname = originalname or self.name
+        self.markers = {}
+        if order:
+            self.markers["order"] = SimpleNamespace(args=(1,), kwargs={})
+        if depends:
+            self.markers["dependency"] = SimpleNamespace(args=(), kwargs={"depends": list(depends)})
+
+    def get_closest_marker(self, name):
+        return self.markers.get(name)
+
+
+def test_independent_tests_get_their_own_groups():
+    items = [FakeItem("a.py::test_one"), FakeItem("a.py::test_two")]
+    groups = plan_groups(items)
+    assert groups["a.py::test_one"] != groups["a.py::test_two"]
+
+
+def test_ordered_tests_share_a_group_per_module():
+    items = [FakeItem("a.py::test_one", order=True), FakeItem("a.py::test_two", order=True),
+             FakeItem("b.py::test_three", order=True), FakeItem("a.py::test_free")]
+    groups = plan_groups(items)
+    assert groups["a.py::test_one"] == groups["a.py::test_two"]
+    assert groups["b.py::test_three"] != groups["a.py::test_one"]
+    assert groups["a.py::test_free"] != groups["a.py::test_one"]
+
+
+def test_dependency_pulls_in_every_parametrized_case():
+    items = [FakeItem("a.py::test_login[a]", originalname="test_login"),
+             FakeItem("a.py::test_login[b]", originalname="test_login"),
+             FakeItem("a.py::test_cart", depends=["test_login"])]
+    groups = plan_groups(items)
+    assert len(set(groups.values())) == 1
+
+
+def test_balance_spreads_groups_by_duration_and_keeps_them_whole():
+    groups = {"t1": "g1", "t2": "g1", "t3": "g3", "t4": "g4"}
+    durations = {"t1": 5.0, "t2": 5.0, "t3": 6.0, "t4": 3.0}
+    shards = balance(groups, durations, 2)
+    assert sorted(map(len, shards)) == [2, 2]
+    assert ["t1", "t2"] in shards
+    assert sorted(t for shard in shards for t in shard) == ["t1", "t2", "t3", "t4"]
+
+
+def test_balance_uses_the_median_for_unknown_tests_and_keeps_collection_order():
+    groups = {name: name for name in ("t1", "t2", "t3", "t4")}
+    shards = balance(groups, {"t1": 1.0, "t2": 1.0}, 2)
+    assert sorted(map(len, shards)) == [2, 2]
+    for shard in shards:
+        assert shard == sorted(shard)
@@ -0,0 +1,94 @@
+from selenium.webdriver.remote.command import Command
+
+from helpers import tab_sessions
+from helpers.tab_sessions import TabHost
+
+
+class Chrome:
+    """Enough of a Chrome host for tab sessions: targets, contexts and window switching."""
+
+    def __init__(self):
+        self.current_window_handle = "home"
+        self.targets = [{"targetId": "home", "type": "page", "browserContextId": "default"}]
+        self.contexts = 0
+        self.log = []
+        self.quit_calls = 0
+
+    def execute(self, command, params=None):
+        self.log.append((command, params))
+        if command == "executeCdpCommand":
+            return {"value": self.cdp(params["cmd"], params["params"])}
+        if command == Command.SWITCH_TO_WINDOW:
+            self.current_window_handle = params["handle"]
+        if command == Command.W3C_GET_WINDOW_HANDLES:
+            return {"value": [t["targetId"] for t in self.targets]}
+        if command == Command.GET_CURRENT_URL:
+            return {"value": f"url of {self.current_window_handle}"}
+        return {"value": None}
+
+    def cdp(self, cmd, params):
+        if cmd == "Target.createBrowserContext":
+            self.contexts += 1
+            return {"browserContextId": f"ctx{self.contexts}"}
+        if cmd == "Target.createTarget":
+            target = f"tab{len(self.targets)}"
+            self.targets.append({"targetId": target, "type": "page", "browserContextId": params["browserContextId"]})
+            return {"targetId": target}
+        if cmd == "Target.getTargets":
+            return {"targetInfos": list(self.targets)}
+        if cmd == "Target.closeTarget":
+            self.targets = [t for t in self.targets if t["targetId"] != params["targetId"]]
+        return {}
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+def commands(chrome, command):
+    return [params for sent, params in chrome.log if sent == command]
+
+
+def test_each_session_switches_to_its_own_tab_before_a_command():
+    chrome = Chrome()
+    host = TabHost(chrome)
+    first, second = host.session(), host.session()
+    assert first.driver.execute(Command.GET_CURRENT_URL)["value"] == "url of tab1"
+    assert second.driver.execute(Command.GET_CURRENT_URL)["value"] == "url of tab2"
+    assert first.driver.execute(Command.GET_CURRENT_URL)["value"] == "url of tab1"
+    assert [p["handle"] for p in commands(chrome, Command.SWITCH_TO_WINDOW)] == ["tab1", "tab2", "tab1"]
+
+
+def test_window_handles_only_list_the_sessions_own_windows():
+    chrome = Chrome()
+    host = TabHost(chrome)
+    session, other = host.session(), host.session()
+    chrome.targets.append({"targetId": "popup", "type": "page", "browserContextId": session.context})
+    assert session.driver.execute(Command.W3C_GET_WINDOW_HANDLES)["value"] == ["tab1", "popup"]
+    assert other.driver.execute(Command.W3C_GET_WINDOW_HANDLES)["value"] == ["tab2"]
+
+
+def test_quit_closes_the_session_and_keeps_the_host():
+    chrome = Chrome()
+    host = TabHost(chrome)
+    session, other = host.session(), host.session()
+    chrome.targets.append({"targetId": "popup", "type": "page", "browserContextId": session.context})
+    session.driver.quit()
+    session.driver.quit()
+    assert [t["targetId"] for t in chrome.targets] == ["home", "tab2"]
+    disposed = [p["params"] for p in commands(chrome, "executeCdpCommand")
+                if p["cmd"] == "Target.disposeBrowserContext"]
+    assert disposed == [{"browserContextId": session.context}]
+    assert chrome.quit_calls == 0 and chrome.current_window_handle == "home"
+    assert other.driver.execute(Command.GET_CURRENT_URL)["value"] == "url of tab2"
+
+
+def test_the_host_browser_is_not_taken_from_the_pool(monkeypatch):
+    chrome = Chrome()
+    monkeypatch.setattr(tab_sessions, "_host", None)
+    monkeypatch.setattr(tab_sessions, "new_driver", lambda: chrome)
+    monkeypatch.setattr(tab_sessions.atexit, "register", lambda fn: None)
+    with tab_sessions.tab_session() as driver:
+        assert driver.tab_session.host.driver is chrome
+    assert tab_sessions.host() is tab_sessions.host()
+    tab_sessions.host().close()
+    assert chrome.quit_calls == 1
@@ -0,0 +1,60 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("PIL")
+
+from helpers import visual  # noqa: E402
+
+
+def page():
+    y, x = np.mgrid[0:120, 0:160]
+    pixels = np.stack([x * 1.5, y * 2, x + y], axis=-1).astype(np.uint8)
+    pixels[20:60, 10:150] = [200, 40, 40]
+    pixels[70:110, 40:120] = [30, 30, 220]
+    return pixels
+
+
+def test_identical_images_match():
+    ratio, distance, mask = visual.compare(page(), page())
+    assert (ratio, distance) == (0.0, 0)
+    assert mask.shape == (120, 160) and not mask.any()
+
+
+def test_changes_within_the_pixel_tolerance_are_ignored():
+    current = page().astype(np.int16) + visual.PIXEL_TOLERANCE
+    ratio, distance, mask = visual.compare(np.clip(current, 0, 255).astype(np.uint8), page())
+    assert ratio == 0.0
+
+
+def test_diff_ratio_and_mask_cover_the_changed_block():
+    current = page()
+    current[0:12, 0:16] = 255 - current[0:12, 0:16]
+    ratio, distance, mask = visual.compare(current, page())
+    assert ratio == pytest.approx(12 * 16 / (120 * 160))
+    assert mask[0:12, 0:16].all() and mask.sum() == 12 * 16
+
+
+def test_ignore_regions_are_copied_from_the_baseline():
+    current = page()
+    current[0:12, 0:16] = 255 - current[0:12, 0:16]
+    baseline = page()
+    ratio, distance, _ = visual.compare(current, baseline, regions=[(0, 0, 16, 12)])
+    assert (ratio, distance) == (0.0, 0)
+    assert (current[0:12, 0:16] != baseline[0:12, 0:16]).any()  # the capture itself is untouched
+
+
+def test_phash_is_stable_under_small_changes_and_differs_for_other_layouts():
+    base = visual.phash(page())
+    assert base.shape == (63,)
+    noisy = page().copy()
+    noisy[60, 80] = 255 - noisy[60, 80]
+    assert np.count_nonzero(visual.phash(noisy) != base) <= visual.PHASH_BITS
+    assert np.count_nonzero(visual.phash(page()[::-1].copy()) != base) > visual.PHASH_BITS
+
+
+def test_baseline_hash_is_used_when_given():
+    current = page()
+    current[20:60, 10:150] = 0
+    given = ~visual.phash(page())
+    _, distance, _ = visual.compare(current, page(), baseline_hash=given)
+    assert distance == np.count_nonzero(visual.phash(current) != given)
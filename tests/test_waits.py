@@ -0,0 +1,84 @@
+import pytest
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
+from helpers import waits
+from helpers.waits import Condition, wait_for
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(round(seconds, 4))
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(waits.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(waits.time, "sleep", clock.sleep)
+    monkeypatch.setattr(waits, "wait_log", [])
+    return clock
+
+
+def after(polls, value="done"):
+    calls = []
+
+    def check(driver):
+        calls.append(driver)
+        return value if len(calls) >= polls else False
+    return Condition(check, f"ready after {polls} polls")
+
+
+def test_a_met_condition_returns_its_value_without_sleeping(clock):
+    assert wait_for("driver", after(1)) == "done"
+    assert clock.sleeps == []
+    assert waits.wait_log[-1].polls == 1 and waits.wait_log[-1].ok
+
+
+def test_polling_backs_off_up_to_the_maximum(clock):
+    wait_for("driver", after(9))
+    assert clock.sleeps == [0.05, 0.075, 0.1125, 0.1688, 0.2531, 0.3797, 0.5, 0.5]
+
+
+def test_timeout_raises_after_the_deadline_and_is_logged(clock):
+    with pytest.raises(TimeoutException, match="ready after 1000 polls"):
+        wait_for("driver", after(1000), timeout=1.0)
+    assert clock.now == pytest.approx(1.0)
+    record = waits.wait_log[-1]
+    assert not record.ok and record.elapsed == pytest.approx(1.0)
+
+
+def test_missing_elements_count_as_not_yet(clock):
+    attempts = []
+
+    def check(driver):
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise NoSuchElementException("not yet")
+        return True
+    assert wait_for("driver", Condition(check, "appears")) is True
+    assert len(attempts) == 3
+
+
+def test_other_errors_propagate(clock):
+    def check(driver):
+        raise ValueError("broken condition")
+    with pytest.raises(ValueError):
+        wait_for("driver", Condition(check, "broken"))
+
+
+def test_network_idle_passes_the_idle_time_to_the_page():
+    class Driver:
+        def execute_script(self, script, idle_ms):
+            self.args = (script, idle_ms)
+            return True
+    driver = Driver()
+    assert waits.network_idle(250)(driver) is True
+    assert driver.args == (waits.NETWORK_IDLE_JS, 250)